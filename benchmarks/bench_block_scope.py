@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# Namespace allocations of touch engine in a loop whose blocks declare no
+# locals and in one whose block declares a local. Touch engine creates
+# namespace per function call only (see esl.resolve), so neither loop
+# allocates namespaces per iteration.
+#
+# Usage: bench_block_scope.py [iterations]
+
+import os
+import sys
+import time
+import asyncio
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl  # noqa: E402
+import esl.namespace  # noqa: E402
+import esl.program  # noqa: E402
+
+CODE = '''
+    a = 0
+    for i = 1, {iterations} do
+        if i > 0 then
+            a = a + 1
+        end
+    end
+    return a
+'''
+
+LOCALS_CODE = '''
+    a = 0
+    for i = 1, {iterations} do
+        local b = i
+        if b > 0 then
+            local c = 1
+            a = a + c
+        end
+    end
+    return a
+'''
+
+
+class Counter(esl.namespace.Namespace):
+    clones = 0
+
+    def clone(self):
+        Counter.clones += 1
+        return Counter(parent=self)
+
+
+def program(code):
+    return esl.program.ProgramCache().compile(code)
+
+
+async def run(program, trace):
+    Counter.clones = 0
+    interpreter = esl.Interpreter(program, namespace=Counter(),
+                                  engine='touch')
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = await interpreter.run()
+    elapsed = time.perf_counter() - started
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        current = peak = 0
+    return result, elapsed, Counter.clones, peak
+
+
+async def main(iterations):
+    print('{} iterations'.format(iterations))
+    print('{:<16}{:>12}{:>14}{:>14}'.format('', 'time', 'namespaces',
+                                            'peak memory'))
+    for name, code in (('no locals', CODE), ('block locals', LOCALS_CODE)):
+        code = code.format(iterations=iterations)
+        result, elapsed, clones, peak = await run(program(code), False)
+        assert result == iterations
+        result, traced, clones, peak = await run(program(code), True)
+        print('{:<16}{:>10.2f}s{:>14}{:>12.1f}KB'.format(
+            name, elapsed, clones, peak / 1024))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+# Cold start: `import esl` plus first Interpreter run in a fresh process,
+# with shipped lexer/parser tables and with tables generated at start.
+
+import os
+import sys
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+RUNS = 10
+
+SCRIPT = '''\
+import time
+started = time.perf_counter()
+
+import asyncio
+import esl
+{setup}
+asyncio.run(esl.Interpreter('return 1 + 2').run())
+print(time.perf_counter() - started)
+'''
+
+NO_TABLES = '''\
+esl.lex.Lexer.tabmodule = 'esl._no_lextab'
+esl.parse.Parser.tabmodule = 'esl._no_parsetab'
+'''
+
+
+def measure(setup):
+    code = SCRIPT.format(setup=setup)
+    times = []
+    for i in range(RUNS):
+        out = subprocess.check_output([sys.executable, '-c', code],
+                                      stderr=subprocess.DEVNULL,
+                                      cwd=ROOT)
+        times.append(float(out))
+    return min(times), sum(times) / len(times)
+
+
+def main():
+    for name, setup in (('shipped tables', ''), ('no tables', NO_TABLES)):
+        best, mean = measure(setup)
+        print('{:<16} best {:7.1f} ms   mean {:7.1f} ms'.format(
+            name, best * 1000, mean * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Throughput of conversion of nested JSON-like payload to tables and back
+# with bulk Table methods and with item by item conversion, json.loads
+# for reference.
+#
+# Usage: bench_conversions.py [megabytes]
+
+import os
+import sys
+import json
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl.table  # noqa: E402
+
+
+def make_payload(size):
+    '''Returns list of orders which JSON takes about size bytes.'''
+    order = {
+        'id': 0,
+        'customer': {'name': 'John Smith', 'email': 'john@example.com'},
+        'lines': [{'sku': 'A-{}'.format(i), 'qty': i, 'price': 9.99}
+                  for i in range(5)],
+        'tags': ['new', 'paid'],
+        'comment': None,
+    }
+    count = size // len(json.dumps(order)) + 1
+    return json.dumps([dict(order, id=i) for i in range(count)])
+
+
+def from_python(obj):
+    if isinstance(obj, dict):
+        table = esl.table.Table()
+        for k, v in obj.items():
+            table[k] = from_python(v)
+        return table
+    elif isinstance(obj, list):
+        table = esl.table.Table()
+        for i, v in enumerate(obj, 1):
+            table[i] = from_python(v)
+        return table
+    return obj
+
+
+def to_python(obj):
+    if isinstance(obj, esl.table.Table):
+        keys = list(obj)
+        if keys == list(range(1, len(keys) + 1)):
+            return [to_python(obj[k]) for k in keys]
+        return {k: to_python(obj[k]) for k in keys}
+    return obj
+
+
+def measure(function, arg):
+    started = time.perf_counter()
+    result = function(arg)
+    return result, time.perf_counter() - started
+
+
+def main(megabytes):
+    text = make_payload(megabytes * 1024 * 1024)
+    payload, loads = measure(json.loads, text)
+    size = len(text) / 1024 / 1024
+    print('{:.1f} MB payload, MB/s'.format(size))
+    print('{:<16}{:>12}{:>12}'.format('', 'to table', 'to python'))
+
+    table, item_from = measure(from_python, payload)
+    result, item_to = measure(to_python, table)
+    assert result == json.loads(text.replace(', "comment": null', ''))
+    print('{:<16}{:>12.1f}{:>12.1f}'.format('item by item', size / item_from,
+                                            size / item_to))
+
+    table, bulk_from = measure(esl.table.Table.from_json_like, payload)
+    result, bulk_to = measure(esl.table.Table.to_python, table)
+    assert result == json.loads(text.replace(', "comment": null', ''))
+    print('{:<16}{:>12.1f}{:>12.1f}'.format('bulk', size / bulk_from,
+                                            size / bulk_to))
+    print('{:<16}{:>12.1f}'.format('json.loads', size / loads))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+# Compares execution engines on loops, arithmetic, function calls and
+# variable lookups from deeply nested blocks.
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl  # noqa: E402
+
+REPEAT = 5
+
+SCRIPTS = {
+    'loop': '''
+        a = 0
+        for i=1, 20000 do
+            a = a + i
+        end
+        return a
+    ''',
+    'arithmetic': '''
+        a = 0
+        for i=1, 5000 do
+            a = a + (i * 3 - 1) / 2 + i * i - (a - i) / 7
+        end
+        return a
+    ''',
+    'nested': '''
+        a = 0
+        for i=1, 100 do
+            for j=1, 100 do
+                if i < j then
+                    a = a + 1
+                elseif i == j then
+                    a = a + 2
+                end
+            end
+        end
+        return a
+    ''',
+    'calls': '''
+        function add(x, y)
+            return x + y
+        end
+        a = 0
+        for i=1, 5000 do
+            a = add(a, i)
+        end
+        return a
+    ''',
+    'deep': '''
+        local a = 0
+        for i=1, 2000 do
+            do do do do do do do do
+                local b = i
+                do do do do do do do do
+                    a = a + b
+                end end end end end end end end
+            end end end end end end end end
+        end
+        return a
+    ''',
+}
+
+
+async def measure(code, engine):
+    best = None
+    for i in range(REPEAT):
+        interpreter = esl.Interpreter(code, engine=engine)
+        started = time.perf_counter()
+        result = await interpreter.run()
+        elapsed = time.perf_counter() - started
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+async def main(engines):
+    print('{:<12}'.format('') + ''.join('{:>12}'.format(e) for e in engines))
+    for name, code in SCRIPTS.items():
+        times = []
+        results = set()
+        for engine in engines:
+            elapsed, result = await measure(code, engine)
+            times.append(elapsed)
+            results.add(result)
+        assert len(results) == 1, 'engines disagree: {}'.format(results)
+        print('{:<12}'.format(name) +
+              ''.join('{:>10.1f}ms'.format(t * 1000) for t in times) +
+              '   x{:.1f}'.format(times[0] / min(times[1:] or times)))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(sys.argv[1:] or esl.Interpreter.engines))
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+# Time of table traversal with pairs() and next() in every engine for
+# growing table sizes. Time per element should not grow with size.
+#
+# Usage: bench_pairs.py [elements]
+
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl  # noqa: E402
+
+CODE = {
+    'pairs': '''
+        local s = 0
+        for k, v in pairs(t) do s = s + v end
+        return s
+    ''',
+    'next': '''
+        local s = 0
+        for k, v in next, t do s = s + v end
+        return s
+    ''',
+}
+
+
+def make_table(elements):
+    table = esl.Table()
+    for i in range(1, elements // 2 + 1):
+        table[i] = i
+    for i in range(elements // 2 + 1, elements + 1):
+        table['k{}'.format(i)] = i
+    return table
+
+
+async def measure(code, engine, table):
+    ns = esl.Namespace({'t': table})
+    interpreter = esl.Interpreter(code, namespace=ns, engine=engine)
+    started = time.perf_counter()
+    result = await interpreter.run()
+    elapsed = time.perf_counter() - started
+    assert result == sum(v for k, v in table.items())
+    return elapsed
+
+
+async def main(elements):
+    sizes = [elements // 4, elements // 2, elements]
+    print('{:<16}'.format('') + ''.join(
+        '{:>16}'.format('{} us/elem'.format(n)) for n in sizes))
+    tables = [make_table(n) for n in sizes]
+    for name, code in CODE.items():
+        for engine in esl.Interpreter.engines:
+            times = [await measure(code, engine, t) for t in tables]
+            print('{:<16}'.format('{} {}'.format(name, engine)) + ''.join(
+                '{:>16.3f}'.format(t / n * 1e6)
+                for t, n in zip(times, sizes)))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Record-like tables: time to build records with table constructor and
+# access their fields in every engine, and memory per record kept by
+# script.
+#
+# Usage: bench_records.py [records]
+
+import os
+import sys
+import time
+import asyncio
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl  # noqa: E402
+
+BUILD = '''
+    local records = {}
+    for i = 1, n do
+        records[i] = {id = i, name = "item", price = i * 2, count = 1}
+    end
+    return records
+'''
+
+ACCESS = '''
+    local total = 0
+    for i = 1, n do
+        local r = records[i]
+        r.count = r.count + 1
+        total = total + r.id + r.price + r.count
+    end
+    return total
+'''
+
+
+async def measure(code, engine, **variables):
+    ns = esl.Namespace(variables)
+    interpreter = esl.Interpreter(code, namespace=ns, engine=engine)
+    started = time.perf_counter()
+    result = await interpreter.run()
+    return result, time.perf_counter() - started
+
+
+async def main(records):
+    print('{} records'.format(records))
+    print('{:<12}{:>12}{:>12}'.format('', 'build', 'access'))
+    for engine in esl.Interpreter.engines:
+        result, build = await measure(BUILD, engine, n=records)
+        result, access = await measure(ACCESS, engine, n=records,
+                                       records=result)
+        print('{:<12}{:>11.3f}s{:>11.3f}s'.format(engine, build, access))
+
+    tracemalloc.start()
+    result, elapsed = await measure(BUILD, 'python', n=records)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{:.0f} bytes per record'.format(used / records))
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
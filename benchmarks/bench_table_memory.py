@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Memory used by many small tables: size of table object itself
+# (sys.getsizeof) and total traced memory per table including its parts
+# (tracemalloc), with python dict for reference.
+#
+# Usage: bench_table_memory.py [tables]
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl.table  # noqa: E402
+
+SHAPES = {
+    'empty': [],
+    'record 3': ['id', 'name', 'price'],
+    'record 5': ['id', 'name', 'price', 'count', 'active'],
+    'array 5': [1, 2, 3, 4, 5],
+    'mixed 3+2': [1, 2, 3, 'id', 'name'],
+}
+
+
+def fill(table, keys):
+    for i, key in enumerate(keys):
+        table[key] = i
+    return table
+
+
+def measure(cls, keys, count):
+    tracemalloc.start()
+    tables = [fill(cls(), keys) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sys.getsizeof(tables[0]), used / count
+
+
+def main(count):
+    print('{} tables, bytes per table'.format(count))
+    print('{:<12}{:>12}{:>12}{:>12}'.format('', 'object', 'total',
+                                            'dict total'))
+    for name, keys in SHAPES.items():
+        size, total = measure(esl.table.Table, keys, count)
+        dict_total = measure(dict, keys, count)[1]
+        print('{:<12}{:>12}{:>12.0f}{:>12.0f}'.format(name, size, total,
+                                                      dict_total))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
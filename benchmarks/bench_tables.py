@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# Table fill and read time for sequential append (1..n), reverse fill
+# (n..1) and sparse fill (every 16th key), with python dict for
+# reference.
+#
+# Usage: bench_tables.py [elements]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import esl.table  # noqa: E402
+
+PATTERNS = {
+    'sequential': lambda n: range(1, n + 1),
+    'reverse': lambda n: range(n, 0, -1),
+    'sparse': lambda n: range(16, 16 * n + 1, 16),
+}
+
+
+def measure(cls, keys):
+    table = cls()
+    started = time.perf_counter()
+    for k in keys:
+        table[k] = k
+    filled = time.perf_counter()
+    for k in keys:
+        assert table[k] == k
+    return filled - started, time.perf_counter() - filled
+
+
+def main(elements):
+    print('{} elements'.format(elements))
+    print('{:<12}{:>12}{:>12}{:>12}{:>12}'.format('', 'fill', 'read',
+                                                  'dict fill', 'dict read'))
+    for name, pattern in PATTERNS.items():
+        keys = list(pattern(elements))
+        fill, read = measure(esl.table.Table, keys)
+        dict_fill, dict_read = measure(dict, keys)
+        print('{:<12}{:>11.2f}s{:>11.2f}s{:>11.2f}s{:>11.2f}s'.format(
+            name, fill, read, dict_fill, dict_read))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -7,4 +7,7 @@ __licence__ = 'For license information see LICENSE'
 from .table import Table
 from .function import Function
 from .namespace import Namespace
-from .interpreter import Interpreter, ESLSyntaxError, ESLRuntimeError
+from .interpreter import (Interpreter, ESLSyntaxError, ESLRuntimeError,
+                          ESLBudgetError, ESLTimeoutError, ESLMemoryError,
+                          ESLRecursionError)
+from .program import Program, compile
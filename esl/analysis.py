@@ -0,0 +1,41 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Static analysis of syntax tree used by execution engines.
+
+import esl.interpreter
+
+
+def suspending(root):
+    '''Returns set of nodes evaluation of which may suspend.
+
+    Only function calls (called python function may be a coroutine
+    function), generic for loops (iterator may be asynchronous) and
+    other loops (they give control to event loop at checkpoints, see
+    esl.interpreter.ExecutionContext) can suspend, and so every node
+    containing them. Function definition
+    doesn't evaluate it's body, so it never suspends, but nodes of the
+    body are analyzed too.'''
+    nodes = esl.interpreter
+    roots = (nodes.FunctionCall, nodes.GenericFor, nodes.While,
+             nodes.NumericFor)
+    result = set()
+
+    def visit(node):
+        flag = isinstance(node, roots)
+        for child in node.iter_children():
+            if visit(child) and not isinstance(node, nodes.Function):
+                flag = True
+        if flag:
+            result.add(node)
+        return flag
+
+    if root is not None:
+        visit(root)
+    return result
+
+
+def may_suspend(node):
+    '''Checks if evaluation of node may suspend.'''
+    return node in suspending(node)
@@ -0,0 +1,1034 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Closure compilation engine. Syntax tree is compiled once into nested
+# functions specialised by operator and node shape, so evaluation doesn't
+# dispatch on node attributes at run time.
+#
+# Every compiled closure takes frame of executed function: list with
+# interpreter, namespace of globals and frame of enclosing function
+# followed by slots of local variables (see esl.resolve). Locals are read
+# and written by index, only globals go through namespace.
+#
+# Subtrees which can't suspend (see esl.analysis) are compiled into plain
+# functions, coroutine functions are created only for nodes on the path
+# to function call or loop.
+
+import logging
+import operator
+
+from types import CoroutineType
+
+import esl.analysis
+import esl.function
+import esl.interpreter
+import esl.resolve
+import esl.runtime
+
+logger = logging.getLogger(__name__)
+
+FALSE = esl.runtime.FALSE
+
+# Frame layout
+INTERPRETER = 0
+GLOBALS = 1
+PARENT = 2
+SLOTS = 3
+
+
+class Compiler(object):
+    def __init__(self):
+        self.bodies = {}
+        self.suspending = set()
+        self.slots = {}
+        self.sizes = {}
+        self.selves = {}
+        self.sites = []
+        # Compiled operators waiting for their parents (see operators_tree)
+        self.ready = {}
+
+        nodes = esl.interpreter
+        self.operators = (nodes.Logical, nodes.Relational, nodes.Append,
+                          nodes.Arithmetic)
+        self.handlers = {
+            nodes.Chunk: self.chunk,
+            nodes.Block: self.block,
+            nodes.Assignment: self.assignment,
+            nodes.While: self.while_,
+            nodes.If: self.if_,
+            nodes.NumericFor: self.numeric_for,
+            nodes.GenericFor: self.generic_for,
+            nodes.Function: self.function,
+            nodes.Break: self.break_,
+            nodes.Return: self.return_,
+            nodes.Variable: self.variable,
+            nodes.Constant: self.constant,
+            nodes.FunctionCall: self.function_call,
+            nodes.Table: self.table,
+            nodes.Logical: self.logical,
+            nodes.Relational: self.relational,
+            nodes.Append: self.append,
+            nodes.Arithmetic: self.arithmetic,
+            nodes.Unary: self.unary,
+            nodes.Name: self.name,
+        }
+
+    def analyze(self, root, colon=False):
+        self.suspending.update(esl.analysis.suspending(root))
+        resolver = esl.resolve.resolve(root, SLOTS, colon)
+        self.slots.update(resolver.slots)
+        self.sizes.update(resolver.sizes)
+        self.selves.update(resolver.selves)
+
+    def program(self, chunk):
+        '''Compiles chunk into coroutine function with touch()
+        signature, inline caches of it's call, field and global sites are
+        listed in sites attribute of the function.'''
+        self.analyze(chunk)
+        body = self.compile(chunk)
+        if body is None:
+            body = self.value(None)
+        padding = [None] * (self.sizes.get(chunk, SLOTS) - SLOTS)
+
+        if self.sync(chunk):
+
+            async def code(interpreter, ns):
+                return body([interpreter, ns, None] + padding)
+
+        else:
+
+            async def code(interpreter, ns):
+                return await body([interpreter, ns, None] + padding)
+
+        code.sites = self.sites
+        return code
+
+    def function_body(self, func):
+        '''Compiles body of function created by another engine.'''
+        code = self.bodies.get(func.body)
+        if code is None:
+            root = esl.interpreter.FunctionBody(func.body.lineno,
+                                                func.parlist, func.body)
+            self.analyze(root, True)
+            code = self.bodies[func.body] = self.prototype(root)(None)
+        return code
+
+    def prototype(self, node):
+        '''Returns maker of python function executing FunctionBody node
+        with given frame of enclosing function.'''
+        body = self.compile(node.body)
+        if body is None:
+            body = self.value(None)
+        padding = [None] * (self.sizes[node] - SLOTS)
+        self_slot = self.selves.get(node)
+        parameters = []
+        if node.parlist is not None and node.parlist.namelist is not None:
+            for name in node.parlist.namelist.children:
+                parameters.append(self.slots[name][1])
+
+        def make(parent):
+            def code(interpreter, ns, self_, args):
+                frame = [interpreter, ns, parent] + padding
+                if self_slot is not None:
+                    frame[self_slot] = self_
+                for slot, value in zip(parameters, args):
+                    frame[slot] = value
+                return body(frame)
+
+            return code
+
+        return make
+
+    def sync(self, node):
+        '''Checks if node is compiled into plain function.'''
+        return node not in self.suspending
+
+    def compile(self, node):
+        if node is None:
+            return None
+        if type(node) in self.operators:
+            code = self.ready.pop(node, None)
+            if code is None:
+                code = self.operators_tree(node)
+            return code
+        return self.handlers[type(node)](node)
+
+    def operators_tree(self, root):
+        '''Compiles tree of binary operators with explicit stack: operators
+        are compiled after their operands which are operators too, so
+        long expressions (a + b + c ...) don't exhaust python stack.'''
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            pending = [
+                child for child in (node.left, node.right)
+                if type(child) in self.operators and child not in self.ready
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            self.ready[node] = self.handlers[type(node)](node)
+        return self.ready.pop(root)
+
+    def operand(self, node):
+        return (self.compile(node), self.sync(node))
+
+    def operands(self, node):
+        if node is None:
+            return []
+        return [self.operand(item) for item in node.children]
+
+    def value(self, value):
+        def constant(f):
+            return value
+
+        return constant
+
+    def load(self, node, name):
+        '''Returns reader of variable.'''
+        location = self.slots.get(node)
+
+        if location is None:
+            site = esl.runtime.GlobalSite(name)
+            self.sites.append(site)
+            lookup = site.lookup
+
+            def global_(f):
+                ns = f[GLOBALS]
+                namespace, version, value = site.entry
+                if ns is namespace and ns.root.version == version:
+                    site.hits += 1
+                    return value
+                return lookup(ns)
+
+            return global_
+
+        depth, slot = location
+
+        if depth == 0:
+
+            def local(f):
+                return f[slot]
+
+            return local
+
+        if depth == 1:
+
+            def upvalue(f):
+                return f[PARENT][slot]
+
+            return upvalue
+
+        def outer(f):
+            for i in range(depth):
+                f = f[PARENT]
+            return f[slot]
+
+        return outer
+
+    def store(self, node, name):
+        '''Returns writer of variable.'''
+        location = self.slots.get(node)
+
+        if location is None:
+
+            def global_(f, value):
+                f[GLOBALS].set_var(name, value)
+
+            return global_
+
+        depth, slot = location
+
+        if depth == 0:
+
+            def local(f, value):
+                f[slot] = value
+
+            return local
+
+        def outer(f, value):
+            for i in range(depth):
+                f = f[PARENT]
+            f[slot] = value
+
+        return outer
+
+    def chunk(self, node):
+        return self.compile(node.block)
+
+    def block(self, node):
+        statements = []
+        lines = {}
+        for statement in node.children:
+            if statement is not None:
+                compiled, sync = self.operand(statement)
+                statements.append((compiled, sync))
+                lines[compiled] = statement.lineno
+        locate = esl.runtime.locate
+
+        if self.sync(node):
+            codes = [compiled for compiled, sync in statements]
+
+            def block(f):
+                interpreter = f[INTERPRETER]
+                result = None
+                try:
+                    for statement in codes:
+                        if interpreter.returning or interpreter.breaking:
+                            break
+                        result = statement(f)
+                except Exception as e:
+                    locate(e, lines[statement])
+                    raise
+                return result
+
+            return block
+
+        async def block(f):
+            interpreter = f[INTERPRETER]
+            result = None
+            try:
+                for statement, sync in statements:
+                    if interpreter.returning or interpreter.breaking:
+                        break
+                    if sync:
+                        result = statement(f)
+                    else:
+                        result = await statement(f)
+            except Exception as e:
+                locate(e, lines[statement])
+                raise
+            return result
+
+        return block
+
+    def field_site(self):
+        site = esl.runtime.FieldSite()
+        self.sites.append(site)
+        return site
+
+    def target(self, item):
+        '''Returns (name, left) operands of assignment target, name is
+        variable writer if left is None.'''
+        nodes = esl.interpreter
+        if isinstance(item, nodes.Name):
+            return (self.store(item, item.name), True), (None, True)
+        elif item.left is None and isinstance(item.name, nodes.Name):
+            return (self.store(item, item.name.name), True), (None, True)
+        return self.operand(item.name), self.operand(item.left)
+
+    def assignment(self, node):
+        count = len(node.left.children)
+
+        if node.value is not None and len(node.value.children) != count:
+
+            def invalid(f):
+                raise ValueError('incorrect count of values')
+
+            return invalid
+
+        if node.value is None:
+            values = [(self.value(None), True)] * count
+        else:
+            values = self.operands(node.value)
+
+        targets = [self.target(item) for item in node.left.children]
+        sites = [
+            None if left is None else self.field_site()
+            for _, (left, _) in targets
+        ]
+
+        if self.sync(node):
+            codes = [value for value, sync in values]
+            fields = [(name, left, site)
+                      for ((name, _), (left, _)), site in zip(targets, sites)]
+
+            if count == 1 and fields[0][1] is None:
+                store = fields[0][0]
+                value = codes[0]
+
+                def assign_one(f):
+                    store(f, value(f))
+
+                return assign_one
+
+            def assign(f):
+                result = [value(f) for value in codes]
+                for (name, left, site), value in zip(fields, result):
+                    if left is None:
+                        name(f, value)
+                    else:
+                        site.set(f[GLOBALS], left(f), name(f), value)
+
+            return assign
+
+        if count == 1 and targets[0][1][0] is None:
+            store = targets[0][0][0]
+            value, sync = values[0]
+
+            async def assign_one(f):
+                store(f, await value(f))
+
+            return assign_one
+
+        async def assign(f):
+            result = []
+            for value, sync in values:
+                if sync:
+                    result.append(value(f))
+                else:
+                    result.append(await value(f))
+            for ((name, name_sync), (left, left_sync)), site, value in zip(
+                    targets, sites, result):
+                if left is None:
+                    name(f, value)
+                    continue
+                if name_sync:
+                    name = name(f)
+                else:
+                    name = await name(f)
+                if left_sync:
+                    site.set(f[GLOBALS], left(f), name, value)
+                else:
+                    site.set(f[GLOBALS], await left(f), name, value)
+
+        return assign
+
+    def while_(self, node):
+        expression, expression_sync = self.operand(node.expression)
+        block, block_sync = self.operand(node.block)
+
+        if node.check_before:
+
+            async def loop(f):
+                interpreter = f[INTERPRETER]
+                result = None
+                while True:
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+                    if expression_sync:
+                        check = expression(f)
+                    else:
+                        check = await expression(f)
+                    if check is None or check is False:
+                        interpreter.breaking = True
+                    if interpreter.breaking:
+                        break
+                    if block_sync:
+                        result = block(f)
+                    else:
+                        result = await block(f)
+                    if interpreter.breaking or interpreter.returning:
+                        break
+                interpreter.breaking = False
+                return result
+
+        else:
+
+            async def loop(f):
+                interpreter = f[INTERPRETER]
+                result = None
+                while True:
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+                    if interpreter.breaking:
+                        break
+                    if block_sync:
+                        result = block(f)
+                    else:
+                        result = await block(f)
+                    if interpreter.breaking or interpreter.returning:
+                        break
+                    if expression_sync:
+                        check = expression(f)
+                    else:
+                        check = await expression(f)
+                    if check is None or check is False:
+                        interpreter.breaking = True
+                interpreter.breaking = False
+                return result
+
+        return loop
+
+    def if_(self, node):
+        branches = [(self.operand(node.expression),
+                     self.operand(node.block))]
+        for elseif in node.elseiflist:
+            branches.append((self.operand(elseif.expression),
+                             self.operand(elseif.block)))
+        if node.else_ is not None:
+            else_, else_sync = self.operand(node.else_.block)
+        else:
+            else_, else_sync = None, True
+
+        if self.sync(node):
+            codes = [(expression, block)
+                     for (expression, _), (block, _) in branches]
+
+            if len(codes) == 1 and else_ is None:
+                expression, block = codes[0]
+
+                def if_then(f):
+                    if expression(f) in FALSE:
+                        return None
+                    return block(f)
+
+                return if_then
+
+            def if_else(f):
+                for expression, block in codes:
+                    if expression(f) not in FALSE:
+                        return block(f)
+                if else_ is not None:
+                    return else_(f)
+                return None
+
+            return if_else
+
+        async def if_else(f):
+            for (expression, sync), (block, block_sync) in branches:
+                if sync:
+                    check = expression(f)
+                else:
+                    check = await expression(f)
+                if check not in FALSE:
+                    if block_sync:
+                        return block(f)
+                    return await block(f)
+            if else_ is None:
+                return None
+            if else_sync:
+                return else_(f)
+            return await else_(f)
+
+        return if_else
+
+    def numeric_for(self, node):
+        slot = self.slots[node.name][1]
+        parameters = [self.operand(node.start), self.operand(node.limit)]
+        if node.step is None:
+            parameters.append((self.value(1), True))
+        else:
+            parameters.append(self.operand(node.step))
+        block, block_sync = self.operand(node.block)
+
+        def values(first, last, increment):
+            assert isinstance(first, int)
+            assert isinstance(last, int)
+            assert isinstance(increment, int)
+            if increment > 0:
+                return range(first, last + 1, increment)
+            elif increment < 0:
+                return range(first, last - 1, increment)
+            return None
+
+        async def loop(f):
+            interpreter = f[INTERPRETER]
+            result = None
+
+            evaluated = []
+            for parameter, sync in parameters:
+                if sync:
+                    evaluated.append(parameter(f))
+                else:
+                    evaluated.append(await parameter(f))
+            first, last, increment = evaluated
+
+            numbers = values(first, last, increment)
+            if numbers is not None:
+                for i in numbers:
+                    if interpreter.breaking:
+                        break
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+                    f[slot] = i
+                    if block_sync:
+                        result = block(f)
+                    else:
+                        result = await block(f)
+                    if interpreter.breaking or interpreter.returning:
+                        break
+            else:
+                while first >= last:
+                    if interpreter.breaking:
+                        break
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+                    f[slot] = first
+                    if block_sync:
+                        result = block(f)
+                    else:
+                        result = await block(f)
+                    if interpreter.breaking or interpreter.returning:
+                        break
+
+            interpreter.breaking = False
+            return result
+
+        return loop
+
+    def generic_for(self, node):
+        slots = [self.slots[name][1] for name in node.namelist.children]
+        expressions = self.operands(node.explist)
+        block, block_sync = self.operand(node.block)
+        iterate = esl.runtime.iterate
+        for_params = esl.runtime.for_params
+        Pairs = esl.runtime.Pairs
+
+        async def loop(f):
+            interpreter = f[INTERPRETER]
+            result = None
+
+            evaluated = []
+            for expression, sync in expressions:
+                if sync:
+                    evaluated.append(expression(f))
+                else:
+                    evaluated.append(await expression(f))
+            fun, obj, key = for_params(evaluated)
+            if type(fun) is Pairs:
+                items = fun.items
+            else:
+                items = None
+
+            while True:
+                interpreter.countdown -= 1
+                if not interpreter.countdown:
+                    await interpreter.checkpoint()
+                if items is not None:
+                    values = next(items, None)
+                else:
+                    values = await iterate(fun, obj, key)
+                if values is None:
+                    break
+
+                if not isinstance(values, (list, tuple)):
+                    values = [values]
+
+                for slot, value in zip(slots, values):
+                    f[slot] = value
+
+                if block_sync:
+                    result = block(f)
+                else:
+                    result = await block(f)
+                if interpreter.breaking or interpreter.returning:
+                    break
+
+                key = values[0]
+
+            interpreter.breaking = False
+            return result
+
+        return loop
+
+    def function(self, node):
+        parts = node.parts
+        name = parts[-1].name
+        path = [item.name for item in parts[1:-1]]
+        colon = node.colon
+        parlist = node.body.parlist
+        body = node.body.body
+        make = self.prototype(node.body)
+        Function = esl.function.Function
+
+        if len(parts) == 1:
+            store = self.store(parts[0], name)
+
+            def function(f):
+                func = Function(parlist, body)
+                func.code = make(f)
+                func.engine = 'closure'
+                store(f, func)
+
+            return function
+
+        load = self.load(parts[0], parts[0].name)
+
+        def method(f):
+            func = Function(parlist, body)
+            func.code = make(f)
+            func.engine = 'closure'
+
+            parent = load(f)
+            if parent is None:
+                raise NameError('function not found')
+            for n in path:
+                parent = parent[n]
+                if parent is None:
+                    raise NameError('function not found')
+
+            if colon:
+                func.self = parent
+            parent[name] = func
+
+        return method
+
+    def break_(self, node):
+        def break_(f):
+            f[INTERPRETER].breaking = True
+
+        return break_
+
+    def return_(self, node):
+        expressions = self.operands(node.explist)
+
+        if not expressions:
+
+            def return_nothing(f):
+                f[INTERPRETER].returning = True
+
+            return return_nothing
+
+        if self.sync(node):
+            codes = [expression for expression, sync in expressions]
+
+            if len(codes) == 1:
+                expression = codes[0]
+
+                def return_one(f):
+                    result = expression(f)
+                    f[INTERPRETER].returning = True
+                    return result
+
+                return return_one
+
+            def return_many(f):
+                result = [expression(f) for expression in codes]
+                f[INTERPRETER].returning = True
+                return result
+
+            return return_many
+
+        if len(expressions) == 1:
+            expression, sync = expressions[0]
+
+            async def return_one(f):
+                result = await expression(f)
+                f[INTERPRETER].returning = True
+                return result
+
+            return return_one
+
+        async def return_many(f):
+            result = []
+            for expression, sync in expressions:
+                if sync:
+                    result.append(expression(f))
+                else:
+                    result.append(await expression(f))
+            f[INTERPRETER].returning = True
+            return result
+
+        return return_many
+
+    def variable(self, node):
+        left, left_sync = self.operand(node.left)
+        if left is not None:
+            get_field = self.field_site().get
+
+        if isinstance(node.name, esl.interpreter.Name):
+            name = node.name.name
+
+            if left is None:
+                return self.load(node, name)
+
+            if left_sync:
+
+                def attribute(f):
+                    return get_field(f[GLOBALS], left(f), name)
+
+                return attribute
+
+            async def attribute(f):
+                return get_field(f[GLOBALS], await left(f), name)
+
+            return attribute
+
+        key, key_sync = self.operand(node.name)
+
+        if self.sync(node):
+            if left is None:
+
+                def dynamic(f):
+                    return f[GLOBALS].get_var(key(f))
+
+                return dynamic
+
+            def index(f):
+                name = key(f)
+                return get_field(f[GLOBALS], left(f), name)
+
+            return index
+
+        if left is None:
+
+            async def dynamic(f):
+                return f[GLOBALS].get_var(await key(f))
+
+            return dynamic
+
+        async def index(f):
+            if key_sync:
+                name = key(f)
+            else:
+                name = await key(f)
+            if left_sync:
+                return get_field(f[GLOBALS], left(f), name)
+            return get_field(f[GLOBALS], await left(f), name)
+
+        return index
+
+    def constant(self, node):
+        return self.value(node.value)
+
+    def name(self, node):
+        return self.value(node.name)
+
+    def function_call(self, node):
+        prefix, prefix_sync = self.operand(node.prefixexp)
+        method = None if node.name is None else node.name.name
+        args = self.operands(node.args)
+        colon = node.colon
+        compiler = self
+        site = esl.runtime.CallSite(node.site.frame)
+        frame = site.frame
+        self.sites.append(site)
+
+        get_method = esl.runtime.get_method
+        CALL_FUNCTION = esl.runtime.CALL_FUNCTION
+        CALL_PYTHON = esl.runtime.CALL_PYTHON
+        CALL_COROUTINE = esl.runtime.CALL_COROUTINE
+        CALL_METHOD = esl.runtime.CALL_METHOD
+
+        async def call(f):
+            interpreter = f[INTERPRETER]
+
+            if prefix_sync:
+                func = prefix(f)
+            else:
+                func = await prefix(f)
+            if method is not None:
+                func = get_method(func, method)
+
+            values = []
+            for arg, sync in args:
+                if sync:
+                    values.append(arg(f))
+                else:
+                    values.append(await arg(f))
+
+            kind = site.classify(func)
+            if kind == CALL_FUNCTION:
+                interpreter.countdown -= 1
+                if not interpreter.countdown:
+                    await interpreter.checkpoint()
+                if func.engine == 'closure':
+                    code = func.code
+                else:
+                    code = compiler.function_body(func)
+                call_stack = interpreter.call_stack
+                call_stack.append(frame)
+                if len(call_stack) > interpreter.max_depth:
+                    interpreter.overflow()
+                result = code(interpreter, f[GLOBALS],
+                              func.self if colon else None, values)
+                if type(result) is CoroutineType:
+                    result = await result
+                call_stack.pop()
+
+            elif kind == CALL_PYTHON:
+                result = func(*values)
+            elif kind == CALL_COROUTINE:
+                result = await func(*values)
+            else:
+                if colon:
+                    values.insert(0, func.__self__)
+                if kind == CALL_METHOD:
+                    result = func.__func__(*values)
+                else:
+                    result = await func.__func__(*values)
+
+            interpreter.returning = False
+            return result
+
+        return call
+
+    def table(self, node):
+        fields = []
+        if node.fieldlist is not None:
+            for field in node.fieldlist.children:
+                fields.append((self.operand(field.name),
+                               self.operand(field.expression)))
+        make_table = esl.runtime.make_table
+
+        if self.sync(node):
+            codes = [(name, expression)
+                     for (name, _), (expression, _) in fields]
+
+            def table(f):
+                fieldlist = []
+                for name, expression in codes:
+                    if name is not None:
+                        name = name(f)
+                    fieldlist.append((name, expression(f)))
+                return make_table(fieldlist)
+
+            return table
+
+        async def table(f):
+            fieldlist = []
+            for (name, name_sync), (expression, sync) in fields:
+                if name is not None:
+                    if name_sync:
+                        name = name(f)
+                    else:
+                        name = await name(f)
+                if sync:
+                    value = expression(f)
+                else:
+                    value = await expression(f)
+                fieldlist.append((name, value))
+            return make_table(fieldlist)
+
+        return table
+
+    def logical(self, node):
+        operation = node.operation
+        if operation not in ('and', 'or'):
+
+            def unknown(a, b):
+                raise NotImplementedError('operator {} is not '
+                                          'implemented'.format(operation))
+
+            return self.binary(node, unknown)
+
+        # Right operand is evaluated only if left one doesn't decide
+        left, left_sync = self.operand(node.left)
+        right, right_sync = self.operand(node.right)
+        decides = operator.not_ if operation == 'and' else operator.truth
+
+        if self.sync(node):
+
+            def logical(f):
+                a = left(f)
+                if decides(a):
+                    return a
+                return right(f)
+
+            return logical
+
+        async def logical(f):
+            if left_sync:
+                a = left(f)
+            else:
+                a = await left(f)
+            if decides(a):
+                return a
+            if right_sync:
+                return right(f)
+            return await right(f)
+
+        return logical
+
+    def binary(self, node, op):
+        left, left_sync = self.operand(node.left)
+        right, right_sync = self.operand(node.right)
+
+        if self.sync(node):
+            if isinstance(node.right, esl.interpreter.Constant):
+                value = node.right.value
+
+                def binary_constant(f):
+                    return op(left(f), value)
+
+                return binary_constant
+
+            def binary(f):
+                a = left(f)
+                return op(a, right(f))
+
+            return binary
+
+        async def binary(f):
+            if left_sync:
+                a = left(f)
+            else:
+                a = await left(f)
+            if right_sync:
+                return op(a, right(f))
+            return op(a, await right(f))
+
+        return binary
+
+    def relational(self, node):
+        op = esl.runtime.RELATIONAL.get(node.operation)
+        if op is None:
+            op = esl.runtime.unsupported(node.operation)
+        return self.binary(node, op)
+
+    def arithmetic(self, node):
+        op = esl.runtime.ARITHMETIC.get(node.operation)
+        if op is None:
+            op = esl.runtime.unsupported(node.operation)
+        return self.binary(node, op)
+
+    def append(self, node):
+        left, left_sync = self.operand(node.left)
+        right, right_sync = self.operand(node.right)
+        append = esl.runtime.append
+
+        if self.sync(node):
+
+            def concat(f):
+                a = left(f)
+                return append(f[INTERPRETER], a, right(f))
+
+            return concat
+
+        async def concat(f):
+            if left_sync:
+                a = left(f)
+            else:
+                a = await left(f)
+            if right_sync:
+                return append(f[INTERPRETER], a, right(f))
+            return append(f[INTERPRETER], a, await right(f))
+
+        return concat
+
+    def unary(self, node):
+        expression = self.compile(node.expression)
+        op = esl.runtime.UNARY.get(node.operation)
+
+        if op is None:
+
+            def op(value):
+                return None
+
+        if self.sync(node):
+
+            def unary(f):
+                return op(expression(f))
+
+            return unary
+
+        async def unary(f):
+            return op(await expression(f))
+
+        return unary
+
+
+def compile(program):
+    '''Returns compiled closure of program, compiles it once.'''
+    code = program.compiled.get('closure')
+    if code is None:
+        code = program.compiled['closure'] = Compiler().program(
+            program.chunk)
+    return code
@@ -0,0 +1,19 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Prints VM listing of scripts: python -m esl.dis script.esl ...
+
+import sys
+
+import esl.program
+import esl.vm
+
+
+def main(paths):
+    for path in paths:
+        print(esl.vm.dis(esl.program.cache.compile_file(path, write=False)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
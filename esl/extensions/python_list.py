@@ -10,8 +10,7 @@ def new(table=None):
     if table is not None:
         assert isinstance(table, esl.table.Table), \
                                 'table must be esl.table.Table'
-        for k in table:
-            list_.append(table[k])
+        list_ = list(table.to_dict().values())
     return list_
 
 
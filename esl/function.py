@@ -8,3 +8,5 @@ class Function(object):
         self.parlist = parlist
         self.body = body
         self.self = None
+        self.code = None
+        self.engine = None
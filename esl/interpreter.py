@@ -3,14 +3,20 @@ __copyright__ = '(c) 2016-2019 Development management business group'
 __licence__ = 'For license information see LICENSE'
 
 import sys
-import inspect
+import asyncio
 import logging
 import traceback
 
 import esl.parse
+import esl.program
+import esl.closure
+import esl.transpile
+import esl.vm
+import esl.runtime
 import esl.namespace
 import esl.table
 import esl.function
+import esl.resolve
 import esl.extensions
 
 logger = logging.getLogger(__name__)
@@ -24,22 +30,73 @@ class ESLRuntimeError(Exception):
     pass
 
 
+class ESLBudgetError(ESLRuntimeError):
+    pass
+
+
+class ESLTimeoutError(ESLRuntimeError):
+    pass
+
+
+class ESLMemoryError(ESLRuntimeError):
+    pass
+
+
+class ESLRecursionError(ESLRuntimeError):
+    pass
+
+
 class Node(object):
+    # Constructor arguments following lineno, in order
+    _fields = ()
+
     def __init__(self, lineno):
         self.lineno = lineno
 
     def is_false(self, val):
         return val in (None, False)
 
+    def iter_children(self):
+        for name in self._fields:
+            value = getattr(self, name)
+            if isinstance(value, Node):
+                yield value
+
+    def walk(self, skip=()):
+        '''Yields node and all it's descendants, doesn't descend into
+        nodes of skip types.'''
+        yield self
+        for child in self.iter_children():
+            if not isinstance(child, skip):
+                yield from child.walk(skip)
+
     async def touch(self, interpreter, ns):
         raise NotImplementedError('method must be overrided')
 
 
+def traceback_lineno(tb):
+    '''Returns line of the innermost node being touched in traceback,
+    nodes don't track current line while running.'''
+    lineno = 0
+    while tb is not None:
+        node = tb.tb_frame.f_locals.get('self')
+        if isinstance(node, Node) and node.lineno:
+            lineno = node.lineno
+        tb = tb.tb_next
+    return lineno
+
+
 class ListNode(Node):
     def __init__(self, lineno):
         super().__init__(lineno)
         self.children = []
 
+    def iter_children(self):
+        yield from super().iter_children()
+        for child in self.children:
+            if child is not None:
+                yield child
+
     def __iter__(self):
         return iter(self.children)
 
@@ -48,33 +105,32 @@ class ListNode(Node):
 
 
 class Chunk(Node):
+    '''Script. Touch engine keeps locals of script and of every function
+    call in own namespace, under keys set by esl.resolve.annotate() on
+    first run, so variables are scoped lexically as in other engines.'''
+    _fields = ('block', )
+
     def __init__(self, lineno, block):
         super().__init__(lineno)
         self.block = block
+        self.annotated = False
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-        result = await self.block.touch(interpreter, ns)
-        interpreter.line_stack.pop()
+        if not self.annotated:
+            esl.resolve.annotate(self)
+            self.annotated = True
+        result = await self.block.touch(interpreter, ns.clone())
         return result
 
 
 class Block(ListNode):
-    def __init__(self, lineno):
-        super().__init__(lineno)
-
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
-        ns = ns.clone()
-
         result = None
         for statement in self.children:
             if interpreter.returning or interpreter.breaking:
                 break
             if statement is not None:
                 result = await statement.touch(interpreter, ns)
-        interpreter.line_stack.pop()
         return result
 
 
@@ -83,6 +139,8 @@ class Statement(Node):
 
 
 class Assignment(Statement):
+    _fields = ('left', 'value', 'local')
+
     def __init__(self, lineno, left, value, local=False):
         super().__init__(lineno)
         self.left = left
@@ -90,8 +148,6 @@ class Assignment(Statement):
         self.local = local
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         count = len(self.left.children)
         if self.value is not None and len(self.value.children) != count:
             raise ValueError('incorrect count of values')
@@ -115,25 +171,14 @@ class Assignment(Statement):
 
             if isinstance(item, Variable) and item.left is not None:
                 obj = await item.left.touch(interpreter, ns)
-                try:
-                    if value is None:
-                        if name in obj:
-                            ns.del_item(obj, name)
-                    else:
-                        ns.set_item(obj, name, value)
-                except TypeError:
-                    if value is None:
-                        if ns.has_attribute(obj, name):
-                            ns.del_attribute(obj, name)
-                    else:
-                        ns.set_attribute(obj, name, value)
+                item.site.set(ns, obj, name, value)
             else:
-                ns.set_var(name, value, self.local)
-
-        interpreter.line_stack.pop()
+                ns.set_var(item.key, value, self.local)
 
 
 class While(Statement):
+    _fields = ('expression', 'block', 'check_before')
+
     def __init__(self, lineno, expression, block, check_before=True):
         super().__init__(lineno)
         self.expression = expression
@@ -147,14 +192,13 @@ class While(Statement):
         return True
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-        interpreter.loop_stack.append(self)
-
         result = None
 
-        i = 0
-        while i < 100:
-            i += 1
+        while True:
+            interpreter.countdown -= 1
+            if not interpreter.countdown:
+                await interpreter.checkpoint()
+
             if self.check_before:
                 if not await self._check_expression(interpreter, ns):
                     interpreter.breaking = True
@@ -163,6 +207,8 @@ class While(Statement):
                 break
 
             result = await self.block.touch(interpreter, ns)
+            if interpreter.breaking or interpreter.returning:
+                break
 
             if not self.check_before:
                 if not await self._check_expression(interpreter, ns):
@@ -170,13 +216,12 @@ class While(Statement):
 
         interpreter.breaking = False
 
-        interpreter.loop_stack.pop()
-        interpreter.line_stack.pop()
-
         return result
 
 
 class If(Statement):
+    _fields = ('expression', 'block', 'elseiflist', 'else_')
+
     def __init__(self, lineno, expression, block, elseiflist, else_):
         super().__init__(lineno)
         self.expression = expression
@@ -185,8 +230,6 @@ class If(Statement):
         self.else_ = else_
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         passed = False
         result = None
 
@@ -206,11 +249,12 @@ class If(Statement):
         if not passed and self.else_ is not None:
             result = await self.else_.block.touch(interpreter, ns)
 
-        interpreter.line_stack.pop()
         return result
 
 
 class NumericFor(Statement):
+    _fields = ('name', 'start', 'limit', 'step', 'block')
+
     def __init__(self, lineno, name, start, limit, step, block):
         super().__init__(lineno)
         self.name = name
@@ -220,14 +264,9 @@ class NumericFor(Statement):
         self.block = block
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-        interpreter.loop_stack.append(self)
-
-        ns = ns.clone()
-
         result = None
 
-        name = self.name.name
+        name = self.name.key
         start = await self.start.touch(interpreter, ns)
         assert isinstance(start, int)
 
@@ -245,19 +284,23 @@ class NumericFor(Statement):
         while (step > 0 and i <= limit) or (step <= 0 and i >= limit):
             if interpreter.breaking:
                 break
+            interpreter.countdown -= 1
+            if not interpreter.countdown:
+                await interpreter.checkpoint()
             ns.set_var(name, i, True)
             result = await self.block.touch(interpreter, ns)
+            if interpreter.breaking or interpreter.returning:
+                break
             i += step
 
         interpreter.breaking = False
 
-        interpreter.loop_stack.pop()
-        interpreter.line_stack.pop()
-
         return result
 
 
 class GenericFor(Statement):
+    _fields = ('namelist', 'explist', 'block')
+
     def __init__(self, lineno, namelist, explist, block):
         super().__init__(lineno)
         self.namelist = namelist
@@ -265,13 +308,8 @@ class GenericFor(Statement):
         self.block = block
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-        interpreter.loop_stack.append(self)
-
         result = None
 
-        ns = ns.clone()
-
         params = []
         for expression in self.explist.children:
             evaluated = await expression.touch(interpreter, ns)
@@ -282,14 +320,23 @@ class GenericFor(Statement):
         if len(params) < 3:
             params += [None] * (3 - len(params))
 
-        names = []
-        for name in self.namelist.children:
-            names.append(await name.touch(interpreter, ns))
+        names = [name.key for name in self.namelist.children]
 
         fun, obj, key = params[0:3]
+        fun = esl.runtime.iterator(fun, obj, key)
+        if type(fun) is esl.runtime.Pairs:
+            items = fun.items
+        else:
+            items = None
 
         while True:
-            if hasattr(fun, '__anext__'):
+            interpreter.countdown -= 1
+            if not interpreter.countdown:
+                await interpreter.checkpoint()
+
+            if items is not None:
+                values = next(items, None)
+            elif hasattr(fun, '__anext__'):
                 try:
                     values = (None, await fun.__anext__())
                 except StopAsyncIteration:
@@ -312,66 +359,75 @@ class GenericFor(Statement):
                 ns.set_var(k, v, True)
 
             result = await self.block.touch(interpreter, ns)
+            if interpreter.breaking or interpreter.returning:
+                break
 
             key = values[0]
 
         interpreter.breaking = False
 
-        interpreter.loop_stack.pop()
-        interpreter.line_stack.pop()
-
         return result
 
 
 class Function(Statement):
+    _fields = ('name', 'body', 'local')
+
     def __init__(self, lineno, name, body, local):
         super().__init__(lineno)
         self.name = name
         self.body = body
         self.local = local
 
-    async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
+    @property
+    def parts(self):
+        '''Name parts, `local function\' has plain name.'''
+        if isinstance(self.name, Name):
+            return [self.name]
+        return self.name.children
+
+    @property
+    def colon(self):
+        return getattr(self.name, 'colon', False)
 
+    async def touch(self, interpreter, ns):
         func = esl.function.Function(self.body.parlist, self.body.body)
+        # Function is called in namespace it is defined in
+        func.code = ns
+        func.engine = 'touch'
 
-        name = await self.name.children.pop().touch(interpreter, ns)
+        parts = self.parts
+        name = await parts[-1].touch(interpreter, ns)
 
         parent = None
-        for item in self.name.children:
-            if parent is None:
-                n = await item.touch(interpreter, ns)
-                parent = ns.get_var(n)
+        for i, item in enumerate(parts[:-1]):
+            if i == 0:
+                parent = ns.get_var(item.key)
             else:
-                parent = parent[n]
+                parent = parent[await item.touch(interpreter, ns)]
             if parent is None:
                 raise NameError('function not found')
 
         if parent is None:
-            ns.set_var(name, func)
+            ns.set_var(parts[0].key, func, self.local)
         else:
-            if self.name.colon:
+            if self.colon:
                 func.self = parent
             parent[name] = func
 
-        interpreter.line_stack.pop()
-
 
 class Break(Statement):
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
         interpreter.breaking = True
-        interpreter.line_stack.pop()
 
 
 class Return(Statement):
+    _fields = ('explist', )
+
     def __init__(self, lineno, explist):
         super().__init__(lineno)
         self.explist = explist
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         if self.explist is None:
             expressions = []
         else:
@@ -382,7 +438,6 @@ class Return(Statement):
             result.append(await expression.touch(interpreter, ns))
 
         interpreter.returning = True
-        interpreter.line_stack.pop()
 
         if len(result) == 0:
             return
@@ -397,31 +452,33 @@ class ElseIfList(ListNode):
 
 
 class ElseIf(Node):
+    _fields = ('expression', 'block')
+
     def __init__(self, lineno, expression, block):
         super().__init__(lineno)
         self.expression = expression
         self.block = block
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
         result = await self.block.touch(interpreter, ns)
-        interpreter.line_stack.pop()
         return result
 
 
 class Else(Node):
+    _fields = ('block', )
+
     def __init__(self, lineno, block):
         super().__init__(lineno)
         self.block = block
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
         result = await self.block.touch(interpreter, )
-        interpreter.line_stack.pop()
         return result
 
 
 class FunctionName(ListNode):
+    _fields = ('colon', )
+
     def __init__(self, lineno, colon=False):
         super().__init__(lineno)
         self.colon = colon
@@ -432,27 +489,28 @@ class VariableList(ListNode):
 
 
 class Variable(Node):
+    _fields = ('left', 'name', 'proto')
+
     def __init__(self, lineno, left, name, proto='dict'):
         super().__init__(lineno)
         self.left = left
         self.name = name
         self.proto = proto
+        self.site = None if left is None else esl.runtime.FieldSite()
+        # Namespace key of variable, name of global or key of local set by
+        # esl.resolve.annotate()
+        self.key = name.name if isinstance(name, Name) else None
 
     async def touch(self, interpreter, ns):
+        if self.left is None:
+            return ns.get_var(self.key)
+
         if isinstance(self.name, Name):
             name = self.name.name
         else:
             name = await self.name.touch(interpreter, ns)
-
-        if self.left is None:
-            result = ns.get_var(name)
-        else:
-            left = await self.left.touch(interpreter, ns)
-            try:
-                result = ns.get_item(left, name)
-            except TypeError:
-                result = ns.get_attribute(left, name)
-        return result
+        left = await self.left.touch(interpreter, ns)
+        return self.site.get(ns, left, name)
 
 
 class NameList(ListNode):
@@ -464,6 +522,8 @@ class ExpressionList(ListNode):
 
 
 class Constant(Node):
+    _fields = ('value', )
+
     def __init__(self, lineno, value):
         super().__init__(lineno)
         self.value = value
@@ -472,17 +532,43 @@ class Constant(Node):
         return self.value
 
 
+def callee_name(node):
+    '''Returns name of function called by FunctionCall node.'''
+    def name(node):
+        if isinstance(node, Name):
+            return node.name
+        elif isinstance(node, Variable):
+            if isinstance(node.name, Name):
+                key = node.name.name
+            elif (isinstance(node.name, Constant)
+                  and isinstance(node.name.value, str)):
+                key = node.name.value
+            else:
+                return '?'
+            if node.left is None:
+                return key
+            return '{}.{}'.format(name(node.left), key)
+        return '?'
+
+    result = name(node.prefixexp)
+    if node.name is not None:
+        result = '{}{}{}'.format(result, ':' if node.colon else '.',
+                                 node.name.name)
+    return result
+
+
 class FunctionCall(Node):
+    _fields = ('prefixexp', 'name', 'args', 'colon')
+
     def __init__(self, lineno, prefixexp, name, args, colon=False):
         super().__init__(lineno)
         self.prefixexp = prefixexp
         self.name = name
         self.args = args
         self.colon = colon
+        self.site = esl.runtime.CallSite((callee_name(self), lineno))
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         obj = await self.prefixexp.touch(interpreter, ns)
         if self.name is None:
             func = obj
@@ -493,43 +579,54 @@ class FunctionCall(Node):
             else:
                 func = getattr(obj, name)
 
-        ns = ns.clone()
+        kind = self.site.classify(func)
+        if kind == esl.runtime.CALL_FUNCTION:
+            interpreter.countdown -= 1
+            if not interpreter.countdown:
+                await interpreter.checkpoint()
+
+            args = []
+            for arg in self.args.children:
+                args.append(await arg.touch(interpreter, ns))
 
-        if isinstance(func, esl.function.Function):
+            if func.engine == 'touch':
+                ns = func.code.clone()
+            else:
+                ns = ns.clone()
             if self.colon:
                 ns.set_var('self', func.self, True)
 
-            if func.parlist is not None:
-                count = len(func.parlist.namelist.children)
-                for i in range(0, count):
-                    parameter = await func.parlist.namelist.children[i].touch(
-                        interpreter, ns)
-                    arg = await self.args.children[i].touch(interpreter, ns)
-                    ns.set_var(parameter, arg, True)
+            # Missing arguments are nils, extra ones are dropped
+            parlist = func.parlist
+            if parlist is not None and parlist.namelist is not None:
+                for i, name in enumerate(parlist.namelist.children):
+                    arg = args[i] if i < len(args) else None
+                    ns.set_var(name.key, arg, True)
+            call_stack = interpreter.call_stack
+            call_stack.append(self.site.frame)
+            if len(call_stack) > interpreter.max_depth:
+                interpreter.overflow()
             result = await func.body.touch(interpreter, ns)
+            call_stack.pop()
 
         else:
-            if not callable(func):
-                if isinstance(func, type(None)):
-                    func = 'nil'
-                raise TypeError('{} is not callable'.format(str(func)))
-
             args = []
             for arg in self.args.children:
                 args.append(await arg.touch(interpreter, ns))
 
-            if inspect.ismethod(func):
-                if self.colon:
-                    args.insert(0, func.__self__)
-                func = func.__func__
-
-            if inspect.iscoroutinefunction(func):
+            if kind == esl.runtime.CALL_PYTHON:
+                result = func(*args)
+            elif kind == esl.runtime.CALL_COROUTINE:
                 result = await func(*args)
             else:
-                result = func(*args)
+                if self.colon:
+                    args.insert(0, func.__self__)
+                if kind == esl.runtime.CALL_METHOD:
+                    result = func.__func__(*args)
+                else:
+                    result = await func.__func__(*args)
 
         interpreter.returning = False
-        interpreter.line_stack.pop()
 
         return result
 
@@ -539,6 +636,8 @@ class Args(ListNode):
 
 
 class FunctionBody(Node):
+    _fields = ('parlist', 'body')
+
     def __init__(self, lineno, parlist, body):
         super().__init__(lineno)
         self.parlist = parlist
@@ -546,6 +645,8 @@ class FunctionBody(Node):
 
 
 class ParametersList(Node):
+    _fields = ('namelist', 'dots')
+
     def __init__(self, lineno, namelist, dots=False):
         super().__init__(lineno)
         self.namelist = namelist
@@ -553,13 +654,14 @@ class ParametersList(Node):
 
 
 class Table(Node):
+    _fields = ('fieldlist', )
+
     def __init__(self, lineno, fieldlist):
         super().__init__(lineno)
 
         self.fieldlist = fieldlist
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
         fieldlist = []
         if self.fieldlist is not None:
             for field in self.fieldlist.children:
@@ -577,7 +679,6 @@ class Table(Node):
                 k = i
                 i += 1
             table[k] = v
-        interpreter.line_stack.pop()
         return table
 
 
@@ -586,6 +687,8 @@ class FieldList(ListNode):
 
 
 class Field(Node):
+    _fields = ('name', 'expression')
+
     def __init__(self, lineno, name, expression):
         super().__init__(lineno)
         self.name = name
@@ -593,6 +696,8 @@ class Field(Node):
 
 
 class Logical(Node):
+    _fields = ('left', 'operation', 'right')
+
     def __init__(self, lineno, left, operation, right):
         super().__init__(lineno)
         self.left = left
@@ -600,21 +705,25 @@ class Logical(Node):
         self.right = right
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
+        # Right operand is evaluated only if left one doesn't decide
         left = await self.left.touch(interpreter, ns)
-        right = await self.right.touch(interpreter, ns)
 
         if self.operation == 'and':
-            return left and right
+            if not left:
+                return left
+            return await self.right.touch(interpreter, ns)
         elif self.operation == 'or':
-            return left or right
+            if left:
+                return left
+            return await self.right.touch(interpreter, ns)
         else:
             raise NotImplementedError('operator {} is not '
                                       'implemented'.format(self.operator))
 
 
 class Relational(Node):
+    _fields = ('left', 'operation', 'right')
+
     def __init__(self, lineno, left, operation, right):
         super().__init__(lineno)
         self.left = left
@@ -622,8 +731,6 @@ class Relational(Node):
         self.right = right
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         left = await self.left.touch(interpreter, ns)
         right = await self.right.touch(interpreter, ns)
 
@@ -643,20 +750,18 @@ class Relational(Node):
             raise NotImplementedError('operation {} not '
                                       'supported'.format(self.operation))
 
-        interpreter.line_stack.pop()
-
         return result
 
 
 class Append(Node):
+    _fields = ('left', 'right')
+
     def __init__(self, lineno, left, right):
         super().__init__(lineno)
         self.left = left
         self.right = right
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         left = await self.left.touch(interpreter, ns)
         right = await self.right.touch(interpreter, ns)
 
@@ -668,12 +773,15 @@ class Append(Node):
                                 type(right).__name__))
 
         result = str(left) + str(right)
+        if interpreter.quota is not None:
+            interpreter.allocate(sys.getsizeof(result))
 
-        interpreter.line_stack.pop()
         return result
 
 
 class Arithmetic(Node):
+    _fields = ('left', 'operation', 'right')
+
     def __init__(self, lineno, left, operation, right):
         super().__init__(lineno)
         self.left = left
@@ -681,8 +789,6 @@ class Arithmetic(Node):
         self.right = right
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
-
         left = await self.left.touch(interpreter, ns)
         right = await self.right.touch(interpreter, ns)
 
@@ -698,21 +804,19 @@ class Arithmetic(Node):
             raise NotImplementedError('operation {} not '
                                       'supported'.format(self.operation))
 
-        interpreter.line_stack.pop()
-
         return result
 
 
 class Unary(Node):
+    _fields = ('operation', 'expression')
+
     def __init__(self, lineno, operation, expression):
         super().__init__(lineno)
         self.operation = operation
         self.expression = expression
 
     async def touch(self, interpreter, ns):
-        interpreter.line_stack.append(self.lineno)
         result = await self.expression.touch(interpreter, ns)
-        interpreter.line_stack.pop()
 
         if self.operation == '-':
             return -result
@@ -723,30 +827,176 @@ class Unary(Node):
 
 
 class Name(Node):
+    _fields = ('name', )
+
     def __init__(self, lineno, name):
         super().__init__(lineno)
         self.name = name
+        # Namespace key of variable declared by node (see Variable)
+        self.key = name
 
     async def touch(self, interpreter, ns):
         return self.name
 
 
+def call_frames(chunk):
+    '''Returns the most python frames ESL call takes in engines walking
+    the tree: every node on the way from body of function to call site
+    is touched in own frame.'''
+    frames = 1
+    stack = [(chunk.block, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, FunctionCall):
+            frames = max(frames, depth)
+        for child in node.iter_children():
+            if isinstance(child, FunctionBody):
+                if child.body is not None:
+                    stack.append((child.body, 1))
+            else:
+                stack.append((child, depth + 1))
+    return frames
+
+
+class ExecutionContext(object):
+    '''State of one program run.
+
+    Program and it's compiled code are shared by all runs, everything
+    changing during execution lives here. Context is passed to engines
+    as `interpreter` argument.
+
+    Engines count steps (loop iterations and calls of ESL functions) by
+    decrementing countdown and call checkpoint() when it reaches zero.
+    Checkpoint raises ESLBudgetError if more than budget steps were made,
+    ESLTimeoutError if deadline (event loop time) has passed, and gives
+    control to event loop every yield_every steps. Deadline is checked at
+    least every DEADLINE_STEPS steps.
+
+    If quota is set, engines call allocate() with approximate size of
+    strings made by script (only when quota is not None, so accounting
+    costs one attribute check when disabled), tables call it through
+    esl.table.accounting while script runs, so tables grown by host
+    functions are accounted too. Run is aborted with ESLMemoryError when
+    more than quota bytes are allocated. Freed memory is not returned to
+    quota.
+
+    Engines push frame (function name, line of call) of call site to
+    call_stack before calling ESL function and pop it after function
+    returns, overflow() is called when stack is deeper than max_depth.
+    Errors are not caught by scripts, so frames are left in stack on
+    exception and give it's backtrace. Stack of running script may be
+    read from other tasks and threads (see Interpreter.contexts).'''
+    __slots__ = ('interpreter', 'program', 'namespace', 'call_stack',
+                 'breaking', 'returning', 'budget', 'yield_every',
+                 'deadline', 'steps', 'period', 'countdown', 'quota',
+                 'memory', 'max_depth')
+
+    DEADLINE_STEPS = 100
+
+    def __init__(self, interpreter, program, namespace, budget=None,
+                 yield_every=None, deadline=None, quota=None,
+                 max_depth=None):
+        self.interpreter = interpreter
+        self.program = program
+        self.namespace = namespace
+        self.call_stack = []
+        self.breaking = False
+        self.returning = False
+        self.budget = budget
+        self.yield_every = yield_every
+        self.deadline = deadline
+        self.quota = quota
+        self.memory = 0
+        if max_depth is None:
+            max_depth = sys.maxsize
+        self.max_depth = max_depth
+        self.steps = 0
+        self.schedule()
+
+    def schedule(self):
+        # Countdown stays small int: arithmetic on them is faster
+        period = 1 << 24
+        if self.yield_every:
+            period = self.yield_every - self.steps % self.yield_every
+        if self.budget is not None:
+            period = min(period, self.budget + 1 - self.steps)
+        if self.deadline is not None:
+            period = min(period, self.DEADLINE_STEPS)
+        self.period = self.countdown = period
+
+    async def checkpoint(self):
+        self.steps += self.period
+        if self.budget is not None and self.steps > self.budget:
+            raise ESLBudgetError('budget of {} steps is exhausted'.format(
+                self.budget))
+        if (self.deadline is not None
+                and asyncio.get_event_loop().time() >= self.deadline):
+            raise ESLTimeoutError('deadline exceeded')
+        if self.yield_every and self.steps % self.yield_every == 0:
+            await asyncio.sleep(0)
+        self.schedule()
+
+    def allocate(self, size):
+        self.memory += size
+        if self.memory > self.quota:
+            raise ESLMemoryError('memory quota of {} bytes is '
+                                 'exceeded'.format(self.quota))
+
+    def overflow(self):
+        raise ESLRecursionError('call depth limit of {} is '
+                                'exceeded'.format(self.max_depth))
+
+
 class Interpreter(object):
+    engines = ('touch', 'closure', 'python', 'vm')
+    default_engine = 'touch'
+    default_budget = None
+    default_yield_every = 1000
+    default_memory_quota = None
+    # Call depth limit of engines running ESL calls on python stack, if
+    # None it's derived from python recursion limit (see stack_depth),
+    # stackless engines are not limited unless max_depth is given
+    default_max_depth = None
+    stackless_engines = ('vm', )
+    # Python frames per ESL call, tree walking engines take one frame per
+    # node on the way to call site (see call_frames)
+    frames_per_call = {'python': 2}
+    # Python frames left to host code calling script and called by it
+    stack_reserve = 100
+
     def __init__(self,
                  code,
                  bytecode=None,
                  namespace=None,
                  extensions=None,
-                 debug=False):
-        self.__code = code
-
-        if bytecode is None:
+                 debug=False,
+                 engine=None,
+                 budget=None,
+                 yield_every=None,
+                 memory_quota=None,
+                 max_depth=None):
+        if engine is None:
+            engine = self.default_engine
+        if engine not in self.engines:
+            raise ValueError('unknown engine {}'.format(engine))
+        self.engine = engine
+
+        if isinstance(code, esl.program.Program):
+            program = code
+        elif isinstance(bytecode, (bytes, bytearray, memoryview)):
+            program = esl.program.Program.load(bytecode)
+        elif bytecode is not None:
+            program = esl.program.Program(code, bytecode)
+        elif debug:
             parser = esl.parse.Parser(debug=debug)
-            try:
-                bytecode = parser.parse(code)
-            except (esl.lex.LexError, esl.parse.ParseError) as e:
-                raise ESLSyntaxError(str(e))
-        self.__bytecode = bytecode
+            program = esl.program.Program(
+                code, esl.program.cache.parse(code, parser))
+        else:
+            program = esl.program.compile(code)
+        self.program = program
+
+        self.__code = program.code
+        self.__bytecode = program.chunk
 
         if namespace is None:
             namespace = esl.namespace.Namespace()
@@ -756,12 +1006,35 @@ class Interpreter(object):
 
         self.debug = debug
 
-        self.line_stack = []
-        self.call_stack = []
-        self.loop_stack = []
+        if budget is None:
+            budget = self.default_budget
+        self.budget = budget
 
-        self.breaking = False
-        self.returning = False
+        if yield_every is None:
+            yield_every = self.default_yield_every
+        self.yield_every = yield_every
+
+        if memory_quota is None:
+            memory_quota = self.default_memory_quota
+        self.memory_quota = memory_quota
+
+        if max_depth is None and engine not in self.stackless_engines:
+            max_depth = self.default_max_depth
+            if max_depth is None:
+                max_depth = self.stack_depth()
+        self.max_depth = max_depth
+
+        # Execution contexts of running scripts
+        self.contexts = set()
+
+    def stack_depth(self):
+        '''Returns call depth the python stack holds for engine and program,
+        so deep recursion hits max_depth before python recursion limit.'''
+        frames = self.frames_per_call.get(self.engine)
+        if frames is None:
+            frames = call_frames(self.program.chunk)
+        free = sys.getrecursionlimit() - self.stack_reserve
+        return max(free // frames, 1)
 
     def add_extensions(self, extensions=None, **kwargs):
         if extensions is None:
@@ -775,11 +1048,38 @@ class Interpreter(object):
         for k, v in kwargs.items():
             ns.set_var(k, v)
 
-    async def run(self):
+    async def run(self, deadline=None, timeout=None):
+        '''Runs program, returns it's result.
+
+        Run is aborted with ESLTimeoutError when event loop time reaches
+        deadline or timeout seconds pass. While script runs, it's
+        execution context is in contexts set.'''
         if self.__bytecode is None:
             return
+        if timeout is not None:
+            expires = asyncio.get_event_loop().time() + timeout
+            if deadline is None or expires < deadline:
+                deadline = expires
+        context = ExecutionContext(self, self.program, self.__namespace,
+                                   self.budget, self.yield_every, deadline,
+                                   self.memory_quota, self.max_depth)
+        self.contexts.add(context)
+        self.__namespace.invalidate()
+        accounting = esl.table.accounting.set(
+            None if context.quota is None else context.allocate)
         try:
-            result = await self.__bytecode.touch(self, self.__namespace)
+            if self.engine == 'closure':
+                code = esl.closure.compile(self.program)
+            elif self.engine == 'python':
+                code = esl.transpile.compile(self.program)
+            elif self.engine == 'vm':
+                code = esl.vm.compile(self.program)
+            else:
+                code = self.__bytecode.touch
+            result = await code(context, self.__namespace)
+
+        except asyncio.CancelledError:
+            raise
 
         except Exception as e:
             # Error message
@@ -793,13 +1093,15 @@ class Interpreter(object):
 
             # ESL call stack
             parent_fun = '<main>'
-            for fun, lineno in self.call_stack:
+            for fun, lineno in context.call_stack:
                 logger.error('... {} line {}: {}()'.format(
                     parent_fun, lineno, fun))
                 parent_fun = fun
 
-            lastline = self.line_stack[-1]
-            if lastline <= len(lines):
+            lastline = getattr(e, 'esl_lineno', None)
+            if lastline is None:
+                lastline = traceback_lineno(e.__traceback__)
+            if 0 < lastline <= len(lines):
                 line = lines[lastline - 1].strip()[:50]
                 logger.error('... {} line {}: {} ...'.format(
                     parent_fun, lastline, line))
@@ -822,6 +1124,15 @@ class Interpreter(object):
                         file[-40:], line, fun))
                 logger.debug('...   {}'.format(inst))
 
+            if isinstance(e, ESLRuntimeError):
+                raise type(e)(msg) from None
+            if isinstance(e, RecursionError):
+                # Python stack is exhausted before max_depth is reached
+                raise ESLRecursionError(msg) from None
             raise ESLRuntimeError(msg) from None
 
+        finally:
+            esl.table.accounting.reset(accounting)
+            self.contexts.discard(context)
+
         return result
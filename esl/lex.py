@@ -3,6 +3,8 @@ __copyright__ = '(c) 2016-2019 Development management business group'
 __licence__ = 'For license information see LICENSE'
 
 import logging
+import hashlib
+import importlib
 import ply.lex
 import collections
 
@@ -162,5 +164,38 @@ class Lexer(object):
         logger.error('Error: {}'.format(msg[0].lower() + msg[1:]))
         raise LexError(msg)
 
-    def build(self, **kwargs):
+    tabmodule = 'esl.lextab'
+
+    def signature(self):
+        '''Returns hash of token rules used to validate shipped lextab.'''
+        rules = []
+        functions = []
+        for name in sorted(dir(self)):
+            if not name.startswith('t_'):
+                continue
+            value = getattr(self, name)
+            if callable(value):
+                rules.append((name, value.__doc__))
+                functions.append((value.__code__.co_firstlineno, name))
+            else:
+                rules.append((name, value))
+        order = [name for lineno, name in sorted(functions)]
+        data = repr((ply.lex.__tabversion__, self.tokens, self.states, rules,
+                     order))
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def check_tables(self):
+        '''Checks that shipped lextab matches current token rules.'''
+        try:
+            lextab = importlib.import_module(self.tabmodule)
+        except ImportError:
+            return False
+        return getattr(lextab, '_signature', None) == self.signature()
+
+    def build(self, optimize=True, **kwargs):
+        if optimize and self.check_tables():
+            kwargs.update(optimize=True, lextab=self.tabmodule)
+        elif optimize:
+            logger.warning('Lexer tables are out of date, '
+                           'run `python -m esl.tables\'')
         self.lexer = ply.lex.lex(module=self, **kwargs)
@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'APPEND', 'ASSIGN', 'BRACES_L', 'BRACES_R', 'BRACKET_L', 'BRACKET_R', 'BREAK', 'COLON', 'COMMA', 'DIVIDE', 'DO', 'DOT', 'ELSE', 'ELSEIF', 'END', 'EQUALS', 'FALSE', 'FOR', 'FUNCTION', 'IF', 'IN', 'LESS_EQUAL_THEN', 'LESS_THEN', 'LOCAL', 'MINUS', 'MODULO', 'MORE_EQUAL_THEN', 'MORE_THEN', 'NAME', 'NIL', 'NOT', 'NUMBER', 'OR', 'PARANTHESES_L', 'PARANTHESES_R', 'PLUS', 'POWER', 'REPEAT', 'RETURN', 'SEMICOLON', 'SQUARE', 'STRING', 'TDOT', 'THEN', 'TILDE_EQUAL', 'TIMES', 'TRUE', 'UNTIL', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive', 'ccode': 'exclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NAME>[A-Za-z][A-Za-z0-9_]*)|(?P<t_NEWLINE>\\n+)|(?P<t_COMMENTS>--(?!\\[=*\\[).*)|(?P<t_ccode>(?:--)?\\[=*\\[)|(?P<t_STRING>"[^\\\\"]*")|(?P<t_TDOT>\\.\\.\\.)|(?P<t_APPEND>\\.\\.)|(?P<t_NUMBER>\\d+)|(?P<t_BRACES_L>\\{)|(?P<t_BRACES_R>\\})|(?P<t_BRACKET_L>\\[)|(?P<t_BRACKET_R>\\])|(?P<t_DOT>\\.)|(?P<t_EQUALS>==)|(?P<t_LESS_EQUAL_THEN><=)|(?P<t_MORE_EQUAL_THEN>>=)|(?P<t_PARANTHESES_L>\\()|(?P<t_PARANTHESES_R>\\))|(?P<t_PLUS>\\+)|(?P<t_POWER>\\^)|(?P<t_SQUARE>\\#)|(?P<t_TILDE_EQUAL>~=)|(?P<t_TIMES>\\*)|(?P<t_ASSIGN>=)|(?P<t_COLON>:)|(?P<t_COMMA>,)|(?P<t_DIVIDE>/)|(?P<t_LESS_THEN><)|(?P<t_MINUS>-)|(?P<t_MODULO>%)|(?P<t_MORE_THEN>>)|(?P<t_SEMICOLON>;)', [None, ('t_NAME', 'NAME'), ('t_NEWLINE', 'NEWLINE'), ('t_COMMENTS', 'COMMENTS'), ('t_ccode', 'ccode'), (None, 'STRING'), (None, 'TDOT'), (None, 'APPEND'), (None, 'NUMBER'), (None, 'BRACES_L'), (None, 'BRACES_R'), (None, 'BRACKET_L'), (None, 'BRACKET_R'), (None, 'DOT'), (None, 'EQUALS'), (None, 'LESS_EQUAL_THEN'), (None, 'MORE_EQUAL_THEN'), (None, 'PARANTHESES_L'), (None, 'PARANTHESES_R'), (None, 'PLUS'), (None, 'POWER'), (None, 'SQUARE'), (None, 'TILDE_EQUAL'), (None, 'TIMES'), (None, 'ASSIGN'), (None, 'COLON'), (None, 'COMMA'), (None, 'DIVIDE'), (None, 'LESS_THEN'), (None, 'MINUS'), (None, 'MODULO'), (None, 'MORE_THEN'), (None, 'SEMICOLON')])], 'ccode': [('(?P<t_ccode_newlone>\\n+)|(?P<t_ccode_end>\\]=*\\])', [None, ('t_ccode_newlone', 'newlone'), ('t_ccode_end', 'end')])]}
+_lexstateignore = {'ccode': '', 'INITIAL': ' \t'}
+_lexstateerrorf = {'ccode': 't_ccode_error', 'INITIAL': 't_error'}
+_lexstateeoff = {}
+_signature = '0d444462b3c33b300e87f26a8889db60c458116009e149d79ccc2baf100edef4'
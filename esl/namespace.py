@@ -12,17 +12,38 @@ _DEFAULT = object()
 
 
 class Namespace(object):
+    '''Variables scope.
+
+    Root namespace counts writes of variables in all it's descendants in
+    version attribute, global lookup caches (see esl.runtime.GlobalSite)
+    are valid while it doesn't change. So while script runs variables
+    must be changed with set_var() and del_var() only: value written to
+    local_vars dict directly may be not seen by script. Interpreter.run()
+    calls invalidate() before script starts, so changes of the dict made
+    between runs are seen.'''
+
     def __init__(self, local_vars=None, parent=None, import_handler=None):
         if local_vars is None:
             local_vars = {}
         self.__vars = local_vars
         self.__parent = parent
+        if parent is None:
+            self.root = self
+            self.version = 0
+        else:
+            self.root = parent.root
 
     # Variables manipulation
+    def invalidate(self):
+        '''Drops global lookup caches of namespace tree, must be called
+        after variables were changed in local_vars dict directly.'''
+        self.root.version += 1
+
     def set_var(self, key, value, local=False):
         assert isinstance(key, str)
         if key in self.__vars or local or not self.__parent:
             self.__vars[key] = value
+            self.root.version += 1
         else:
             self.__parent.set_var(key, value)
 
@@ -37,6 +58,7 @@ class Namespace(object):
         assert isinstance(key, str)
         if key in self.__vars:
             del self.__vars[key]
+            self.root.version += 1
         elif self.__parent:
             self.__parent.del_var(key)
 
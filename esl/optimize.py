@@ -0,0 +1,216 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Syntax tree optimizer: folds constant expressions and removes statically
+# dead branches. Folding uses operations of esl.runtime, so results are the
+# same as evaluated ones; operations which raise are left for run time.
+
+import collections
+import logging
+
+import esl.interpreter
+import esl.runtime
+
+logger = logging.getLogger(__name__)
+
+Change = collections.namedtuple('Change', ('lineno', 'message'))
+
+FALSE = esl.runtime.FALSE
+
+NUMBERS = (int, float)
+CONSTANTS = (type(None), bool, int, float, str)
+
+
+def is_number(value):
+    return isinstance(value, NUMBERS) and not isinstance(value, bool)
+
+
+def describe(value):
+    if value is None:
+        return 'nil'
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif isinstance(value, str):
+        return '"{}"'.format(value)
+    return repr(value)
+
+
+class Optimizer(object):
+    def __init__(self):
+        self.changes = []
+
+        nodes = esl.interpreter
+        self.handlers = {
+            nodes.Block: self.block,
+            nodes.Arithmetic: self.arithmetic,
+            nodes.Append: self.append,
+            nodes.Relational: self.relational,
+            nodes.Logical: self.logical,
+            nodes.Unary: self.unary,
+        }
+
+    def report(self, node, message):
+        self.changes.append(Change(node.lineno, message))
+
+    def visit(self, node):
+        '''Optimizes children of node, returns node replacement.'''
+        for name in node._fields:
+            value = getattr(node, name)
+            if isinstance(value, esl.interpreter.Node):
+                setattr(node, name, self.visit(value))
+        if isinstance(node, esl.interpreter.ListNode):
+            node.children = [
+                None if child is None else self.visit(child)
+                for child in node.children
+            ]
+
+        handler = self.handlers.get(type(node))
+        if handler is None:
+            return node
+        return handler(node)
+
+    def fold(self, node, compute, *operands):
+        '''Replaces node with constant if all operands are constants and
+        computation succeeds.'''
+        values = []
+        for operand in operands:
+            if not isinstance(operand, esl.interpreter.Constant):
+                return node
+            values.append(operand.value)
+        try:
+            value = compute(*values)
+        except (ArithmeticError, TypeError, ValueError):
+            return node
+        if not isinstance(value, CONSTANTS):
+            return node
+        self.report(node, 'folded {} to {}'.format(
+            type(node).__name__.lower(), describe(value)))
+        return esl.interpreter.Constant(node.lineno, value)
+
+    def arithmetic(self, node):
+        op = esl.runtime.ARITHMETIC.get(node.operation)
+        if op is None:
+            return node
+
+        def compute(left, right):
+            if not is_number(left) or not is_number(right):
+                raise TypeError('not a number')
+            return op(left, right)
+
+        return self.fold(node, compute, node.left, node.right)
+
+    def append(self, node):
+        return self.fold(node, esl.runtime.concat, node.left, node.right)
+
+    def relational(self, node):
+        op = esl.runtime.RELATIONAL.get(node.operation)
+        if op is None:
+            return node
+        return self.fold(node, op, node.left, node.right)
+
+    def logical(self, node):
+        if node.operation == 'and':
+            return self.fold(node, lambda a, b: a and b, node.left,
+                             node.right)
+        elif node.operation == 'or':
+            return self.fold(node, lambda a, b: a or b, node.left,
+                             node.right)
+        return node
+
+    def unary(self, node):
+        op = esl.runtime.UNARY.get(node.operation)
+        if op is None:
+            return node
+
+        def compute(value):
+            if node.operation == '-' and not is_number(value):
+                raise TypeError('not a number')
+            if node.operation == '#' and not isinstance(value, str):
+                raise TypeError('not a string')
+            return op(value)
+
+        return self.fold(node, compute, node.expression)
+
+    def block(self, node):
+        children = [child for child in node.children if child is not None]
+        statements = []
+        for i, statement in enumerate(children):
+            replacement = self.statement(statement)
+            if replacement is None:
+                if i < len(children) - 1:
+                    continue
+                # Last statement gives value of block, keep it empty
+                replacement = esl.interpreter.Block(statement.lineno)
+            statements.append(replacement)
+        node.children = []
+        for statement in statements:
+            node.append(statement)
+        return node
+
+    def statement(self, node):
+        '''Returns replacement of statement, None if it is dead.'''
+        if isinstance(node, esl.interpreter.If):
+            return self.if_(node)
+        elif isinstance(node, esl.interpreter.While):
+            return self.while_(node)
+        return node
+
+    def while_(self, node):
+        expression = node.expression
+        if (node.check_before
+                and isinstance(expression, esl.interpreter.Constant)
+                and expression.value in FALSE):
+            self.report(node, 'removed dead loop')
+            return None
+        return node
+
+    def if_(self, node):
+        nodes = esl.interpreter
+        branches = [(node.lineno, node.expression, node.block)]
+        for elseif in node.elseiflist:
+            branches.append((elseif.lineno, elseif.expression, elseif.block))
+        else_ = None if node.else_ is None else node.else_.block
+
+        alive = []
+        for i, (lineno, expression, block) in enumerate(branches):
+            if not isinstance(expression, nodes.Constant):
+                alive.append((lineno, expression, block))
+            elif expression.value in FALSE:
+                self.changes.append(Change(lineno, 'removed dead branch'))
+            else:
+                self.changes.append(
+                    Change(lineno, 'removed always true condition'))
+                dead = [item[0] for item in branches[i + 1:]]
+                if else_ is not None:
+                    dead.append(node.else_.lineno)
+                for line in dead:
+                    self.changes.append(Change(line, 'removed dead branch'))
+                else_ = block
+                break
+
+        if len(alive) == len(branches):
+            return node
+
+        if not alive:
+            if else_ is None:
+                return None
+            return else_
+
+        lineno, expression, block = alive[0]
+        elseiflist = nodes.ElseIfList(node.elseiflist.lineno)
+        for item in alive[1:]:
+            elseiflist.append(nodes.ElseIf(*item))
+        if else_ is not None:
+            else_ = nodes.Else(else_.lineno, else_)
+        return nodes.If(node.lineno, expression, block, elseiflist, else_)
+
+
+def optimize(chunk):
+    '''Optimizes syntax tree in place, returns list of changes.'''
+    optimizer = Optimizer()
+    if chunk is not None:
+        optimizer.visit(chunk)
+    for change in optimizer.changes:
+        logger.debug('line %s: %s', change.lineno, change.message)
+    return optimizer.changes
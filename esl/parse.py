@@ -3,6 +3,7 @@ __copyright__ = '(c) 2016-2019 Development management business group'
 __licence__ = 'For license information see LICENSE'
 
 import logging
+import importlib
 import ply.yacc
 
 import esl.lex
@@ -19,15 +20,34 @@ class Parser(object):
 
     tokens = esl.lex.Lexer.tokens
 
+    tabmodule = 'esl.parsetab'
+
     def __init__(self, debug=False, write_tables=False):
         self.lexer = esl.lex.Lexer()
         self.lexer.build()
 
+        # Shipped tables are loaded only if their signature matches the
+        # grammar, otherwise ply rebuilds them in memory.
+        if not write_tables and not self.check_tables():
+            logger.warning('Parser tables are out of date, '
+                           'run `python -m esl.tables\'')
         self.yacc = ply.yacc.yacc(module=self,
                                   debug=debug,
+                                  tabmodule=self.tabmodule,
                                   write_tables=write_tables,
                                   errorlog=logger)
 
+    def check_tables(self):
+        '''Checks that shipped parsetab matches current grammar.'''
+        try:
+            parsetab = importlib.import_module(self.tabmodule)
+        except ImportError:
+            return False
+        pinfo = ply.yacc.ParserReflect({k: getattr(self, k)
+                                        for k in dir(self)})
+        pinfo.get_all()
+        return getattr(parsetab, '_lr_signature', None) == pinfo.signature()
+
     def p_chunk(self, p):
         '''chunk : block'''
         p[0] = esl.interpreter.Chunk(p.lineno(0), p[1])
@@ -438,4 +458,8 @@ class Parser(object):
         raise ParseError(msg)
 
     def parse(self, code):
-        return self.yacc.parse(code, lexer=self.lexer.lexer, tracking=True)
+        lexer = self.lexer.lexer
+        lexer.lineno = 1
+        lexer.startpos = 0
+        lexer.begin('INITIAL')
+        return self.yacc.parse(code, lexer=lexer, tracking=True)
@@ -0,0 +1,141 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AND APPEND ASSIGN BRACES_L BRACES_R BRACKET_L BRACKET_R BREAK COLON COMMA DIVIDE DO DOT ELSE ELSEIF END EQUALS FALSE FOR FUNCTION IF IN LESS_EQUAL_THEN LESS_THEN LOCAL MINUS MODULO MORE_EQUAL_THEN MORE_THEN NAME NIL NOT NUMBER OR PARANTHESES_L PARANTHESES_R PLUS POWER REPEAT RETURN SEMICOLON SQUARE STRING TDOT THEN TILDE_EQUAL TIMES TRUE UNTIL WHILEchunk : blockblock : blockpartblock : laststat\n                 | blockpart laststatblockpart : stat\n                     | blockpart statstat : emptystat : varlist ASSIGN expliststat : functioncallstat : DO block ENDstat : WHILE exp DO block ENDstat : REPEAT block UNTIL expstat : IF exp THEN block elseiflist else ENDstat : FOR name ASSIGN exp COMMA exp DO block ENDstat : FOR name ASSIGN exp COMMA exp COMMA exp DO block ENDstat : FOR namelist IN explist DO block ENDstat : FUNCTION funcname funcbodystat : LOCAL FUNCTION name funcbodystat : LOCAL nameliststat : LOCAL namelist ASSIGN explistlaststat : BREAKlaststat : RETURN explist empty\n                    | RETURN emptyempty : SEMICOLON\n                 |elseiflist : elseif\n                      | elseiflist elseif\n                      |elseif : ELSEIF exp THEN blockelse : ELSE block\n                |funcname : funcname_dot\n                    | funcname_dot COLON namefuncname_dot : name\n                        | funcname_dot DOT namevarlist : varvarlist : varlist COMMA varvar : namevar : prefixexp BRACKET_L exp BRACKET_Rvar : prefixexp DOT namenamelist : namenamelist : namelist COMMA nameexplist : expexplist : explist COMMA expexp : NILexp : TRUEexp : FALSEexp : NUMBERexp : STRINGexp : TDOTexp : function\n               | prefixexp\n               | tableconstructor\n               | opprefixexp : var\n                     | functioncallprefixexp : PARANTHESES_L exp PARANTHESES_Rfunctioncall : prefixexp args\n                        | prefixexp COLON name argsargs : PARANTHESES_L PARANTHESES_R\n                | PARANTHESES_L explist PARANTHESES_R\n                | tableconstructor\n                | stringfunction : FUNCTION funcbodyfuncbody : PARANTHESES_L parlist PARANTHESES_R block END\n                    | PARANTHESES_L PARANTHESES_R block ENDparlist : namelistparlist : namelist COMMA TDOT\n                   | TDOTtableconstructor : BRACES_L fieldlist BRACES_R\n                            | BRACES_L BRACES_Rfieldlist : fieldfieldlist : fieldlist fieldsep fieldfieldlist : fieldlist optfieldsepfield : BRACKET_L exp BRACKET_R ASSIGN exp\n                 | name ASSIGN exp\n                 | expfieldsep : COMMA\n                    | SEMICOLONoptfieldsep : fieldsep\n                       |op : op_oneop_one : op_one OR op_twoop_one : op_twoop_two : op_two AND op_threeop_two : op_threeop_three : op_three LESS_THEN op_four\n                    | op_three LESS_EQUAL_THEN op_four\n                    | op_three MORE_THEN op_four\n                    | op_three MORE_EQUAL_THEN op_four\n                    | op_three TILDE_EQUAL op_four\n                    | op_three EQUALS op_fourop_three : op_fourop_four : op_four APPEND op_fiveop_four : op_fiveop_five : op_five PLUS op_six\n                   | op_five MINUS op_sixop_five : op_sixop_six : op_six TIMES op_seven\n                  | op_six DIVIDE op_seven\n                  | op_six MODULO op_sevenop_six : op_sevenop_seven : NOT op_eight\n                    | SQUARE op_eight\n                    | MINUS op_eightop_seven : op_eightop_eight : op_eight POWER op_nineop_eight : op_nineop_nine : expname : NAMEstring : STRING'
+    
+_lr_action_items = {'BREAK':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[6,6,-5,-7,-9,6,6,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,6,6,-17,-40,-60,-57,-44,6,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,6,-11,6,-66,6,-65,-13,6,6,-16,6,-14,-15,]),'RETURN':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[7,7,-5,-7,-9,7,7,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,7,7,-17,-40,-60,-57,-44,7,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,7,-11,7,-66,7,-65,-13,7,7,-16,7,-14,-15,]),'DO':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,159,160,163,164,165,166,167,168,174,179,181,186,188,190,192,194,196,197,199,201,202,204,],[11,11,-5,-7,-9,11,11,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,111,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,11,11,-17,-40,-60,-57,-44,11,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,179,-42,-18,-20,-59,-39,-61,11,-11,11,-66,11,196,-65,-13,11,11,-16,201,11,-14,-15,]),'WHILE':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[12,12,-5,-7,-9,12,12,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,12,12,-17,-40,-60,-57,-44,12,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,12,-11,12,-66,12,-65,-13,12,12,-16,12,-14,-15,]),'REPEAT':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[13,13,-5,-7,-9,13,13,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,13,13,-17,-40,-60,-57,-44,13,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,13,-11,13,-66,13,-65,-13,13,13,-16,13,-14,-15,]),'IF':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[14,14,-5,-7,-9,14,14,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,14,14,-17,-40,-60,-57,-44,14,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,14,-11,14,-66,14,-65,-13,14,14,-16,14,-14,-15,]),'FOR':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[15,15,-5,-7,-9,15,15,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,15,15,-17,-40,-60,-57,-44,15,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,15,-11,15,-66,15,-65,-13,15,15,-16,15,-14,-15,]),'FUNCTION':([0,3,5,7,8,10,11,12,13,14,16,18,19,22,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,67,68,69,71,73,74,75,76,79,80,83,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,107,110,111,112,113,114,115,117,121,124,125,127,128,130,133,134,136,137,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,177,178,179,181,183,186,190,192,194,195,196,197,201,202,204,],[17,17,-5,39,-7,-9,17,39,17,39,-38,66,-24,39,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,39,-82,-84,-86,-93,-95,-98,39,-102,39,-106,39,-108,39,-41,-19,-58,39,39,-62,-63,-111,39,-64,-71,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-105,-109,-103,39,-104,-8,-10,17,39,17,39,39,-17,39,-40,-60,-57,-44,17,-70,39,-78,-79,39,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,17,-11,39,39,17,-66,39,17,-65,-13,17,39,17,-16,17,-14,-15,]),'LOCAL':([0,3,5,8,10,11,13,16,19,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,174,179,181,186,190,192,194,196,197,201,202,204,],[18,18,-5,-7,-9,18,18,-38,-24,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-8,-10,18,18,-17,-40,-60,-57,-44,18,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,18,-11,18,-66,18,-65,-13,18,18,-16,18,-14,-15,]),'SEMICOLON':([0,3,5,7,8,10,11,13,16,19,23,25,26,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,80,82,83,84,86,87,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,134,135,136,137,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,171,173,174,179,181,186,190,191,192,194,196,197,201,202,204,],[19,19,-5,19,-7,-9,19,19,-38,-24,-110,-6,19,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-64,137,-71,-72,-77,-38,-105,-109,-103,-104,-8,-10,19,19,-17,-40,-60,-57,-44,19,-70,-80,-74,-78,-79,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,19,-73,-76,-11,19,-66,19,-65,-75,-13,19,19,-16,19,-14,-15,]),'PARANTHESES_L':([0,3,5,7,8,10,11,12,13,14,16,19,20,21,22,23,25,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,63,64,65,67,68,69,71,73,74,75,76,79,80,83,85,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,117,120,121,122,124,125,127,128,130,133,134,136,137,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,161,162,163,164,165,166,167,168,174,177,178,179,181,183,186,190,192,194,195,196,197,201,202,204,],[22,22,-5,22,-7,-9,22,22,22,22,-38,-24,-55,73,22,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,73,-53,-54,81,-55,-56,22,-82,-84,-86,-93,-95,-98,22,-102,22,-106,22,-108,22,22,81,-32,-34,-41,-19,-58,22,22,-62,-63,-111,22,-64,-71,22,-38,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-105,-109,-103,22,-104,-8,-55,73,-10,22,22,22,22,22,-17,81,22,73,-40,-60,-57,-44,22,-70,22,-78,-79,22,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-33,-35,-18,-20,-59,-39,-61,22,-11,22,22,22,-66,22,22,-65,-13,22,22,22,-16,22,-14,-15,]),'NAME':([0,3,5,7,8,10,11,12,13,14,15,16,17,18,19,22,23,25,28,29,30,31,32,33,34,35,36,37,38,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,66,67,68,69,70,71,72,73,74,75,76,79,80,81,83,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,107,110,111,112,113,114,115,116,117,118,119,121,124,125,127,128,130,133,134,136,137,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,168,170,174,177,178,179,181,183,186,190,192,194,195,196,197,201,202,204,],[23,23,-5,23,-7,-9,23,23,23,23,23,-38,23,23,-24,23,-110,-6,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,23,-82,-84,-86,-93,-95,-98,23,-102,23,-106,23,-108,23,23,23,-41,-19,-58,23,23,23,23,-62,-63,-111,23,-64,23,-71,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-105,-109,-103,23,-104,-8,-10,23,23,23,23,23,23,-17,23,23,23,-40,-60,-57,-44,23,-70,23,-78,-79,23,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,23,23,-11,23,23,23,-66,23,23,-65,-13,23,23,23,-16,23,-14,-15,]),'$end':([0,1,2,3,4,5,6,7,8,10,16,19,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,78,80,83,102,103,104,106,107,110,117,124,125,127,128,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,174,181,190,192,197,202,204,],[-25,0,-1,-2,-3,-5,-21,-25,-7,-9,-38,-24,-110,-4,-6,-25,-23,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-22,-64,-71,-105,-109,-103,-104,-8,-10,-17,-40,-60,-57,-44,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,-11,-66,-65,-13,-16,-14,-15,]),'END':([3,4,5,6,7,8,10,11,16,19,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,57,67,68,69,74,75,76,78,80,83,102,103,104,106,107,110,111,113,117,124,125,127,128,130,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,160,163,164,165,166,167,168,169,174,175,176,179,180,181,184,185,186,189,190,192,193,194,196,197,198,200,201,202,203,204,],[-2,-3,-5,-21,-25,-7,-9,-25,-38,-24,-110,-4,-6,-25,-23,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,110,-41,-19,-58,-62,-63,-111,-22,-64,-71,-105,-109,-103,-104,-8,-10,-25,-25,-17,-40,-60,-57,-44,-25,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,174,-12,-28,-42,-18,-20,-59,-39,-61,-25,181,-11,-31,-26,-25,190,-66,192,-27,-25,197,-65,-13,-30,-25,-25,-16,-29,202,-25,-14,204,-15,]),'UNTIL':([3,4,5,6,7,8,10,13,16,19,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,59,67,68,69,74,75,76,78,80,83,102,103,104,106,107,110,117,124,125,127,128,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,160,163,164,165,166,167,174,181,190,192,197,202,204,],[-2,-3,-5,-21,-25,-7,-9,-25,-38,-24,-110,-4,-6,-25,-23,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,112,-41,-19,-58,-62,-63,-111,-22,-64,-71,-105,-109,-103,-104,-8,-10,-17,-40,-60,-57,-44,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-42,-18,-20,-59,-39,-61,-11,-66,-65,-13,-16,-14,-15,]),'ELSEIF':([3,4,5,6,7,8,10,16,19,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,78,80,83,102,103,104,106,107,110,113,117,124,125,127,128,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,157,160,163,164,165,166,167,174,175,176,181,185,190,192,194,197,198,202,204,],[-2,-3,-5,-21,-25,-7,-9,-38,-24,-110,-4,-6,-25,-23,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-22,-64,-71,-105,-109,-103,-104,-8,-10,-25,-17,-40,-60,-57,-44,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,177,-42,-18,-20,-59,-39,-61,-11,177,-26,-66,-27,-65,-13,-25,-16,-29,-14,-15,]),'ELSE':([3,4,5,6,7,8,10,16,19,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,68,69,74,75,76,78,80,83,102,103,104,106,107,110,113,117,124,125,127,128,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,157,160,163,164,165,166,167,174,175,176,181,185,190,192,194,197,198,202,204,],[-2,-3,-5,-21,-25,-7,-9,-38,-24,-110,-4,-6,-25,-23,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-19,-58,-62,-63,-111,-22,-64,-71,-105,-109,-103,-104,-8,-10,-25,-17,-40,-60,-57,-44,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-12,-28,-42,-18,-20,-59,-39,-61,-11,186,-26,-66,-27,-65,-13,-25,-16,-29,-14,-15,]),'NIL':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-78,-79,29,29,29,29,29,]),'TRUE':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,-78,-79,30,30,30,30,30,]),'FALSE':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,31,-78,-79,31,31,31,31,31,]),'NUMBER':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-78,-79,32,32,32,32,32,]),'STRING':([7,10,12,14,16,20,21,22,23,36,40,41,42,49,51,53,55,69,71,73,74,75,76,79,83,85,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,108,109,112,114,115,121,122,124,125,127,133,134,136,137,139,165,166,167,177,178,183,195,],[33,-56,33,33,-38,-55,76,33,-110,76,-55,-56,33,33,33,33,33,-58,33,33,-62,-63,-111,33,-71,33,-38,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-55,76,33,33,33,33,76,-40,-60,-57,-70,33,-78,-79,33,-59,-39,-61,33,33,33,33,]),'TDOT':([7,12,14,22,42,49,51,53,55,71,73,79,81,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,170,177,178,183,195,],[34,34,34,34,34,34,34,34,34,34,34,34,132,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-78,-79,34,182,34,34,34,34,]),'BRACES_L':([7,10,12,14,16,20,21,22,23,36,40,41,42,49,51,53,55,69,71,73,74,75,76,79,83,85,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,108,109,112,114,115,121,122,124,125,127,133,134,136,137,139,165,166,167,177,178,183,195,],[42,-56,42,42,-38,-55,42,42,-110,42,-55,-56,42,42,42,42,42,-58,42,42,-62,-63,-111,42,-71,42,-38,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-55,42,42,42,42,42,42,-40,-60,-57,-70,42,-78,-79,42,-59,-39,-61,42,42,42,42,]),'NOT':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,-78,-79,51,51,51,51,51,]),'SQUARE':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,136,137,139,177,178,183,195,],[53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,-78,-79,53,53,53,53,53,]),'MINUS':([7,12,14,16,22,23,28,29,30,31,32,33,34,35,36,37,38,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,58,60,69,71,73,74,75,76,77,79,80,83,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,100,101,102,103,104,105,106,112,114,115,121,123,124,125,127,128,133,134,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,177,178,181,183,187,188,190,191,195,199,],[49,49,49,-38,49,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,49,-82,-84,-86,-93,98,-98,49,-102,49,-106,49,-108,49,-109,-109,-58,49,49,-62,-63,-111,-109,49,-64,-71,49,-109,-38,49,49,49,49,49,49,49,49,49,49,49,49,49,49,-105,-109,-103,49,-104,49,49,49,49,-109,-40,-60,-57,-109,-70,49,-78,-79,-109,49,-83,-85,-87,-88,-89,-90,-91,-92,98,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,49,49,-66,49,-109,-109,-65,-109,49,-109,]),'ASSIGN':([9,16,20,23,61,67,68,87,108,124,160,166,172,],[55,-38,-36,-110,114,-41,121,139,-37,-40,-42,-39,183,]),'COMMA':([9,16,20,23,26,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,61,62,67,68,69,74,75,76,80,82,83,84,86,87,102,103,104,106,107,108,124,125,126,127,128,131,133,134,135,136,137,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,158,159,160,164,165,166,167,171,173,181,188,190,191,],[56,-38,-36,-110,79,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,116,-41,116,-58,-62,-63,-111,-64,136,-71,-72,-77,-38,-105,-109,-103,-104,79,-37,-40,-60,79,-57,-44,170,-70,-80,-74,-78,-79,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,178,79,-42,79,-59,-39,-61,-73,-76,-66,195,-65,-75,]),'COLON':([10,16,20,21,23,36,40,41,64,65,69,74,75,76,83,87,108,109,124,125,127,133,162,165,166,167,],[-56,-38,-55,70,-110,70,-55,-56,118,-34,-58,-62,-63,-111,-71,-38,-55,70,-40,-60,-57,-70,-35,-59,-39,-61,]),'BRACKET_L':([10,16,20,21,23,36,40,41,42,69,74,75,76,83,87,108,109,124,125,127,133,134,136,137,165,166,167,],[-56,-38,-55,71,-110,71,-55,-56,85,-58,-62,-63,-111,-71,-38,-55,71,-40,-60,-57,-70,85,-78,-79,-59,-39,-61,]),'DOT':([10,16,20,21,23,36,40,41,64,65,69,74,75,76,83,87,108,109,124,125,127,133,162,165,166,167,],[-56,-38,-55,72,-110,72,-55,-56,119,-34,-58,-62,-63,-111,-71,-38,-55,72,-40,-60,-57,-70,-35,-59,-39,-61,]),'POWER':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,105,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,105,-109,105,105,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'TIMES':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,99,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,-94,99,99,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'DIVIDE':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,100,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,-94,100,100,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'MODULO':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,101,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,-94,101,101,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'PLUS':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,97,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,97,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'APPEND':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,96,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,96,96,96,96,96,96,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'LESS_THEN':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,90,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,90,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'LESS_EQUAL_THEN':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,91,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,91,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'MORE_THEN':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,92,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,92,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'MORE_EQUAL_THEN':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,93,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,93,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'TILDE_EQUAL':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,94,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,94,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'EQUALS':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,95,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,95,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'AND':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,89,-86,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,89,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'OR':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,58,60,69,74,75,76,77,80,83,86,87,102,103,104,106,123,124,125,127,128,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,156,158,165,166,167,173,181,187,188,190,191,199,],[-38,-110,-109,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,88,-84,-86,-93,-95,-98,-102,-106,-108,-109,-109,-58,-62,-63,-111,-109,-64,-71,-109,-38,-105,-109,-103,-104,-109,-40,-60,-57,-109,-70,-109,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-109,-109,-59,-39,-61,-109,-66,-109,-109,-65,-109,-109,]),'THEN':([16,23,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,60,69,74,75,76,80,83,102,103,104,106,124,125,127,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,165,166,167,181,187,190,],[-38,-110,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,113,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,-40,-60,-57,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-59,-39,-61,-66,194,-65,]),'PARANTHESES_R':([16,23,28,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,67,69,73,74,75,76,77,80,81,83,102,103,104,106,124,125,126,127,128,129,131,132,133,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,160,165,166,167,181,182,190,],[-38,-110,-43,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-41,-58,125,-62,-63,-111,127,-64,130,-71,-105,-109,-103,-104,-40,-60,167,-57,-44,168,-67,-69,-70,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-42,-59,-39,-61,-66,-68,-65,]),'BRACES_R':([16,23,29,30,31,32,33,34,35,36,37,38,40,41,42,43,44,45,46,47,48,50,52,54,69,74,75,76,80,82,83,84,86,87,102,103,104,106,124,125,127,133,134,135,136,137,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,165,166,167,171,173,181,190,191,],[-38,-110,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,83,-82,-84,-86,-93,-95,-98,-102,-106,-108,-58,-62,-63,-111,-64,133,-71,-72,-77,-38,-105,-109,-103,-104,-40,-60,-57,-70,-80,-74,-78,-79,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-59,-39,-61,-73,-76,-66,-65,-75,]),'BRACKET_R':([16,23,29,30,31,32,33,34,35,36,37,38,40,41,43,44,45,46,47,48,50,52,54,69,74,75,76,80,83,102,103,104,106,123,124,125,127,133,138,140,141,142,143,144,145,146,147,148,149,150,151,152,153,154,165,166,167,181,190,],[-38,-110,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-56,-82,-84,-86,-93,-95,-98,-102,-106,-108,-58,-62,-63,-111,-64,-71,-105,-109,-103,-104,166,-40,-60,-57,-70,172,-83,-85,-87,-88,-89,-90,-91,-92,-94,-96,-97,-99,-100,-101,-107,-59,-39,-61,-66,-65,]),'IN':([23,61,62,160,],[-110,-41,115,-42,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'chunk':([0,],[1,]),'block':([0,11,13,111,113,130,168,179,186,194,196,201,],[2,57,59,155,157,169,180,189,193,198,200,203,]),'blockpart':([0,11,13,111,113,130,168,179,186,194,196,201,],[3,3,3,3,3,3,3,3,3,3,3,3,]),'laststat':([0,3,11,13,111,113,130,168,179,186,194,196,201,],[4,24,4,4,4,4,4,4,4,4,4,4,4,]),'stat':([0,3,11,13,111,113,130,168,179,186,194,196,201,],[5,25,5,5,5,5,5,5,5,5,5,5,5,]),'empty':([0,3,7,11,13,26,111,113,130,168,179,186,194,196,201,],[8,8,27,8,8,78,8,8,8,8,8,8,8,8,8,]),'varlist':([0,3,11,13,111,113,130,168,179,186,194,196,201,],[9,9,9,9,9,9,9,9,9,9,9,9,9,]),'functioncall':([0,3,7,11,12,13,14,22,42,49,51,53,55,56,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,111,112,113,114,115,121,130,134,139,168,177,178,179,183,186,194,195,196,201,],[10,10,41,10,41,10,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,10,41,10,41,41,41,10,41,41,10,41,41,10,41,10,10,41,10,10,]),'name':([0,3,7,11,12,13,14,15,17,18,22,42,49,51,53,55,56,66,70,71,72,73,79,81,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,111,112,113,114,115,116,118,119,121,130,134,139,168,170,177,178,179,183,186,194,195,196,201,],[16,16,16,16,16,16,16,61,65,67,16,87,16,16,16,16,16,120,122,16,124,16,16,67,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,160,161,162,16,16,87,16,16,160,16,16,16,16,16,16,16,16,16,]),'var':([0,3,7,11,12,13,14,22,42,49,51,53,55,56,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,111,112,113,114,115,121,130,134,139,168,177,178,179,183,186,194,195,196,201,],[20,20,40,20,40,20,40,40,40,40,40,40,40,108,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,20,40,20,40,40,40,20,40,40,20,40,40,20,40,20,20,40,20,20,]),'prefixexp':([0,3,7,11,12,13,14,22,42,49,51,53,55,56,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,111,112,113,114,115,121,130,134,139,168,177,178,179,183,186,194,195,196,201,],[21,21,36,21,36,21,36,36,36,36,36,36,36,109,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,21,36,21,36,36,36,21,36,36,21,36,36,21,36,21,21,36,21,21,]),'explist':([7,55,73,115,121,],[26,107,126,159,164,]),'exp':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[28,58,60,77,86,103,103,103,28,123,28,128,138,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,156,158,28,28,86,173,187,188,191,199,]),'function':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,]),'tableconstructor':([7,12,14,21,22,36,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,109,112,114,115,121,122,134,139,177,178,183,195,],[37,37,37,74,37,74,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,74,37,37,37,37,74,37,37,37,37,37,37,]),'op':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,]),'op_one':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,]),'op_two':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[44,44,44,44,44,44,44,44,44,44,44,44,44,140,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'op_three':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,141,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'op_four':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,142,143,144,145,146,147,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,]),'op_five':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,148,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,]),'op_six':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,48,149,150,48,48,48,48,48,48,48,48,48,48,48,48,48,48,]),'op_seven':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,151,152,153,50,50,50,50,50,50,50,50,50,50,50,]),'op_eight':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[52,52,52,52,52,102,104,106,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,]),'op_nine':([7,12,14,22,42,49,51,53,55,71,73,79,85,88,89,90,91,92,93,94,95,96,97,98,99,100,101,105,112,114,115,121,134,139,177,178,183,195,],[54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,54,154,54,54,54,54,54,54,54,54,54,54,]),'namelist':([15,18,81,],[62,68,131,]),'funcname':([17,],[63,]),'funcname_dot':([17,],[64,]),'args':([21,36,109,122,],[69,69,69,165,]),'string':([21,36,109,122,],[75,75,75,75,]),'funcbody':([39,63,120,],[80,117,163,]),'fieldlist':([42,],[82,]),'field':([42,134,],[84,171,]),'parlist':([81,],[129,]),'fieldsep':([82,],[134,]),'optfieldsep':([82,],[135,]),'elseiflist':([157,],[175,]),'elseif':([157,175,],[176,185,]),'else':([175,],[184,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> chunk","S'",1,None,None,None),
+  ('chunk -> block','chunk',1,'p_chunk','parse.py',37),
+  ('block -> blockpart','block',1,'p_block1','parse.py',41),
+  ('block -> laststat','block',1,'p_block2','parse.py',45),
+  ('block -> blockpart laststat','block',2,'p_block2','parse.py',46),
+  ('blockpart -> stat','blockpart',1,'p_blockpart','parse.py',55),
+  ('blockpart -> blockpart stat','blockpart',2,'p_blockpart','parse.py',56),
+  ('stat -> empty','stat',1,'p_stat1','parse.py',65),
+  ('stat -> varlist ASSIGN explist','stat',3,'p_stat2','parse.py',69),
+  ('stat -> functioncall','stat',1,'p_stat3','parse.py',73),
+  ('stat -> DO block END','stat',3,'p_stat4','parse.py',77),
+  ('stat -> WHILE exp DO block END','stat',5,'p_stat5','parse.py',82),
+  ('stat -> REPEAT block UNTIL exp','stat',4,'p_stat6','parse.py',86),
+  ('stat -> IF exp THEN block elseiflist else END','stat',7,'p_stat7','parse.py',90),
+  ('stat -> FOR name ASSIGN exp COMMA exp DO block END','stat',9,'p_stat8','parse.py',94),
+  ('stat -> FOR name ASSIGN exp COMMA exp COMMA exp DO block END','stat',11,'p_stat9','parse.py',99),
+  ('stat -> FOR namelist IN explist DO block END','stat',7,'p_stat10','parse.py',104),
+  ('stat -> FUNCTION funcname funcbody','stat',3,'p_stat11','parse.py',108),
+  ('stat -> LOCAL FUNCTION name funcbody','stat',4,'p_stat12','parse.py',112),
+  ('stat -> LOCAL namelist','stat',2,'p_stat13','parse.py',116),
+  ('stat -> LOCAL namelist ASSIGN explist','stat',4,'p_stat14','parse.py',120),
+  ('laststat -> BREAK','laststat',1,'p_laststat1','parse.py',124),
+  ('laststat -> RETURN explist empty','laststat',3,'p_laststat2','parse.py',128),
+  ('laststat -> RETURN empty','laststat',2,'p_laststat2','parse.py',129),
+  ('empty -> SEMICOLON','empty',1,'p_empty','parse.py',136),
+  ('empty -> <empty>','empty',0,'p_empty','parse.py',137),
+  ('elseiflist -> elseif','elseiflist',1,'p_elseiflist','parse.py',139),
+  ('elseiflist -> elseiflist elseif','elseiflist',2,'p_elseiflist','parse.py',140),
+  ('elseiflist -> <empty>','elseiflist',0,'p_elseiflist','parse.py',141),
+  ('elseif -> ELSEIF exp THEN block','elseif',4,'p_elseif','parse.py',152),
+  ('else -> ELSE block','else',2,'p_else','parse.py',156),
+  ('else -> <empty>','else',0,'p_else','parse.py',157),
+  ('funcname -> funcname_dot','funcname',1,'p_funcname','parse.py',162),
+  ('funcname -> funcname_dot COLON name','funcname',3,'p_funcname','parse.py',163),
+  ('funcname_dot -> name','funcname_dot',1,'p_funcname_dot','parse.py',170),
+  ('funcname_dot -> funcname_dot DOT name','funcname_dot',3,'p_funcname_dot','parse.py',171),
+  ('varlist -> var','varlist',1,'p_varlist1','parse.py',180),
+  ('varlist -> varlist COMMA var','varlist',3,'p_varlist2','parse.py',185),
+  ('var -> name','var',1,'p_var1','parse.py',190),
+  ('var -> prefixexp BRACKET_L exp BRACKET_R','var',4,'p_var2','parse.py',194),
+  ('var -> prefixexp DOT name','var',3,'p_var3','parse.py',198),
+  ('namelist -> name','namelist',1,'p_namelist1','parse.py',202),
+  ('namelist -> namelist COMMA name','namelist',3,'p_namelist2','parse.py',207),
+  ('explist -> exp','explist',1,'p_explist1','parse.py',212),
+  ('explist -> explist COMMA exp','explist',3,'p_explist2','parse.py',217),
+  ('exp -> NIL','exp',1,'p_exp1','parse.py',222),
+  ('exp -> TRUE','exp',1,'p_exp2','parse.py',226),
+  ('exp -> FALSE','exp',1,'p_exp3','parse.py',230),
+  ('exp -> NUMBER','exp',1,'p_exp4','parse.py',234),
+  ('exp -> STRING','exp',1,'p_exp5','parse.py',238),
+  ('exp -> TDOT','exp',1,'p_exp6','parse.py',242),
+  ('exp -> function','exp',1,'p_exp7','parse.py',246),
+  ('exp -> prefixexp','exp',1,'p_exp7','parse.py',247),
+  ('exp -> tableconstructor','exp',1,'p_exp7','parse.py',248),
+  ('exp -> op','exp',1,'p_exp7','parse.py',249),
+  ('prefixexp -> var','prefixexp',1,'p_prefixexp1','parse.py',253),
+  ('prefixexp -> functioncall','prefixexp',1,'p_prefixexp1','parse.py',254),
+  ('prefixexp -> PARANTHESES_L exp PARANTHESES_R','prefixexp',3,'p_prefixexp2','parse.py',258),
+  ('functioncall -> prefixexp args','functioncall',2,'p_functioncall','parse.py',262),
+  ('functioncall -> prefixexp COLON name args','functioncall',4,'p_functioncall','parse.py',263),
+  ('args -> PARANTHESES_L PARANTHESES_R','args',2,'p_args','parse.py',271),
+  ('args -> PARANTHESES_L explist PARANTHESES_R','args',3,'p_args','parse.py',272),
+  ('args -> tableconstructor','args',1,'p_args','parse.py',273),
+  ('args -> string','args',1,'p_args','parse.py',274),
+  ('function -> FUNCTION funcbody','function',2,'p_function','parse.py',286),
+  ('funcbody -> PARANTHESES_L parlist PARANTHESES_R block END','funcbody',5,'p_funcbody','parse.py',290),
+  ('funcbody -> PARANTHESES_L PARANTHESES_R block END','funcbody',4,'p_funcbody','parse.py',291),
+  ('parlist -> namelist','parlist',1,'p_parlist1','parse.py',298),
+  ('parlist -> namelist COMMA TDOT','parlist',3,'p_parlist2','parse.py',302),
+  ('parlist -> TDOT','parlist',1,'p_parlist2','parse.py',303),
+  ('tableconstructor -> BRACES_L fieldlist BRACES_R','tableconstructor',3,'p_tableconstructor','parse.py',310),
+  ('tableconstructor -> BRACES_L BRACES_R','tableconstructor',2,'p_tableconstructor','parse.py',311),
+  ('fieldlist -> field','fieldlist',1,'p_fieldlist1','parse.py',318),
+  ('fieldlist -> fieldlist fieldsep field','fieldlist',3,'p_fieldlist2','parse.py',323),
+  ('fieldlist -> fieldlist optfieldsep','fieldlist',2,'p_fieldlist3','parse.py',328),
+  ('field -> BRACKET_L exp BRACKET_R ASSIGN exp','field',5,'p_field','parse.py',332),
+  ('field -> name ASSIGN exp','field',3,'p_field','parse.py',333),
+  ('field -> exp','field',1,'p_field','parse.py',334),
+  ('fieldsep -> COMMA','fieldsep',1,'p_fieldsep','parse.py',343),
+  ('fieldsep -> SEMICOLON','fieldsep',1,'p_fieldsep','parse.py',344),
+  ('optfieldsep -> fieldsep','optfieldsep',1,'p_optfieldsep','parse.py',346),
+  ('optfieldsep -> <empty>','optfieldsep',0,'p_optfieldsep','parse.py',347),
+  ('op -> op_one','op',1,'p_op','parse.py',349),
+  ('op_one -> op_one OR op_two','op_one',3,'p_op_one1','parse.py',353),
+  ('op_one -> op_two','op_one',1,'p_op_one2','parse.py',357),
+  ('op_two -> op_two AND op_three','op_two',3,'p_op_two1','parse.py',361),
+  ('op_two -> op_three','op_two',1,'p_op_two2','parse.py',365),
+  ('op_three -> op_three LESS_THEN op_four','op_three',3,'p_op_three1','parse.py',369),
+  ('op_three -> op_three LESS_EQUAL_THEN op_four','op_three',3,'p_op_three1','parse.py',370),
+  ('op_three -> op_three MORE_THEN op_four','op_three',3,'p_op_three1','parse.py',371),
+  ('op_three -> op_three MORE_EQUAL_THEN op_four','op_three',3,'p_op_three1','parse.py',372),
+  ('op_three -> op_three TILDE_EQUAL op_four','op_three',3,'p_op_three1','parse.py',373),
+  ('op_three -> op_three EQUALS op_four','op_three',3,'p_op_three1','parse.py',374),
+  ('op_three -> op_four','op_three',1,'p_op_three2','parse.py',378),
+  ('op_four -> op_four APPEND op_five','op_four',3,'p_op_four1','parse.py',382),
+  ('op_four -> op_five','op_four',1,'p_op_four2','parse.py',386),
+  ('op_five -> op_five PLUS op_six','op_five',3,'p_op_five1','parse.py',390),
+  ('op_five -> op_five MINUS op_six','op_five',3,'p_op_five1','parse.py',391),
+  ('op_five -> op_six','op_five',1,'p_op_five2','parse.py',395),
+  ('op_six -> op_six TIMES op_seven','op_six',3,'p_op_six1','parse.py',399),
+  ('op_six -> op_six DIVIDE op_seven','op_six',3,'p_op_six1','parse.py',400),
+  ('op_six -> op_six MODULO op_seven','op_six',3,'p_op_six1','parse.py',401),
+  ('op_six -> op_seven','op_six',1,'p_op_six2','parse.py',405),
+  ('op_seven -> NOT op_eight','op_seven',2,'p_op_seven1','parse.py',409),
+  ('op_seven -> SQUARE op_eight','op_seven',2,'p_op_seven1','parse.py',410),
+  ('op_seven -> MINUS op_eight','op_seven',2,'p_op_seven1','parse.py',411),
+  ('op_seven -> op_eight','op_seven',1,'p_op_seven2','parse.py',415),
+  ('op_eight -> op_eight POWER op_nine','op_eight',3,'p_op_eight1','parse.py',419),
+  ('op_eight -> op_nine','op_eight',1,'p_op_eight2','parse.py',423),
+  ('op_nine -> exp','op_nine',1,'p_op_nine','parse.py',427),
+  ('name -> NAME','name',1,'p_name','parse.py',431),
+  ('string -> STRING','string',1,'p_string','parse.py',435),
+]
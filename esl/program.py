@@ -0,0 +1,548 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+import os
+import mmap
+import struct
+import hashlib
+import logging
+import importlib
+import threading
+import collections
+
+import esl.lex
+import esl.parse
+import esl.interpreter
+import esl.optimize
+import esl.runtime
+
+logger = logging.getLogger(__name__)
+
+
+def source_key(code):
+    '''Returns cache key for script source code.'''
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+class ProgramFormatError(Exception):
+    pass
+
+
+# Serialized program layout (all integers are unsigned LEB128 varints,
+# signed ones are zigzag encoded):
+#
+#   magic, format version (u16), grammar signature (32 bytes),
+#   source key (32 bytes), source mtime and size (for cached files),
+#   constant pool, node stream, line table, source code.
+#
+# Node stream is a pre-order walk of the tree, every value is a tag
+# followed by payload: node type index and it's fields, index in constant
+# pool, or nothing for None/True/False. Line numbers of nodes are kept
+# in a separate delta encoded line table in the same order.
+
+MAGIC = b'ESLC'
+FORMAT_VERSION = 1
+
+CACHE_DIR = '__eslcache__'
+CACHE_SUFFIX = '.eslc'
+
+_HEADER = struct.Struct('<4sH32s32s')
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_CONST = 3
+_TAG_NODE = 4
+
+_CONST_STR = 0
+_CONST_INT = 1
+_CONST_FLOAT = 2
+
+_FLOAT = struct.Struct('<d')
+
+_NODE_TYPES = (
+    'Chunk', 'Block', 'Assignment', 'While', 'If', 'NumericFor',
+    'GenericFor', 'Function', 'Break', 'Return', 'ElseIfList', 'ElseIf',
+    'Else', 'FunctionName', 'VariableList', 'Variable', 'NameList',
+    'ExpressionList', 'Constant', 'FunctionCall', 'Args', 'FunctionBody',
+    'ParametersList', 'Table', 'FieldList', 'Field', 'Logical',
+    'Relational', 'Append', 'Arithmetic', 'Unary', 'Name',
+)
+
+_signature = None
+
+
+def grammar_signature():
+    '''Returns digest identifying grammar and node layout of programs.'''
+    global _signature
+    if _signature is None:
+        try:
+            parsetab = importlib.import_module(esl.parse.Parser.tabmodule)
+            grammar = getattr(parsetab, '_lr_signature', '')
+        except ImportError:
+            grammar = ''
+        layout = []
+        for name in _NODE_TYPES:
+            cls = getattr(esl.interpreter, name)
+            layout.append((name, cls._fields,
+                           issubclass(cls, esl.interpreter.ListNode)))
+        data = repr((FORMAT_VERSION, grammar, layout)).encode('utf-8')
+        _signature = hashlib.sha256(data).digest()
+    return _signature
+
+
+class _Writer(object):
+    def __init__(self):
+        self.types = {getattr(esl.interpreter, name): i
+                      for i, name in enumerate(_NODE_TYPES)}
+        self.constants = []
+        self.pool = {}
+        self.nodes = bytearray()
+        self.lines = bytearray()
+        self.lineno = 0
+
+    @staticmethod
+    def uint(buf, value):
+        while value > 0x7f:
+            buf.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buf.append(value)
+
+    @classmethod
+    def sint(cls, buf, value):
+        cls.uint(buf, value * 2 if value >= 0 else -value * 2 - 1)
+
+    def constant(self, value):
+        key = (type(value), value)
+        index = self.pool.get(key)
+        if index is None:
+            index = self.pool[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def value(self, value):
+        buf = self.nodes
+        if value is None:
+            buf.append(_TAG_NONE)
+        elif value is False:
+            buf.append(_TAG_FALSE)
+        elif value is True:
+            buf.append(_TAG_TRUE)
+        elif isinstance(value, (str, int, float)):
+            buf.append(_TAG_CONST)
+            self.uint(buf, self.constant(value))
+        elif type(value) in self.types:
+            self.node(value)
+        else:
+            raise ProgramFormatError('can\'t serialize {}'.format(
+                type(value).__name__))
+
+    def node(self, node):
+        buf = self.nodes
+        buf.append(_TAG_NODE)
+        self.uint(buf, self.types[type(node)])
+        self.sint(self.lines, node.lineno - self.lineno)
+        self.lineno = node.lineno
+        for name in node._fields:
+            self.value(getattr(node, name))
+        if isinstance(node, esl.interpreter.ListNode):
+            self.uint(buf, len(node.children))
+            for child in node.children:
+                self.value(child)
+
+    def pool_bytes(self):
+        buf = bytearray()
+        self.uint(buf, len(self.constants))
+        for value in self.constants:
+            if isinstance(value, str):
+                data = value.encode('utf-8')
+                buf.append(_CONST_STR)
+                self.uint(buf, len(data))
+                buf += data
+            elif isinstance(value, int):
+                buf.append(_CONST_INT)
+                self.sint(buf, value)
+            else:
+                buf.append(_CONST_FLOAT)
+                buf += _FLOAT.pack(value)
+        return buf
+
+
+class _Reader(object):
+    def __init__(self, data, pos):
+        self.types = [getattr(esl.interpreter, name) for name in _NODE_TYPES]
+        self.data = data
+        self.pos = pos
+        self.constants = []
+        self.lines = None
+        self.lineno = 0
+
+    def uint(self):
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def sint(self):
+        value = self.uint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+    def raw(self, size):
+        end = self.pos + size
+        if end > len(self.data):
+            raise ProgramFormatError('truncated data')
+        chunk = bytes(self.data[self.pos:end])
+        self.pos = end
+        return chunk
+
+    def pool(self):
+        for i in range(0, self.uint()):
+            kind = self.data[self.pos]
+            self.pos += 1
+            if kind == _CONST_STR:
+                value = self.raw(self.uint()).decode('utf-8')
+            elif kind == _CONST_INT:
+                value = self.sint()
+            elif kind == _CONST_FLOAT:
+                value = _FLOAT.unpack(self.raw(_FLOAT.size))[0]
+            else:
+                raise ProgramFormatError('unknown constant type')
+            self.constants.append(value)
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _TAG_NONE:
+            return None
+        elif tag == _TAG_FALSE:
+            return False
+        elif tag == _TAG_TRUE:
+            return True
+        elif tag == _TAG_CONST:
+            return self.constants[self.uint()]
+        elif tag == _TAG_NODE:
+            return self.node()
+        raise ProgramFormatError('unknown tag {}'.format(tag))
+
+    def node(self):
+        cls = self.types[self.uint()]
+        lineno = self.lineno = self.lineno + self.lines.sint()
+        node = cls(lineno, *[self.value() for name in cls._fields])
+        if isinstance(node, esl.interpreter.ListNode):
+            for i in range(0, self.uint()):
+                node.append(self.value())
+        return node
+
+
+class Program(object):
+    '''Parsed script: source code and it's syntax tree.
+
+    Program is immutable and is shared by all runs of the script, state
+    of a run is kept in esl.interpreter.ExecutionContext. Only compiled
+    dictionary grows, engines cache their code there.'''
+    def __init__(self, code, chunk, key=None, optimizations=None):
+        if key is None:
+            key = source_key(code)
+        self.code = code
+        self.chunk = chunk
+        self.key = key
+        self.compiled = {}
+        self.optimizations = list(optimizations or ())
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise AttributeError('program is immutable')
+        super().__setattr__(name, value)
+
+    def call_stats(self):
+        '''Returns count of call sites and hits and misses of their
+        inline caches by engine.'''
+        return self.site_stats(esl.runtime.CallSite)
+
+    def field_stats(self):
+        '''Returns count of field access sites and hits and misses of
+        their inline caches by engine.'''
+        return self.site_stats(esl.runtime.FieldSite)
+
+    def global_stats(self):
+        '''Returns count of global variable references and hits and misses
+        of their inline caches by engine.'''
+        return self.site_stats(esl.runtime.GlobalSite)
+
+    def site_stats(self, cls):
+        engines = {'touch': []}
+        if self.chunk is not None:
+            engines['touch'] = [
+                node.site for node in self.chunk.walk()
+                if isinstance(getattr(node, 'site', None), cls)
+            ]
+        for engine, code in self.compiled.items():
+            engines[engine] = [
+                site for site in code.sites if isinstance(site, cls)
+            ]
+
+        result = {}
+        for engine, sites in engines.items():
+            result[engine] = {
+                'sites': len(sites),
+                'hits': sum(site.hits for site in sites),
+                'misses': sum(site.misses for site in sites),
+            }
+        return result
+
+    def dump(self, mtime=0, size=0):
+        '''Serializes program to versioned binary format.'''
+        writer = _Writer()
+        writer.value(self.chunk)
+
+        buf = bytearray(
+            _HEADER.pack(MAGIC, FORMAT_VERSION, grammar_signature(),
+                         bytes.fromhex(self.key)))
+        writer.uint(buf, mtime)
+        writer.uint(buf, size)
+
+        sections = (writer.pool_bytes(), writer.nodes, writer.lines,
+                    self.code.encode('utf-8'))
+        for section in sections:
+            writer.uint(buf, len(section))
+            buf += section
+        return bytes(buf)
+
+    @classmethod
+    def header(cls, data):
+        '''Returns key, mtime and size of source stored in data.'''
+        if len(data) < _HEADER.size:
+            raise ProgramFormatError('truncated header')
+        magic, version, signature, key = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ProgramFormatError('not a compiled esl program')
+        if version != FORMAT_VERSION:
+            raise ProgramFormatError('unsupported format version {}'.format(
+                version))
+        if signature != grammar_signature():
+            raise ProgramFormatError('program compiled for another grammar')
+        reader = _Reader(data, _HEADER.size)
+        try:
+            return key.hex(), reader.uint(), reader.uint(), reader.pos
+        except IndexError:
+            raise ProgramFormatError('truncated header') from None
+
+    @classmethod
+    def load(cls, data):
+        '''Loads program from bytes-like object (bytes, mmap, ...).'''
+        with memoryview(data) as view:
+            key, mtime, size, pos = cls.header(view)
+            try:
+                reader = _Reader(view, pos)
+                sections = []
+                for i in range(0, 4):
+                    length = reader.uint()
+                    sections.append(_Reader(view, reader.pos))
+                    reader.pos += length
+                code_size = length
+                if reader.pos > len(view):
+                    raise ProgramFormatError('truncated data')
+
+                pool, nodes, lines, source = sections
+                pool.pool()
+                nodes.constants = pool.constants
+                nodes.lines = lines
+                chunk = nodes.value()
+                code = source.raw(code_size).decode('utf-8')
+            except (IndexError, TypeError, UnicodeDecodeError) as e:
+                raise ProgramFormatError(
+                    'corrupted data: {}'.format(e)) from None
+        return cls(code, chunk, key)
+
+
+class ProgramCache(object):
+    '''LRU cache of parsed programs keyed by source hash.
+
+    One parser is shared by all compilations made through the cache, so
+    lexer and LALR tables are built only once per process. If optimize is
+    true, parsed syntax trees are passed through esl.optimize.'''
+    def __init__(self, maxsize=256, optimize=True):
+        self.maxsize = maxsize
+        self.optimize = optimize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.__programs = collections.OrderedDict()
+        self.__parser = None
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.__programs)
+
+    def __contains__(self, code):
+        return source_key(code) in self.__programs
+
+    @property
+    def parser(self):
+        with self.__lock:
+            if self.__parser is None:
+                self.__parser = esl.parse.Parser()
+            return self.__parser
+
+    def parse(self, code, parser=None):
+        '''Parses code to syntax tree without caching it.'''
+        if parser is None:
+            parser = self.parser
+        with self.__lock:
+            try:
+                return parser.parse(code)
+            except (esl.lex.LexError, esl.parse.ParseError) as e:
+                raise esl.interpreter.ESLSyntaxError(str(e))
+
+    def get(self, key):
+        '''Returns cached program by key or None.'''
+        with self.__lock:
+            program = self.__programs.get(key)
+            if program is not None:
+                self.__programs.move_to_end(key)
+                self.hits += 1
+            return program
+
+    def add(self, program):
+        with self.__lock:
+            if self.maxsize > 0:
+                self.__programs[program.key] = program
+                self.__programs.move_to_end(program.key)
+                while len(self.__programs) > self.maxsize:
+                    self.__programs.popitem(last=False)
+                    self.evictions += 1
+
+    def compile(self, code):
+        '''Returns cached program for code, parses code on cache miss.'''
+        key = source_key(code)
+        with self.__lock:
+            program = self.get(key)
+            if program is None:
+                self.misses += 1
+                chunk = self.parse(code)
+                if self.optimize:
+                    changes = esl.optimize.optimize(chunk)
+                else:
+                    changes = []
+                program = Program(code, chunk, key, changes)
+                self.add(program)
+            return program
+
+    def compile_file(self, path, write=True):
+        '''Returns program for script file.
+
+        Compiled program is loaded from `__eslcache__` directory next to
+        the script if it is up to date, otherwise script is parsed and
+        (if write is true) compiled program is saved there.'''
+        stat = os.stat(path)
+        mtime, size = stat.st_mtime_ns, stat.st_size
+        compiled = cache_path(path)
+
+        try:
+            program = load_file(compiled, mtime, size)
+        except (OSError, ValueError, ProgramFormatError) as e:
+            logger.debug('Can\'t load %s: %s', compiled, e)
+        else:
+            with self.__lock:
+                cached = self.get(program.key)
+                if cached is not None:
+                    return cached
+                self.misses += 1
+                self.add(program)
+            return program
+
+        with open(path, encoding='utf-8') as f:
+            program = self.compile(f.read())
+
+        if write:
+            try:
+                save_file(program, compiled, mtime, size)
+            except OSError as e:
+                logger.debug('Can\'t write %s: %s', compiled, e)
+
+        return program
+
+    def invalidate(self, code=None, key=None):
+        '''Drops program from cache, returns True if it was cached.'''
+        if key is None:
+            key = source_key(code)
+        with self.__lock:
+            return self.__programs.pop(key, None) is not None
+
+    def resize(self, maxsize):
+        with self.__lock:
+            self.maxsize = maxsize
+            while len(self.__programs) > max(maxsize, 0):
+                self.__programs.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__programs.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        return {
+            'size': len(self.__programs),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def cache_path(path):
+    '''Returns path of compiled program for script path.'''
+    directory, name = os.path.split(path)
+    return os.path.join(directory, CACHE_DIR, name + CACHE_SUFFIX)
+
+
+def save_file(program, path, mtime=0, size=0):
+    '''Atomically writes compiled program to path.'''
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(temp, 'wb') as f:
+            f.write(program.dump(mtime, size))
+        os.replace(temp, path)
+    except OSError:
+        if os.path.exists(temp):
+            os.unlink(temp)
+        raise
+
+
+def load_file(path, mtime=None, size=None):
+    '''Loads compiled program from memory-mapped file.
+
+    If mtime and size are given, they must match source file stats
+    stored in compiled program.'''
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if mtime is not None or size is not None:
+                key, stored_mtime, stored_size, pos = Program.header(data)
+                if (stored_mtime, stored_size) != (mtime, size):
+                    raise ProgramFormatError('source file changed')
+            return Program.load(data)
+
+
+cache = ProgramCache()
+
+
+def compile(code):
+    '''Returns program for code using process-wide cache.'''
+    return cache.compile(code)
+
+
+def compile_file(path, write=True):
+    '''Returns program for script file using process-wide cache.'''
+    return cache.compile_file(path, write)
@@ -0,0 +1,205 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Lexical scope resolution. Every local variable gets fixed slot in frame
+# of function declaring it, every variable reference is resolved to slot
+# and count of functions between reference and declaration. Names not
+# declared as locals are globals and stay in namespace.
+#
+# Touch engine keeps locals in namespaces instead of frames: one namespace
+# per function call, locals are stored under keys unique to declaration
+# (see annotate), so it's variables have the same lifetime as slots.
+
+import esl.interpreter
+
+
+class _Function(object):
+    def __init__(self, root, first):
+        self.root = root
+        self.scopes = []
+        self.size = first
+        # Slot: namespace key of local variable
+        self.keys = {}
+
+
+class Resolver(object):
+    def __init__(self, first=0):
+        self.first = first
+
+        # Name and Variable nodes: (depth, slot)
+        self.slots = {}
+        # Chunk and FunctionBody nodes: frame size
+        self.sizes = {}
+        # FunctionBody nodes: slot of `self'
+        self.selves = {}
+        # Name and Variable nodes of locals: namespace key
+        self.keys = {}
+
+        self.functions = []
+
+        nodes = esl.interpreter
+        self.handlers = {
+            nodes.Chunk: self.chunk,
+            nodes.Block: self.block,
+            nodes.Assignment: self.assignment,
+            nodes.NumericFor: self.numeric_for,
+            nodes.GenericFor: self.generic_for,
+            nodes.Function: self.function,
+            nodes.Variable: self.variable,
+            nodes.FunctionCall: self.function_call,
+            nodes.Field: self.field,
+        }
+
+    def push_function(self, root):
+        self.functions.append(_Function(root, self.first))
+
+    def pop_function(self):
+        function = self.functions.pop()
+        self.sizes[function.root] = function.size
+
+    def push_scope(self):
+        self.functions[-1].scopes.append({})
+
+    def pop_scope(self):
+        self.functions[-1].scopes.pop()
+
+    def declare(self, node):
+        '''Declares local variable for Name node, returns it's slot.'''
+        function = self.functions[-1]
+        slot = function.size
+        function.size += 1
+        function.scopes[-1][node.name] = slot
+        self.slots[node] = (0, slot)
+        function.keys[slot] = self.keys[node] = local_key(node)
+        return slot
+
+    def lookup(self, name):
+        '''Returns (depth, slot) of local variable or None.'''
+        depth = 0
+        for function in reversed(self.functions):
+            for scope in reversed(function.scopes):
+                if name in scope:
+                    return (depth, scope[name])
+            depth += 1
+        return None
+
+    def reference(self, node, name):
+        location = self.lookup(name)
+        if location is not None:
+            self.slots[node] = location
+            depth, slot = location
+            function = self.functions[-1 - depth]
+            self.keys[node] = function.keys[slot]
+
+    def visit(self, node):
+        if node is None:
+            return
+        handler = self.handlers.get(type(node))
+        if handler is None:
+            for child in node.iter_children():
+                self.visit(child)
+        else:
+            handler(node)
+
+    def chunk(self, node):
+        self.push_function(node)
+        self.push_scope()
+        self.visit(node.block)
+        self.pop_scope()
+        self.pop_function()
+
+    def function_body(self, node, colon):
+        self.push_function(node)
+        self.push_scope()
+        if colon:
+            slot = self.declare(esl.interpreter.Name(node.lineno, 'self'))
+            self.selves[node] = slot
+            # Callers set `self' by name, they don't know the declaration
+            self.functions[-1].keys[slot] = 'self'
+        if node.parlist is not None and node.parlist.namelist is not None:
+            for name in node.parlist.namelist.children:
+                self.declare(name)
+        self.visit(node.body)
+        self.pop_scope()
+        self.pop_function()
+
+    def block(self, node):
+        self.push_scope()
+        for statement in node.children:
+            self.visit(statement)
+        self.pop_scope()
+
+    def assignment(self, node):
+        self.visit(node.value)
+        for item in node.left.children:
+            if node.local:
+                self.declare(item)
+            else:
+                self.visit(item)
+
+    def numeric_for(self, node):
+        self.visit(node.start)
+        self.visit(node.limit)
+        self.visit(node.step)
+        self.push_scope()
+        self.declare(node.name)
+        self.visit(node.block)
+        self.pop_scope()
+
+    def generic_for(self, node):
+        self.visit(node.explist)
+        self.push_scope()
+        for name in node.namelist.children:
+            self.declare(name)
+        self.visit(node.block)
+        self.pop_scope()
+
+    def function(self, node):
+        first = node.parts[0]
+        if node.local:
+            self.declare(first)
+        else:
+            self.reference(first, first.name)
+        self.function_body(node.body, node.colon)
+
+    def variable(self, node):
+        if node.left is None and isinstance(node.name, esl.interpreter.Name):
+            self.reference(node, node.name.name)
+            return
+        self.visit(node.left)
+        if not isinstance(node.name, esl.interpreter.Name):
+            self.visit(node.name)
+
+    def function_call(self, node):
+        self.visit(node.prefixexp)
+        self.visit(node.args)
+
+    def field(self, node):
+        if not isinstance(node.name, esl.interpreter.Name):
+            self.visit(node.name)
+        self.visit(node.expression)
+
+
+def local_key(node):
+    '''Returns namespace key of local variable declared by Name node, it
+    can't clash with names of globals.'''
+    return '{}#{:x}'.format(node.name, id(node))
+
+
+def resolve(root, first=0, colon=False):
+    '''Resolves locals of chunk or standalone function body.'''
+    resolver = Resolver(first)
+    if isinstance(root, esl.interpreter.FunctionBody):
+        resolver.function_body(root, colon)
+    else:
+        resolver.visit(root)
+    return resolver
+
+
+def annotate(chunk):
+    '''Sets key attribute of Name and Variable nodes of locals in chunk
+    to namespace key of the variable, as touch engine reads it. Keys
+    depend only on nodes, so annotating chunk again changes nothing.'''
+    for node, key in resolve(chunk).keys.items():
+        node.key = key
@@ -0,0 +1,449 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Operations shared by compiled execution engines. Semantics must follow
+# touch() methods of esl.interpreter nodes.
+
+import sys
+import bisect
+import inspect
+import operator
+import itertools
+
+from types import MethodType
+
+import esl.function
+import esl.namespace
+import esl.table
+
+from esl.table import Table
+
+ARITHMETIC = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+RELATIONAL = {
+    '==': operator.eq,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    '~=': operator.ne,
+}
+
+FALSE = (None, False)
+
+
+def locate(exc, lineno):
+    '''Remembers script line where exception was raised.
+
+    Innermost location wins, so outer blocks don't override it.'''
+    if getattr(exc, 'esl_lineno', None) is None:
+        try:
+            exc.esl_lineno = lineno
+        except AttributeError:
+            pass
+
+
+def unsupported(operation):
+    def fail(left, right):
+        raise NotImplementedError('operation {} not '
+                                  'supported'.format(operation))
+
+    return fail
+
+
+# Access paths remembered by field sites
+FIELD_ITEM, FIELD_ATTRIBUTE = range(2)
+
+# Count of receiver types remembered by one field site, other types are
+# resolved without cache
+FIELD_TYPES = 4
+
+# Entry of field site which remembers no table field
+NO_FIELD = (None, None, None, None)
+
+
+class FieldSite(object):
+    '''Polymorphic inline cache of field access site.
+
+    Remembers by receiver's type whether field is accessed as item (dicts,
+    tables) or as attribute (host objects), so attributes are reached
+    without raising and catching TypeError of item access. Access itself
+    goes through namespace, so its access checks still apply, paths are
+    forgotten when namespace class changes.
+
+    Besides, site remembers shape of last table and offset of field in
+    it, so string keys of tables sharing shape are accessed in their
+    fields list directly. It is done only for namespaces accessing items
+    as Namespace does. Sites are shared by threads running the same
+    program, so shape, key, offset and namespace class are kept in entry
+    tuple replaced at once.'''
+    __slots__ = ('namespace', 'paths', 'entry', 'hits', 'misses')
+
+    def __init__(self):
+        self.namespace = None
+        self.paths = {}
+        self.entry = NO_FIELD
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, ns, obj):
+        if type(ns) is not self.namespace:
+            self.namespace = type(ns)
+            self.paths.clear()
+            self.entry = NO_FIELD
+        path = self.paths.get(type(obj))
+        if path is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return path
+
+    def learn(self, obj, path):
+        if path == FIELD_ATTRIBUTE and isinstance(obj,
+                                                  (dict, esl.table.Table)):
+            # Item access of container failed because of key
+            return
+        if len(self.paths) < FIELD_TYPES:
+            self.paths[type(obj)] = path
+
+    def remember(self, ns, obj, name):
+        '''Remembers offset of field in table's shape.'''
+        if type(obj) is Table and items_cacheable(type(ns)):
+            shape = obj.shape
+            offset = shape.index.get(name)
+            if offset is not None and offset < shape.size:
+                self.entry = (shape, name, offset, type(ns))
+
+    def get(self, ns, obj, name):
+        if obj.__class__ is Table:
+            shape, key, offset, namespace = self.entry
+            if (obj.shape is shape and name == key
+                    and ns.__class__ is namespace):
+                self.hits += 1
+                return obj.fields[offset]
+        path = self.path(ns, obj)
+        if path == FIELD_ATTRIBUTE:
+            return ns.get_attribute(obj, name)
+        try:
+            result = ns.get_item(obj, name)
+        except TypeError:
+            if path is None:
+                self.learn(obj, FIELD_ATTRIBUTE)
+            return ns.get_attribute(obj, name)
+        if path is None:
+            self.learn(obj, FIELD_ITEM)
+        if result is not None:
+            self.remember(ns, obj, name)
+        return result
+
+    def set(self, ns, obj, name, value):
+        if obj.__class__ is Table and value is not None:
+            shape, key, offset, namespace = self.entry
+            if (obj.shape is shape and name == key
+                    and ns.__class__ is namespace):
+                self.hits += 1
+                obj.fields[offset] = value
+                return
+        path = self.path(ns, obj)
+        if path != FIELD_ATTRIBUTE:
+            try:
+                if value is None:
+                    if name in obj:
+                        ns.del_item(obj, name)
+                else:
+                    ns.set_item(obj, name, value)
+            except TypeError:
+                if path is None:
+                    self.learn(obj, FIELD_ATTRIBUTE)
+            else:
+                if path is None:
+                    self.learn(obj, FIELD_ITEM)
+                if value is not None:
+                    self.remember(ns, obj, name)
+                return
+        if value is None:
+            if ns.has_attribute(obj, name):
+                ns.del_attribute(obj, name)
+        else:
+            ns.set_attribute(obj, name, value)
+
+
+class GlobalSite(object):
+    '''Inline cache of global variable reference.
+
+    Remembers value of variable looked up from namespace together with
+    version of namespace root, so while no variable is written lookups
+    cost version comparison instead of walk through parent namespaces.
+    Namespaces redefining variables access are not cached.
+
+    Sites are shared by threads running the same program, so namespace,
+    version and value are kept in entry tuple replaced at once.'''
+    __slots__ = ('name', 'entry', 'hits', 'misses')
+
+    def __init__(self, name):
+        self.name = name
+        self.entry = (None, None, None)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ns):
+        namespace, version, value = self.entry
+        if ns is namespace and ns.root.version == version:
+            self.hits += 1
+            return value
+        return self.lookup(ns)
+
+    def lookup(self, ns):
+        '''Resolves variable and remembers it if namespace allows.'''
+        self.misses += 1
+        value = ns.get_var(self.name)
+        if cacheable(type(ns)):
+            self.entry = (ns, ns.root.version, value)
+        return value
+
+
+def cacheable(cls):
+    '''Checks if namespace class resolves variables as Namespace does.'''
+    base = esl.namespace.Namespace
+    return (cls.get_var is base.get_var and cls.set_var is base.set_var
+            and cls.del_var is base.del_var)
+
+
+def items_cacheable(cls):
+    '''Checks if namespace class accesses items as Namespace does.'''
+    base = esl.namespace.Namespace
+    return (cls.get_item is base.get_item and cls.set_item is base.set_item
+            and cls.check_key is base.check_key)
+
+
+def get_method(obj, name):
+    if isinstance(obj, esl.table.Table):
+        return obj[name]
+    return getattr(obj, name)
+
+
+def concat(left, right):
+    if (not isinstance(left, (str, int, float))
+            or not isinstance(right, (str, int, float))):
+        raise TypeError('can concate only strings or numbers, '
+                        'got `{} .. {}\''.format(
+                            type(left).__name__,
+                            type(right).__name__))
+    return str(left) + str(right)
+
+
+def append(context, left, right):
+    '''Concatenates values accounting memory of result.'''
+    result = concat(left, right)
+    if context.quota is not None:
+        context.allocate(sys.getsizeof(result))
+    return result
+
+
+def length(value):
+    return len(value)
+
+
+def negate(value):
+    return -value
+
+
+def not_(value):
+    return not bool(value)
+
+
+UNARY = {
+    '-': negate,
+    'not': not_,
+    '#': length,
+}
+
+
+def check_callable(func):
+    if not callable(func):
+        if isinstance(func, type(None)):
+            func = 'nil'
+        raise TypeError('{} is not callable'.format(str(func)))
+
+
+# Kinds of callees remembered by call sites
+(CALL_FUNCTION, CALL_PYTHON, CALL_COROUTINE, CALL_METHOD,
+ CALL_COROUTINE_METHOD) = range(5)
+
+_EMPTY = object()
+
+
+class CallSite(object):
+    '''Inline cache of call site.
+
+    Remembers last called object and how it must be called, so callee is
+    classified (isinstance, callable and inspect checks) only when it
+    changes. Bound methods are created on every attribute access, so they
+    are keyed by their function. Frame (function name, line) is pushed to
+    call stack of execution context when ESL function is called.
+
+    Sites are shared by threads running the same program, so key, bound
+    flag and kind are kept in entry tuple replaced at once.'''
+    __slots__ = ('entry', 'hits', 'misses', 'frame')
+
+    def __init__(self, frame=None):
+        self.frame = frame
+        self.entry = (_EMPTY, False, None)
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, func):
+        '''Returns kind of func, raises TypeError if it's not callable.'''
+        bound = type(func) is MethodType
+        key = func.__func__ if bound else func
+        cached_key, cached_bound, kind = self.entry
+        if key is cached_key and bound is cached_bound:
+            self.hits += 1
+            return kind
+
+        self.misses += 1
+        if isinstance(func, esl.function.Function):
+            kind = CALL_FUNCTION
+        else:
+            check_callable(func)
+            if bound:
+                if inspect.iscoroutinefunction(func.__func__):
+                    kind = CALL_COROUTINE_METHOD
+                else:
+                    kind = CALL_METHOD
+            elif inspect.iscoroutinefunction(func):
+                kind = CALL_COROUTINE
+            else:
+                kind = CALL_PYTHON
+        self.entry = (key, bound, kind)
+        return kind
+
+
+def numeric_range(start, limit, step):
+    '''Returns values of numeric for loop variable.'''
+    assert isinstance(start, int)
+    assert isinstance(limit, int)
+    assert isinstance(step, int)
+    if step > 0:
+        return range(start, limit + 1, step)
+    elif step < 0:
+        return range(start, limit - 1, step)
+    return itertools.repeat(start) if start >= limit else ()
+
+
+def make_table(fieldlist):
+    table = esl.table.Table()
+    i = 1
+    for k, v in fieldlist:
+        if k is None:
+            k = i
+            i += 1
+        table[k] = v
+    return table
+
+
+class Pairs(object):
+    '''Stateful iterator function of generic for, returned by pairs().
+
+    Call returns next key and value of items iterator ignoring arguments,
+    engines take items directly.'''
+    __slots__ = ('items', )
+
+    def __init__(self, items):
+        self.items = items
+
+    def __call__(self, obj=None, key=None):
+        return next(self.items, None)
+
+
+def dict_items(obj):
+    for key in sorted(obj.keys()):
+        if key in obj:
+            yield key, obj[key]
+
+
+def items(obj):
+    '''Returns iterator of keys and values of table, list (keys from 0)
+    or dict (sorted keys), None for other objects.'''
+    if isinstance(obj, esl.table.Table):
+        return obj.items()
+    elif isinstance(obj, list):
+        return enumerate(obj)
+    elif isinstance(obj, dict):
+        return dict_items(obj)
+    return None
+
+
+def next_(obj, key=None):
+    '''Returns key and value following key in obj or None after last
+    one. Dict keys are sorted on every call, generic for traverses
+    dicts with items iterator instead (see iterator()).'''
+    if isinstance(obj, esl.table.Table):
+        return obj.next(key)
+
+    elif isinstance(obj, list):
+        if key is None:
+            key = 0
+        else:
+            key += 1
+        if key >= len(obj):
+            return None
+        return key, obj[key]
+
+    elif isinstance(obj, dict):
+        keys = sorted(obj.keys())
+        if key is None:
+            index = 0
+        elif key in obj:
+            index = bisect.bisect_right(keys, key)
+        else:
+            raise ValueError('invalid key to next')
+        if index >= len(keys):
+            return None
+        return keys[index], obj[keys[index]]
+
+    raise TypeError('table expected')
+
+
+def iterator(fun, obj, key):
+    '''Returns function of generic for: traversal started with next()
+    gets own Pairs, so it keeps position in loop instead of obj.'''
+    if fun is next_ and key is None:
+        found = items(obj)
+        if found is not None:
+            return Pairs(found)
+    return fun
+
+
+async def iterate(fun, obj, key):
+    '''Returns next values of generic for iterator or None.'''
+    if hasattr(fun, '__anext__'):
+        try:
+            return (None, await fun.__anext__())
+        except StopAsyncIteration:
+            return None
+    elif hasattr(fun, '__next__'):
+        try:
+            return (None, await fun.__next__())
+        except StopAsyncIteration:
+            return None
+    return fun(obj, key)
+
+
+def for_params(evaluated):
+    params = []
+    for value in evaluated:
+        if isinstance(value, (list, tuple)):
+            params += value
+        else:
+            params.append(value)
+    if len(params) < 3:
+        params += [None] * (3 - len(params))
+    fun, obj, key = params[0:3]
+    return iterator(fun, obj, key), obj, key
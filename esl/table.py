@@ -2,67 +2,639 @@ __author__ = 'Gennady Kovalev <gik@bigur.ru>'
 __copyright__ = '(c) 2016-2019 Development management business group'
 __licence__ = 'For license information see LICENSE'
 
+# Table keeps values of integer keys 1..n in array part (python list,
+# nil values are holes), other positive integer keys in sparse part and
+# all other keys in hash part (dicts). Like in Lua, size of array part is
+# chosen on rehash: it is the largest power of two n such that more than
+# n/2 of keys 1..n are used. Rehash happens when sparse part grows over
+# limit, limit grows with size of table, so keys migrate in bulk with
+# amortized constant cost. Key n+1 is appended to array part directly,
+# with keys n+2, n+3... of sparse part following it.
+#
+# Scripts create many small tables, so parts are allocated on first write
+# only. Until then they are shared immutable empty containers, which
+# serve lookups without extra checks.
+#
+# String keys are stored like attributes of objects in JavaScript engines:
+# table refers to shape, which maps keys to offsets in fields list. Tables
+# which got the same keys in the same order share one shape, adding or
+# removing key moves table to other shape found by transition from current
+# one. String keys above SHAPE_LIMIT go to hash part.
+#
+# Tables account their memory themselves, so growth made by host
+# functions (table.insert for example) counts against quota of running
+# script too.
+
+import types
+import contextvars
+import weakref
+import operator
+import threading
+import itertools
 import collections
 
+# Minimal size of sparse part causing rehash
+REHASH_LIMIT = 8
+
+# Maximal count of keys in shape
+SHAPE_LIMIT = 32
+
+# Placeholders of unallocated parts
+EMPTY_ARRAY = ()
+EMPTY_DICT = types.MappingProxyType({})
+
+# Approximate sizes in bytes of empty table and of one table field, used
+# by memory accounting
+TABLE_BYTES = 80
+FIELD_BYTES = 100
+
+# Function accounting memory of running script (see
+# esl.interpreter.ExecutionContext.allocate) or None if it has no quota
+accounting = contextvars.ContextVar('accounting', default=None)
+
+
+def account(size):
+    '''Adds size bytes to memory allocated by running script.'''
+    allocate = accounting.get()
+    if allocate is not None:
+        allocate(size)
+
+
+def normalize(key):
+    '''Returns key as stored in table: integral floats and booleans
+    become integers, subclasses of str become str.'''
+    if isinstance(key, float):
+        if key.is_integer():
+            return int(key)
+    elif isinstance(key, int):
+        return int(key)
+    elif isinstance(key, str):
+        return str(key)
+    else:
+        raise TypeError('incorrect key type')
+    return key
+
+
+class Shape(object):
+    '''Layout of string keys shared by tables.
+
+    Offset of key in fields list is index[key] if it is less than size.
+    Shape extended with new key reuses index of it's parent if no other
+    child did it, so chain of shapes built by adding keys has one index.
+    Children are created under shapes_lock, so threads extending the same
+    shape never write to shared index at once. Transitions are weak,
+    shapes live while tables or children use them.'''
+    __slots__ = ('parent', 'index', 'size', 'transitions', '__weakref__')
+
+    def __init__(self, parent=None, key=None):
+        self.parent = parent
+        self.transitions = {}
+        if parent is None:
+            self.index = {}
+            self.size = 0
+        else:
+            index = parent.index
+            if len(index) != parent.size:
+                index = dict(itertools.islice(index.items(), parent.size))
+            index[key] = parent.size
+            self.index = index
+            self.size = parent.size + 1
+
+    def keys(self):
+        return list(itertools.islice(self.index, self.size))
+
+    def add(self, key):
+        '''Returns shape with key added after keys of this one.'''
+        ref = self.transitions.get(key)
+        if ref is not None:
+            shape = ref()
+            if shape is not None:
+                return shape
+        with shapes_lock:
+            return self.extend(key)
+
+    def extend(self, key):
+        '''Creates transition by key, must be called under shapes_lock.'''
+        transitions = self.transitions
+        ref = transitions.get(key)
+        if ref is not None:
+            shape = ref()
+            if shape is not None:
+                return shape
+        shape = Shape(self, key)
+
+        def forget(ref):
+            if transitions.get(key) is ref:
+                del transitions[key]
+
+        transitions[key] = weakref.ref(shape, forget)
+        return shape
+
+
+# Lock taken while shape creates child (see Shape.add)
+shapes_lock = threading.Lock()
+
+EMPTY_SHAPE = Shape()
+
+# Weak references to shapes by tuples of their keys
+layouts = {}
+
+
+def layout(keys):
+    '''Returns shape with keys (tuple) in given order or None if they are
+    not all strings or too many.'''
+    ref = layouts.get(keys)
+    if ref is not None:
+        shape = ref()
+        if shape is not None:
+            return shape
+    if len(keys) > SHAPE_LIMIT or not all(type(k) is str for k in keys):
+        return None
+    shape = EMPTY_SHAPE
+    for key in keys:
+        shape = shape.add(key)
+
+    def forget(ref):
+        if layouts.get(keys) is ref:
+            del layouts[keys]
+
+    layouts[keys] = weakref.ref(shape, forget)
+    return shape
+
 
 class Table(object):
+    '''Lua table.
+
+    Shape and fields attributes are read by field access sites (see
+    esl.runtime.FieldSite) and must not be changed outside of table.'''
+    __slots__ = ('shape', 'fields', '__array', '__sparse', '__hash',
+                 '__limit', '__cursor')
+
     def __init__(self):
-        self.__numbered = []
-        self.__named = collections.OrderedDict()
+        account(TABLE_BYTES)
+        self.shape = EMPTY_SHAPE
+        self.fields = EMPTY_ARRAY
+        self.__array = EMPTY_ARRAY
+        self.__sparse = EMPTY_DICT
+        self.__hash = EMPTY_DICT
+        self.__limit = REHASH_LIMIT
+        # Position of last next() call (see next)
+        self.__cursor = None
+
+    @classmethod
+    def from_list(cls, values):
+        '''Returns table with values of sequence at keys 1..n, None
+        values are nils.'''
+        table = cls()
+        table.adopt(list(values))
+        return table
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        '''Returns table with values of iterable at keys 1..n, None
+        values are nils.'''
+        table = cls()
+        table.adopt(list(iterable))
+        return table
+
+    @classmethod
+    def from_dict(cls, mapping):
+        '''Returns table with keys and values of mapping, keys with None
+        values are skipped.'''
+        table = cls()
+        table.fill(tuple(mapping), list(mapping.values()))
+        return table
+
+    @classmethod
+    def from_json_like(cls, obj):
+        '''Returns obj with dicts, lists and tuples nested in it converted
+        to tables. Dict or list referenced several times becomes one
+        table, so references cycles are kept.'''
+        memo = {}
+        containers = frozenset((dict, list, tuple))
+
+        def convert(obj):
+            cls_ = type(obj)
+            if cls_ is tuple:
+                table = cls()
+            else:
+                table = memo.get(id(obj))
+                if table is not None:
+                    return table
+                memo[id(obj)] = table = cls()
+            if cls_ is dict:
+                keys = tuple(obj)
+                values = [convert(v) if type(v) in containers else v
+                          for v in obj.values()]
+                # Inlined fast path of fill()
+                ref = layouts.get(keys)
+                shape = None if ref is None else ref()
+                if shape is None or not values or None in values:
+                    table.fill(keys, values)
+                else:
+                    account(FIELD_BYTES * len(values))
+                    table.shape = shape
+                    table.fields = values
+            else:
+                values = [convert(v) if type(v) in containers else v
+                          for v in obj]
+                if values:
+                    table.adopt(values)
+            return table
+
+        if type(obj) in containers:
+            return convert(obj)
+        return obj
+
+    def to_list(self):
+        '''Returns values of keys 1..#t, nils are None.'''
+        array = self.__array
+        size = len(self)
+        if size == len(array):
+            return list(array)
+        sparse = self.__sparse
+        return list(array) + [sparse.get(k)
+                              for k in range(len(array) + 1, size + 1)]
+
+    def to_dict(self):
+        '''Returns dict with all keys and values of table.'''
+        array = self.__array
+        result = dict(zip(itertools.count(1), array))
+        if None in array:
+            for key in [k for k, v in result.items() if v is None]:
+                del result[key]
+        result.update(self.__sparse)
+        result.update(zip(self.shape.index, self.fields))
+        result.update(self.__hash)
+        return result
+
+    def to_python(self):
+        '''Returns table with tables nested in it converted to python
+        containers: tables with keys 1..n only become lists, other ones
+        (and empty tables) become dicts. Table referenced several times
+        becomes one container, so references cycles are kept.'''
+        memo = {}
+        cls = type(self)
+
+        def convert(table):
+            result = memo.get(id(table))
+            if result is not None:
+                return result
+            array = table.__array
+            if (array and not table.fields and not table.__sparse
+                    and not table.__hash and None not in array):
+                memo[id(table)] = result = []
+                result.extend([convert(v) if type(v) is cls else v
+                               for v in array])
+            else:
+                if array or table.__sparse or table.__hash:
+                    items = table.to_dict().items()
+                else:
+                    items = zip(table.shape.index, table.fields)
+                memo[id(table)] = result = {}
+                result.update([(k, convert(v) if type(v) is cls else v)
+                               for k, v in items])
+            return result
+
+        return convert(self)
+
+    def adopt(self, array):
+        '''Makes list array part of empty table.'''
+        assert self.__array is EMPTY_ARRAY
+        if not array:
+            return
+        account(FIELD_BYTES * (len(array) - array.count(None)))
+        self.__array = array
+        self.trim()
+        if array.count(None) * 2 >= len(array):
+            self.rehash()
+        else:
+            self.__limit = max(REHASH_LIMIT, len(array))
+
+    def fill(self, keys, values):
+        '''Sets distinct keys (tuple) to values (list of the same length,
+        taken by table) in empty table. String keys are laid out at once,
+        other ones are set one by one.'''
+        assert self.shape is EMPTY_SHAPE
+        if None in values:
+            pairs = [(k, v) for k, v in zip(keys, values) if v is not None]
+            keys = tuple([k for k, v in pairs])
+            values = [v for k, v in pairs]
+        shape = layout(keys)
+        if shape is not None:
+            if values:
+                account(FIELD_BYTES * len(values))
+                self.shape = shape
+                self.fields = values
+            return
+        shape = EMPTY_SHAPE
+        fields = []
+        rest = []
+        for key, value in zip(keys, values):
+            if type(key) is str and shape.size < SHAPE_LIMIT:
+                shape = shape.add(key)
+                fields.append(value)
+            else:
+                rest.append((key, value))
+        if fields:
+            account(FIELD_BYTES * len(fields))
+            self.shape = shape
+            self.fields = fields
+        for key, value in rest:
+            self[key] = value
 
     def __getitem__(self, key):
-        if isinstance(key, float):
-            if key.is_integer():
+        if type(key) is str:
+            shape = self.shape
+            index = shape.index.get(key)
+            if index is not None and index < shape.size:
+                return self.fields[index]
+            return self.__hash.get(key)
+        elif type(key) is not int:
+            if (isinstance(key, float) and key.is_integer()
+                    or isinstance(key, int)):
                 key = int(key)
-        if isinstance(key, int):
-            if key > 0 and key <= len(self.__numbered):
-                return self.__numbered[key - 1]
-        return self.__named.get(key)
+            elif isinstance(key, str):
+                return self[str(key)]
+            else:
+                return self.__hash.get(key)
+        array = self.__array
+        if 0 < key <= len(array):
+            return array[key - 1]
+        elif key > 0:
+            return self.__sparse.get(key)
+        return self.__hash.get(key)
 
     def __setitem__(self, key, value):
-        if isinstance(key, float):
-            if key.is_integer():
-                key = int(key)
-        if isinstance(key, int):
-            if key > 0 and key < len(self.__numbered):
+        if type(key) is str:
+            shape = self.shape
+            index = shape.index.get(key)
+            if index is not None and index < shape.size:
                 if value is None:
-                    del self.__numbered[key - 1]
+                    self.remove_field(index)
                 else:
-                    self.__numbered[key - 1] = value
+                    self.fields[index] = value
                 return
-            elif (key - 1) == len(self.__numbered):
-                if value is None:
-                    del self.__numbered[key - 1]
+            hash_ = self.__hash
+            if value is None:
+                if key in hash_:
+                    del hash_[key]
+                return
+            if key in hash_:
+                hash_[key] = value
+                return
+            account(FIELD_BYTES)
+            if shape.size < SHAPE_LIMIT:
+                self.shape = shape.add(key)
+                if self.fields is EMPTY_ARRAY:
+                    self.fields = [value]
                 else:
-                    self.__numbered.append(value)
-                    key += 1
-                    while key in self.__named:
-                        self.__numbered.append(self.__named.pop(key))
-                        key += 1
+                    self.fields.append(value)
+            elif hash_ is EMPTY_DICT:
+                self.__hash = {key: value}
+            else:
+                hash_[key] = value
+            return
+
+        if type(key) is not int:
+            key = normalize(key)
+            if type(key) is str:
+                self[key] = value
+                return
+        if type(key) is not int or key <= 0:
+            hash_ = self.__hash
+            if value is None:
+                if key in hash_:
+                    del hash_[key]
                 return
-        if not isinstance(key, (int, str, float)):
-            raise TypeError('incorrect key type')
-        self.__named[key] = value
+            if key not in hash_:
+                account(FIELD_BYTES)
+            if hash_ is EMPTY_DICT:
+                self.__hash = {key: value}
+            else:
+                hash_[key] = value
+            return
+
+        array = self.__array
+        size = len(array)
+        if key <= size:
+            if array[key - 1] is None and value is not None:
+                account(FIELD_BYTES)
+            array[key - 1] = value
+            if value is None and key == size:
+                self.trim()
+            return
+
+        sparse = self.__sparse
+        if key == size + 1 and value is not None:
+            if key not in sparse:
+                account(FIELD_BYTES)
+            if array is EMPTY_ARRAY:
+                array = self.__array = [value]
+            else:
+                array.append(value)
+            if sparse:
+                sparse.pop(key, None)
+                key += 1
+                while key in sparse:
+                    array.append(sparse.pop(key))
+                    key += 1
+            return
+
+        if value is None:
+            if key in sparse:
+                del sparse[key]
+            return
+        if key not in sparse:
+            account(FIELD_BYTES)
+        if sparse is EMPTY_DICT:
+            self.__sparse = {key: value}
+        else:
+            sparse[key] = value
+            if len(sparse) > self.__limit:
+                self.rehash()
 
     def __delitem__(self, key):
-        if isinstance(key, float):
-            if key.is_integer():
-                key = int(key)
-        try:
-            del self.__numbered[key - 1]
-        except IndexError:
-            pass
+        self[key] = None
 
-        try:
-            del self.__named[key]
-        except KeyError:
-            pass
+    def __contains__(self, key):
+        return self[key] is not None
 
     def __iter__(self):
-        for i in range(0, len(self.__numbered)):
-            yield i + 1
-        for k, v in self.__named.items():
-            yield k
+        array = self.__array
+        for i in range(len(array)):
+            if array[i] is not None:
+                yield i + 1
+        yield from self.__sparse
+        yield from self.shape.keys()
+        yield from self.__hash
+
+    def items(self):
+        '''Yields keys and values. Fields assigned while iterating may be
+        skipped, fields set to nil are not yielded.'''
+        array = self.__array
+        i = 0
+        while i < len(array):
+            value = array[i]
+            i += 1
+            if value is not None:
+                yield i, value
+        for key in list(self.__sparse):
+            value = self[key]
+            if value is not None and key > len(array):
+                yield key, value
+        for key in self.shape.keys():
+            value = self[key]
+            if value is not None:
+                yield key, value
+        for key in list(self.__hash):
+            value = self.__hash.get(key)
+            if value is not None:
+                yield key, value
+
+    def next(self, key=None):
+        '''Returns key and value following key (first ones if key is nil)
+        or None after last one. Position of last call is remembered, so
+        traversal with next() takes constant time per step. Position is a
+        tuple of returned key, part of table, snapshot of keys of the part
+        and offset in it, so it refers to no table and other traversal
+        started meanwhile (in other thread) just locates its key itself.'''
+        if key is None:
+            part, keys, i = 0, None, 0
+        else:
+            cursor = self.__cursor
+            if cursor is not None and cursor[0] == key:
+                part, keys, i = cursor[1:]
+            else:
+                part, keys, i = self.locate(key)
+            i += 1
+        if part == 0:
+            array = self.__array
+            while i < len(array):
+                value = array[i]
+                i += 1
+                if value is not None:
+                    self.__cursor = (i, 0, None, i - 1)
+                    return i, value
+            part, keys, i = 1, list(self.__sparse), 0
+        while True:
+            while i < len(keys):
+                k = keys[i]
+                if part == 3:
+                    value = self.__hash.get(k)
+                elif part == 1 and k <= len(self.__array):
+                    value = None
+                else:
+                    value = self[k]
+                if value is not None:
+                    self.__cursor = (k, part, keys, i)
+                    return k, value
+                i += 1
+            if part == 1:
+                part, keys = 2, self.shape.keys()
+            elif part == 2:
+                part, keys = 3, list(self.__hash)
+            else:
+                self.__cursor = None
+                return None
+            i = 0
+
+    def locate(self, key):
+        '''Returns position of key for next(): part of table, snapshot of
+        keys of the part (None for array part) and offset in it.'''
+        if type(key) is int and 0 < key <= len(self.__array):
+            return 0, None, key - 1
+        parts = ((1, list(self.__sparse)), (2, self.shape.keys()),
+                 (3, list(self.__hash)))
+        for part, keys in parts:
+            if key in keys:
+                return part, keys, keys.index(key)
+        raise ValueError('invalid key to next')
 
     def __len__(self):
-        return len(self.__numbered)
+        '''Returns border: n such that t[n] is not nil and t[n + 1] is nil
+        (or 0 if t[1] is nil). Table with holes may have many borders,
+        any of them is returned, as in Lua.'''
+        sparse = self.__sparse
+        size = len(self.__array)
+        if size + 1 not in sparse:
+            return size
+
+        # Unbound search in sparse part
+        i = size + 1
+        j = i * 2
+        while j in sparse:
+            i = j
+            j *= 2
+        while j - i > 1:
+            m = (i + j) // 2
+            if m in sparse:
+                i = m
+            else:
+                j = m
+        return i
+
+    def remove_field(self, index):
+        '''Removes string key with offset index, table moves to shape
+        without it.'''
+        shape = self.shape
+        del self.fields[index]
+        if index == shape.size - 1:
+            self.shape = shape.parent
+        else:
+            keys = shape.keys()
+            del keys[index]
+            shape = EMPTY_SHAPE
+            for key in keys:
+                shape = shape.add(key)
+            self.shape = shape
+
+    def trim(self):
+        '''Removes trailing holes of array part.'''
+        array = self.__array
+        while array and array[-1] is None:
+            array.pop()
+
+    def rehash(self):
+        '''Resizes array part, moves keys between array and sparse
+        parts.'''
+        array = self.__array
+        sparse = self.__sparse
+        size = len(array)
+
+        # nums[b]: count of keys k in 2^(b-1) < k <= 2^b
+        nums = collections.Counter(
+            map(int.bit_length,
+                map(operator.sub, sparse, itertools.repeat(1))))
+        low = 0
+        b = 0
+        while low < size:
+            high = min(1 << b, size)
+            nums[b] += high - low - array[low:high].count(None)
+            low = high
+            b += 1
+
+        # Largest power of two more than half used
+        optimal = 0
+        count = 0
+        for b in range(max(nums, default=-1) + 1):
+            count += nums[b]
+            if count > (1 << b) // 2:
+                optimal = 1 << b
+
+        if optimal < size:
+            if sparse is EMPTY_DICT:
+                sparse = self.__sparse = {}
+            for i in range(optimal, size):
+                if array[i] is not None:
+                    sparse[i + 1] = array[i]
+            del array[optimal:]
+        elif optimal > size:
+            if array is EMPTY_ARRAY:
+                array = self.__array = []
+            array.extend([None] * (optimal - size))
+            for k in [k for k in sparse if k <= optimal]:
+                array[k - 1] = sparse.pop(k)
+        self.trim()
+
+        self.__limit = max(REHASH_LIMIT, 2 * len(sparse), len(array))
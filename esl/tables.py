@@ -0,0 +1,66 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Regenerates precomputed lexer and parser tables shipped with esl.
+# Run as `python -m esl.tables` after changing grammar or token rules.
+
+import os
+import sys
+import logging
+
+import ply.lex
+
+import esl.lex
+import esl.parse
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _remove(module):
+    name = module.rsplit('.', 1)[-1]
+    for suffix in ('.py', '.pyc'):
+        path = os.path.join(OUTPUT_DIR, name + suffix)
+        if os.path.exists(path):
+            os.unlink(path)
+    sys.modules.pop(module, None)
+
+
+def write_lextab():
+    lexer = esl.lex.Lexer()
+    module = lexer.tabmodule
+
+    _remove(module)
+    ply.lex.lex(module=lexer,
+                optimize=True,
+                lextab=module,
+                outputdir=OUTPUT_DIR)
+
+    path = os.path.join(OUTPUT_DIR, module.rsplit('.', 1)[-1] + '.py')
+    with open(path, 'a') as f:
+        f.write('_signature = {!r}\n'.format(lexer.signature()))
+    sys.modules.pop(module, None)
+
+    return path
+
+
+def write_parsetab():
+    module = esl.parse.Parser.tabmodule
+
+    _remove(module)
+    esl.parse.Parser(write_tables=True)
+    sys.modules.pop(module, None)
+
+    return os.path.join(OUTPUT_DIR, module.rsplit('.', 1)[-1] + '.py')
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    for path in (write_lextab(), write_parsetab()):
+        logger.info('written %s', path)
+
+
+if __name__ == '__main__':
+    main()
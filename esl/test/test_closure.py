@@ -0,0 +1,126 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+from inspect import iscoroutinefunction
+
+from pytest import mark
+
+from esl import Interpreter, Namespace, compile
+from esl.interpreter import Variable
+from esl.analysis import may_suspend
+from esl.closure import Compiler
+from esl.resolve import resolve
+
+
+async def run_code(code, ns=None):
+    return await Interpreter(code, namespace=ns, engine='closure').run()
+
+
+class TestClosure:
+    def test_may_suspend(self):
+        '''Only calls and loops suspend'''
+        assert not may_suspend(compile('local a = {1, 2}\nreturn #a').chunk)
+        assert may_suspend(compile('return f()').chunk)
+        assert may_suspend(compile('for k in pairs(t) do end').chunk)
+        assert may_suspend(compile('while true do end').chunk)
+        assert not may_suspend(
+            compile('function f()\nreturn g()\nend').chunk)
+
+    def test_sync_closures(self):
+        '''Subtrees without calls are compiled into plain functions'''
+        chunk = compile('''\
+            local s = 0
+            for i = 1, 10 do
+                s = s + i
+            end
+            print(s * 2)
+        ''').chunk
+        compiler = Compiler()
+        compiler.analyze(chunk)
+        statements = chunk.block.children
+        assert not iscoroutinefunction(compiler.compile(statements[0]))
+        assert iscoroutinefunction(compiler.compile(statements[1]))
+        assert not iscoroutinefunction(
+            compiler.compile(statements[1].block))
+        assert iscoroutinefunction(compiler.compile(statements[2]))
+        assert iscoroutinefunction(compiler.compile(chunk))
+
+    @mark.asyncio
+    async def test_async_host(self):
+        '''Coroutine host functions are awaited in sync bodies'''
+        async def inc(x):
+            return x + 1
+
+        ns = Namespace()
+        ns.set_var('inc', inc)
+        code = '''\
+            local function square(x)
+                return x * x
+            end
+            return square(inc(2)) + inc(square(3))
+        '''
+        assert await run_code(code, ns) == 19
+
+    def test_resolve(self):
+        '''Locals get frame slots, globals stay in namespace'''
+        chunk = compile('''\
+            local a = 1
+            do
+                local a = a + 1
+                b = a
+            end
+            local function f(x)
+                return a + x + b
+            end
+        ''').chunk
+        resolver = resolve(chunk)
+        slots = {(node.lineno, node.name.name): location
+                 for node, location in resolver.slots.items()
+                 if isinstance(node, Variable)}
+        assert slots == {(3, 'a'): (0, 0), (4, 'a'): (0, 1), (7, 'a'): (1, 0),
+                         (7, 'x'): (0, 0)}
+        assert resolver.sizes[chunk] == 3
+
+    @mark.asyncio
+    async def test_lexical_scope(self):
+        '''Functions see locals of enclosing functions, not callers'''
+        code = '''\
+            local n = 0
+            local function counter(step)
+                local function inc()
+                    n = n + step
+                    return n
+                end
+                return inc
+            end
+            local function call(f)
+                local n = 100
+                return f()
+            end
+            local inc = counter(5)
+            call(inc)
+            return call(inc) + n
+        '''
+        assert await run_code(code) == 20
+
+    @mark.asyncio
+    async def test_long_expressions(self):
+        '''Chains of binary operators are compiled without recursion'''
+        code = 'local a = 1\nreturn ' + ' + '.join(['a * 2'] * 250)
+        assert await run_code(code) == 500
+        code = 'local a = true\nreturn ' + ' and '.join(['a'] * 250)
+        assert await run_code(code) is True
+
+    @mark.asyncio
+    async def test_foreign_function(self):
+        '''Functions created by another engine can be called'''
+        ns = Namespace()
+        code = '''\
+            t = {k = 3}
+            function t:mul(x)
+                return self.k * x
+            end
+        '''
+        await Interpreter(code, namespace=ns, engine='touch').run()
+        assert await run_code('local x = 2\nreturn t:mul(x)', ns) == 6
@@ -2,16 +2,31 @@ __author__ = 'Gennady Kovalev <gik@bigur.ru>'
 __copyright__ = '(c) 2016-2019 Development management business group'
 __licence__ = 'For license information see LICENSE'
 
+import sys
+import time
+import asyncio
+import threading
+import tracemalloc
+
 from logging import getLogger, DEBUG
 
-from pytest import fixture, mark
+from pytest import fixture, mark, raises
 
-from esl import Interpreter, Namespace, Table, ESLSyntaxError
+from esl import (Interpreter, Namespace, Table, ESLSyntaxError,
+                 ESLRuntimeError, ESLBudgetError, ESLTimeoutError,
+                 ESLMemoryError, ESLRecursionError, compile)
 from esl.lex import Lexer
+from esl.resolve import annotate
 
 logger = getLogger(__name__)
 
 
+@fixture(autouse=True, params=Interpreter.engines)
+def engine(request, monkeypatch):
+    monkeypatch.setattr(Interpreter, 'default_engine', request.param)
+    return request.param
+
+
 @fixture
 def debug(caplog):
     caplog.set_level(DEBUG, logger='esl')
@@ -84,6 +99,137 @@ class TestInterpreter:
         t = await run_code('return {1, 2, 3}')
         assert ([(1, 1), (2, 2), (3, 3)] == [(k, t[k]) for k in t])
 
+    @mark.asyncio
+    async def test_table_parts(self):
+        '''Integer keys migrate to array part, nil makes hole'''
+        t = Table()
+        for i in range(1000, 0, -1):
+            t[i] = i
+        assert len(t) == 1000
+        assert list(t) == list(range(1, 1001))
+
+        t[500] = None
+        assert 500 not in t
+        assert len(t) == 1000
+        assert 499 in list(t) and 500 not in list(t)
+        t[1000.0] = None
+        assert len(t) == 999
+
+        sparse = Table()
+        for i in range(1, 1001):
+            sparse[i * 16] = i
+        assert len(sparse) == 0
+        assert sparse[16.0] == 1 and sparse[160] == 10
+
+        empty = Table()
+        assert not hasattr(empty, '__dict__')
+        empty['a'] = 1
+        del empty['a']
+        assert list(empty) == [] and len(empty) == 0
+
+        assert await run_code('''\
+            local t = {1, 2, 3}
+            t[2] = nil
+            return #t, t[3]
+        ''') == [3, 3]
+
+    @mark.asyncio
+    async def test_table_shapes(self):
+        '''Tables with the same string keys share shape'''
+        a, b = Table(), Table()
+        for t in (a, b):
+            t['id'] = 1
+            t['name'] = 'x'
+        assert a.shape is b.shape
+        assert a.shape.keys() == ['id', 'name']
+
+        a['price'] = 3
+        b['count'] = 4
+        assert a.shape.parent is b.shape.parent
+        a['id'] = None
+        assert a.shape.keys() == ['name', 'price']
+        assert [a['id'], a['name'], a['price']] == [None, 'x', 3]
+        a['price'] = None
+        b['id'] = b['count'] = None
+        assert a.shape is b.shape
+
+        big = Table()
+        for i in range(100):
+            big['k{}'.format(i)] = i
+        assert big.shape.size < 100 and len(list(big)) == 100
+        assert big['k99'] == 99
+
+        code = '''\
+            local r = {a = 1, b = 2}
+            local s = 0
+            for i = 1, 3 do
+                s = s + r.b
+                r.a = nil
+                r.b = r.b + 1
+            end
+            r.a = 10
+            return s, r.a, r.b
+        '''
+        await assert_code([9, 10, 5], code)
+
+    @mark.asyncio
+    async def test_table_shapes_threads(self):
+        '''Threads branching the same shape keep own keys'''
+        barrier = threading.Barrier(8)
+        tables = []
+
+        def branch(n):
+            barrier.wait()
+            for i in range(200):
+                t = Table()
+                t['base'] = i
+                t['k{}'.format(n)] = n
+                t['v{}'.format(i % 3)] = i
+                tables.append((n, i, t))
+
+        threads = [threading.Thread(target=branch, args=(n, ))
+                   for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for n, i, t in tables:
+            keys = ['base', 'k{}'.format(n), 'v{}'.format(i % 3)]
+            assert t.shape.keys() == keys
+            assert [t[k] for k in keys] == [i, n, i]
+
+    @mark.asyncio
+    async def test_table_conversions(self):
+        '''Tables are converted from and to python containers in bulk'''
+        t = Table.from_list([1, None, 3, None])
+        assert len(t) == 3 and t[2] is None and t[4] is None
+        assert t.to_list() == [1, None, 3]
+        assert Table.from_iterable(range(5)).to_list() == [0, 1, 2, 3, 4]
+        assert Table.from_list([None] * 50 + [1]).to_dict() == {51: 1}
+
+        t = Table.from_dict({'a': 1, 'b': None, 1: 'x', 5: 'y', 0.5: 'z'})
+        assert t.to_dict() == {1: 'x', 5: 'y', 'a': 1, 0.5: 'z'}
+        assert t['a'] == 1 and 'b' not in t and t[5.0] == 'y'
+
+        payload = {'items': [{'id': 1, 'tags': ('a', 'b')}, {'id': 2}]}
+        payload['self'] = payload
+        t = Table.from_json_like(payload)
+        assert t['self'] is t
+        assert t['items'][1]['tags'][2] == 'b'
+        assert t['items'][1].shape.parent is t['items'][2].shape
+
+        result = t.to_python()
+        assert result['self'] is result
+        assert result['items'] == [{'id': 1, 'tags': ['a', 'b']}, {'id': 2}]
+        assert Table.from_json_like(5) == 5
+        assert Table().to_python() == {}
+
+        assert await run_code('''\
+            local l = python_list.new({1, 2, 3, a = 4})
+            python_list.append(l, 5)
+            return l
+        ''') == [1, 2, 3, 4, 5]
+
     @mark.asyncio
     async def test_dot(self):
         '''Access to object attributes via dot'''
@@ -149,6 +295,24 @@ class TestInterpreter:
         await assert_code(5, 'return 1 - 1 == 1 and 4 or 5')
         await assert_code(False, 'return not 5')
 
+    @mark.asyncio
+    async def test_short_circuit(self):
+        '''Right operand of and/or is evaluated only if needed'''
+        code = '''\
+            calls = 0
+            function f(x)
+                calls = calls + 1
+                return x
+            end
+            local a = false and f(1)
+            local b = true or f(2)
+            local c = nil or f(3)
+            local d = 1 and f(4)
+            local e = f(nil) and f(5) or f(6)
+            return calls, a, b, c, d, e
+        '''
+        await assert_code([4, False, True, 3, 4, 6], code)
+
     @mark.asyncio
     async def test_if_statement(self):
         '''If-elseif-else statement'''
@@ -347,6 +511,42 @@ class TestInterpreter:
         '''
         await assert_code(1, funcode + 'return dummy()')
 
+    @mark.asyncio
+    async def test_function_arguments(self):
+        '''Missing arguments are nils, extra ones are dropped'''
+        code = '''\
+            function f(a, b)
+                return a, b
+            end
+            return f(1)
+        '''
+        await assert_code([1, None], code)
+        code = '''\
+            function f(a)
+                return a
+            end
+            return f(1, 2), f()
+        '''
+        await assert_code([1, None], code)
+        code = '''\
+            function f(...)
+                return 1
+            end
+            function g(a, ...)
+                return a
+            end
+            return f(), g(2, 3)
+        '''
+        await assert_code([1, 2], code)
+        code = '''\
+            function f(x, y)
+                return x - y
+            end
+            x, y = 1, 5
+            return f(y, x)
+        '''
+        await assert_code(4, code)
+
     @mark.asyncio
     async def test_function_namespace(self):
         '''Function namespaces'''
@@ -495,6 +695,102 @@ class TestInterpreter:
         '''
         await assert_code(2, code)
 
+    def test_block_scope(self):
+        '''Locals of blocks get namespace keys of their own'''
+        chunk = compile('''\
+            for i = 1, 10 do
+                a = i
+            end
+            if a then
+                local a = a
+            end
+        ''').chunk
+        annotate(chunk)
+        loop, if_ = chunk.block.children
+        assert loop.block.children[0].left.children[0].key == 'a'
+        local = if_.block.children[0]
+        assert local.left.children[0].key.startswith('a#')
+        assert local.value.children[0].key == 'a'
+        assert loop.name.key.startswith('i#')
+
+    @mark.asyncio
+    async def test_lexical_scope(self):
+        '''Functions see variables of scope they are defined in'''
+        code = '''\
+            function f()
+                return y
+            end
+            function g()
+                local y = 5
+                return f()
+            end
+            return g()
+        '''
+        await assert_code(None, code)
+
+        code = '''\
+            function mk()
+                local n = 10
+                function get()
+                    return n
+                end
+            end
+            mk()
+            return get()
+        '''
+        await assert_code(10, code)
+
+        code = '''\
+            local fs = {}
+            for i = 1, 3 do
+                local j = i * 2
+                function g()
+                    return i + j
+                end
+                fs[i] = g
+            end
+            return fs[1](), i
+        '''
+        await assert_code([9, None], code)
+
+        code = '''\
+            local x = 1
+            function f()
+                return x
+            end
+            local x = 2
+            do
+                local y = 3
+            end
+            return f(), x, y
+        '''
+        await assert_code([1, 2, None], code)
+
+        code = '''\
+            function counter()
+                local n = 0
+                function inc()
+                    n = n + 1
+                    return n
+                end
+            end
+            counter()
+            inc()
+            return inc()
+        '''
+        await assert_code(2, code)
+
+    @mark.asyncio
+    async def test_deep_nesting(self):
+        '''Deeply nested blocks and long expressions run in every engine'''
+        code = ('local n = 0\n' + 'while n < 1 do\nif true then\n' * 12
+                + 'n = n + 1\n' + 'end\nend\n' * 12 + 'return n')
+        await assert_code(1, code)
+        code = 'local a = 1\nreturn ' + ' + '.join(['a'] * 250)
+        await assert_code(250, code)
+        code = 'local a = "x"\nreturn ' + ' .. '.join(['a'] * 250)
+        await assert_code('x' * 250, code)
+
     @mark.asyncio
     async def test_objects_functions(self):
         '''Objects's functions'''
@@ -570,6 +866,68 @@ class TestInterpreter:
         ns = Namespace({'a': A()})
         await assert_code(55, code, ns)
 
+    @mark.asyncio
+    async def test_next(self):
+        '''Pairs and next traverse table once, fields may be cleared'''
+        code = '''
+            local t = {}
+            for i = 1, 20 do t[i] = i end
+            t.x = 100
+            t[1000] = 1000
+
+            local s1 = 0
+            for k, v in pairs(t) do
+                t[k] = nil
+                s1 = s1 + v
+            end
+
+            t = {10, 20, 30, a = 40}
+            local s2 = 0
+            for k, v in next, t do
+                s2 = s2 + v
+            end
+            return s1, s2, next({})
+        '''
+        await assert_code([1310, 100, None], code)
+
+        code = '''
+            local s = ""
+            for k, v in next, a do
+                s = s .. k .. v
+            end
+            return s
+        '''
+        ns = Namespace({'a': {'z': 3, 'x': 1, 'y': 2}})
+        await assert_code('x1y2z3', code, ns)
+
+        # Every traversal keeps its own position
+        code = '''
+            local s = ""
+            for k, v in next, a do
+                for l, w in next, a do
+                    s = s .. k .. l
+                end
+            end
+            return s, next(a, "x"), next(t, 1)
+        '''
+        t = Table()
+        t[1], t[2] = 5, 6
+        ns = Namespace({'a': {'y': 2, 'x': 1}, 't': t})
+        await assert_code(['xxxyyxyy', ('y', 2), (2, 6)], code, ns)
+
+        # Position of traversal refers to no table
+        t = Table.from_list([1, None, 3])
+        t['a'], t[10], t[0.5] = 4, 5, 6
+        refs = sys.getrefcount(t)
+        assert t.next() == (1, 1) and t.next(1) == (3, 3)
+        t.next(3)
+        assert sys.getrefcount(t) == refs
+        assert t.next(3) == (10, 5)
+        assert t.next('a') == (0.5, 6) and t.next(0.5) is None
+        assert t.next(10) == ('a', 4) and t.next(1) == (3, 3)
+        with raises(ValueError):
+            t.next('b')
+
     @mark.asyncio
     async def test_concat(self):
         '''Concat'''
@@ -581,3 +939,474 @@ class TestInterpreter:
 
         code = '''return "a" .. 1'''
         await assert_code('a1', code)
+
+    @mark.asyncio
+    async def test_error_line(self, caplog):
+        '''Runtime error reports script line and ESL call stack'''
+        code = '''\
+            function f(x)
+                local y = 1
+                return x .. {}
+            end
+            a = 1
+            return f(a)
+        '''
+        await assert_raises(ESLRuntimeError, code)
+        assert '... <main> line 6: f()' in caplog.messages
+        assert '... f line 3: return x .. {} ...' in caplog.messages
+
+    @mark.asyncio
+    async def test_error_line_in_loop(self, caplog):
+        '''Host function error reports line of the call'''
+        def fail():
+            raise ValueError('failed')
+
+        ns = Namespace()
+        ns.set_var('fail', fail)
+        code = '''\
+            for i = 1, 3 do
+                a = i > 0 and i
+                if a == 3 then
+                    fail()
+                end
+            end
+        '''
+        await assert_raises(ValueError, code, ns)
+        assert '... <main> line 4: fail() ...' in caplog.messages
+
+    @mark.asyncio
+    async def test_line_tracking_memory(self):
+        '''Memory doesn't grow with count of evaluated nodes'''
+        code = '''\
+            a = 0
+            for i = 1, {} do
+                a = (i > 0 and a + 1) or a
+            end
+            return a
+        '''
+
+        async def peak(iterations):
+            await run_code(code.format(iterations))
+            tracemalloc.start()
+            try:
+                assert await run_code(code.format(iterations)) == iterations
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        assert await peak(5000) - await peak(100) < 16 * 1024
+
+    @mark.asyncio
+    async def test_loop_without_cap(self):
+        '''While loop isn't limited by iterations count'''
+        code = '''\
+            count = 0
+            while count < 500 do
+                count = count + 1
+            end
+            repeat
+                count = count + 1
+            until count < 1000
+            return count
+        '''
+        await assert_code(1000, code)
+
+    @mark.asyncio
+    async def test_return_from_loop(self):
+        '''Return and break leave loops at once'''
+        code = '''\
+            function w()
+                local i = 0
+                while true do
+                    i = i + 1
+                    if i > 5 then return i end
+                end
+            end
+            function r()
+                local i = 0
+                repeat
+                    i = i + 1
+                    if i > 5 then return i end
+                until true
+            end
+            function n()
+                for i = 1, 10 do
+                    if i == 3 then return i end
+                end
+                return 99
+            end
+            function g()
+                for k, v in pairs({10, 20, 30}) do
+                    if v == 20 then return k end
+                end
+                return 99
+            end
+            count = 0
+            for k, v in pairs({1, 2, 3, 4}) do
+                count = count + 1
+                if v == 2 then break end
+            end
+            return w(), r(), n(), g(), count
+        '''
+        result = await Interpreter(code, budget=10000).run()
+        assert result == [6, 6, 3, 2, 2]
+
+    @mark.asyncio
+    async def test_budget(self):
+        '''Run is aborted when budget of steps is exhausted'''
+        with raises(ESLBudgetError):
+            await Interpreter('while true do end', budget=1000).run()
+
+        code = '''\
+            local function f(n)
+                if n > 0 then
+                    return f(n - 1)
+                end
+                return 0
+            end
+            return f(9)
+        '''
+        assert await Interpreter(code, budget=10).run() == 0
+        with raises(ESLBudgetError):
+            await Interpreter(code, budget=9).run()
+
+        code = '''\
+            for i = 1, 5 do
+            end
+            for k, v in pairs({1, 2, 3, 4}) do
+            end
+        '''
+        await Interpreter(code, budget=10).run()
+        with raises(ESLBudgetError):
+            await Interpreter(code, budget=9).run()
+
+    @mark.asyncio
+    async def test_event_loop_lag(self):
+        '''Busy script gives control to event loop'''
+        code = '''\
+            local s = 0
+            for i = 1, 20000 do
+                s = s + i
+            end
+            return s
+        '''
+        running = True
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while running:
+                await asyncio.sleep(0)
+                ticks += 1
+
+        interpreter = Interpreter(code, yield_every=100)
+        task = asyncio.ensure_future(ticker())
+        await asyncio.sleep(0)
+        ticks = 0
+        result = await interpreter.run()
+        running = False
+        await task
+
+        assert result == 200010000
+        # Loop makes 20000 steps, control is given back every 100 of them
+        assert ticks >= 150, ticks
+
+    @mark.asyncio
+    async def test_timeout(self):
+        '''Run is aborted when deadline passes'''
+        interpreter = Interpreter('while true do end', yield_every=0)
+        started = time.perf_counter()
+        with raises(ESLTimeoutError):
+            await interpreter.run(timeout=0.05)
+        assert time.perf_counter() - started < 1
+
+        code = '''\
+            local function f()
+                return f()
+            end
+            f()
+        '''
+        deadline = asyncio.get_event_loop().time()
+        with raises(ESLTimeoutError):
+            await Interpreter(code).run(deadline=deadline)
+
+        assert await Interpreter('return 1').run(timeout=0) == 1
+
+    @mark.asyncio
+    async def test_cancel(self, caplog):
+        '''Cancellation of running script is not an ESL error'''
+        async def wait():
+            await asyncio.sleep(10)
+
+        ns = Namespace()
+        ns.set_var('wait', wait)
+        for code in ('wait()', 'while true do end'):
+            task = asyncio.ensure_future(
+                Interpreter(code, namespace=ns).run())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with raises(asyncio.CancelledError):
+                await task
+        assert not caplog.messages
+
+    @mark.asyncio
+    async def test_memory_quota(self):
+        '''Run is aborted when script allocates more than quota'''
+        code = '''\
+            s = ""
+            for i = 1, 1000 do
+                s = s .. "0123456789"
+            end
+            return #s
+        '''
+        assert await Interpreter(code).run() == 10000
+        with raises(ESLMemoryError):
+            await Interpreter(code, memory_quota=1000000).run()
+
+        code = '''\
+            for i = 1, 1000 do
+                t = {i, name = i}
+            end
+        '''
+        await Interpreter(code, memory_quota=500000).run()
+        with raises(ESLMemoryError):
+            await Interpreter(code, memory_quota=100000).run()
+
+        code = '''\
+            t = {}
+            for i = 1, 2000 do
+                t[i] = i
+                t.last = i
+            end
+        '''
+        await Interpreter(code, memory_quota=300000).run()
+        with raises(ESLMemoryError):
+            await Interpreter(code, memory_quota=100000).run()
+
+        # Tables grown by host functions are accounted too
+        code = '''\
+            t = {}
+            for i = 1, 100000 do
+                table.insert(t, i)
+            end
+            return #t
+        '''
+        assert await Interpreter(code).run() == 100000
+        with raises(ESLMemoryError):
+            await Interpreter(code, memory_quota=100000).run()
+        # Host code is not accounted after run
+        table = Table()
+        table[1] = 1
+        assert len(table) == 1
+
+    @mark.asyncio
+    async def test_call_sites(self, engine):
+        '''Call sites cache classification of callee'''
+        class Counter:
+            def __init__(self):
+                self.count = 0
+
+            def inc(self, step):
+                self.count += step
+                return self.count
+
+        async def double(x):
+            return x * 2
+
+        ns = Namespace()
+        ns.set_var('counter', Counter())
+        ns.set_var('double', double)
+        ns.set_var('tostring', str)
+        code = '''\
+            local function add(a, b)
+                return a + b
+            end
+            local s = 0
+            for i = 1, 10 do
+                s = add(s, double(i)) + counter:inc(1)
+            end
+            f = double
+            s = s + f(1)
+            f = tostring
+            return s, f(1)
+        '''
+        interpreter = Interpreter(code, namespace=ns)
+        assert await interpreter.run() == [167, '1']
+        stats = interpreter.program.call_stats()[engine]
+        assert stats['sites'] == 5
+        assert stats['hits'] == 27
+        assert stats['misses'] == 5
+
+    @mark.asyncio
+    async def test_field_sites(self, engine):
+        '''Field sites cache access path by type of object'''
+        class Point:
+            x = 0
+
+        ns = Namespace()
+        ns.set_var('p', Point())
+        ns.set_var('d', {'x': 1})
+        code = '''\
+            local t = {x = 2}
+            local s = 0
+            for i = 1, 10 do
+                p.x = i
+                s = s + p.x + d.x + t.x
+            end
+            for k, v in pairs({a = p, b = t}) do
+                s = s + v.x
+            end
+            return s
+        '''
+        interpreter = Interpreter(code, namespace=ns)
+        assert await interpreter.run() == 97
+        assert ns.get_var('p').x == 10
+        stats = interpreter.program.field_stats()[engine]
+        assert stats['sites'] == 5
+        assert stats['hits'] == 36
+        assert stats['misses'] == 6
+
+    @mark.asyncio
+    async def test_global_sites(self, engine):
+        '''Global sites cache values until namespace is changed'''
+        ns = Namespace(parent=Namespace())
+        ns.set_var('one', 1)
+
+        def bump():
+            ns.set_var('one', 2)
+
+        ns.set_var('bump', bump)
+        code = '''\
+            local s = 0
+            for i = 1, 10 do
+                s = s + one
+            end
+            bump()
+            s = s + one
+            one = 5
+            return s + one
+        '''
+        interpreter = Interpreter(code, namespace=ns)
+        assert await interpreter.run() == 17
+        stats = interpreter.program.global_stats()[engine]
+        if engine == 'touch':
+            assert stats['sites'] == 0
+        else:
+            assert stats['sites'] == 4
+            assert stats['hits'] == 9
+            assert stats['misses'] == 4
+
+    @mark.asyncio
+    async def test_global_sites_local_vars(self, engine):
+        '''Changes of local_vars dict made between runs are seen'''
+        variables = {'x': 1}
+        interpreter = Interpreter('return x', namespace=Namespace(variables))
+        assert await interpreter.run() == 1
+        variables['x'] = 2
+        assert await interpreter.run() == 2
+
+    @mark.asyncio
+    async def test_global_sites_custom_namespace(self, engine):
+        '''Namespaces resolving variables by own rules are not cached'''
+        class Counting(Namespace):
+            count = 0
+
+            def get_var(self, key):
+                if key == 'next':
+                    Counting.count += 1
+                    return Counting.count
+                return super().get_var(key)
+
+        code = '''\
+            local s = 0
+            for i = 1, 3 do
+                s = s + next
+            end
+            return s
+        '''
+        assert await Interpreter(code, namespace=Counting()).run() == 6
+
+    @mark.asyncio
+    async def test_call_depth(self, engine):
+        '''Deep recursion is aborted with ESLRecursionError'''
+        code = '''\
+            local function sum(n)
+                if n == 0 then
+                    return 0
+                end
+                return n + sum(n - 1)
+            end
+            return sum(N)
+        '''
+        assert await Interpreter(code.replace('N', '50'),
+                                 max_depth=60).run() == 1275
+        with raises(ESLRecursionError):
+            await Interpreter(code.replace('N', '70'), max_depth=60).run()
+        if engine in Interpreter.stackless_engines:
+            assert await Interpreter(
+                code.replace('N', '100000')).run() == 5000050000
+        else:
+            with raises(ESLRecursionError):
+                await Interpreter(code.replace('N', '100000')).run()
+        assert await Interpreter(code.replace('N', '50'),
+                                 max_depth=60).run() == 1275
+
+    @mark.asyncio
+    async def test_default_call_depth(self, engine):
+        '''Default call depth fits python stack, so it's the limit hit'''
+        if engine in Interpreter.stackless_engines:
+            return
+        code = '''\
+            local function depth(n)
+                local result = 0
+                for i = 1, 1 do
+                    while true do
+                        if n > 0 then
+                            result = 1 + depth(n - 1)
+                        end
+                        break
+                    end
+                end
+                return result
+            end
+            return depth(N)
+        '''
+        max_depth = Interpreter(code).max_depth
+        # Script calls depth() at depth 1
+        assert await Interpreter(
+            code.replace('N', str(max_depth - 1))).run() == max_depth - 1
+        with raises(ESLRecursionError, match='limit of {}'.format(max_depth)):
+            await Interpreter(code.replace('N', str(max_depth))).run()
+
+    @mark.asyncio
+    async def test_call_stack(self, engine):
+        '''Call stack of running script can be sampled by other task'''
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
+        async def pause():
+            entered.set()
+            await release.wait()
+
+        ns = Namespace()
+        ns.set_var('pause', pause)
+        code = '''\
+            local t = {}
+            function t.inner()
+                pause()
+            end
+            local function outer()
+                t.inner()
+                return 1
+            end
+            return outer()
+        '''
+        interpreter = Interpreter(code, namespace=ns)
+        task = asyncio.ensure_future(interpreter.run())
+        await entered.wait()
+        context, = interpreter.contexts
+        assert list(context.call_stack) == [('outer', 9), ('t.inner', 6)]
+        release.set()
+        assert await task == 1
+        assert not interpreter.contexts
+        assert context.call_stack == []
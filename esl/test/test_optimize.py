@@ -0,0 +1,91 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+from pytest import mark, raises
+
+from esl import Interpreter, ESLRuntimeError
+from esl.interpreter import Constant, Block, If
+from esl.program import ProgramCache
+
+
+def compile(code):
+    return ProgramCache().compile(code)
+
+
+class TestOptimize:
+    def test_fold_constants(self):
+        '''Constant expressions are folded'''
+        program = compile('return 60 * 60 * 24, "a" .. "-" .. 1, '
+                          'not (1 < 2), #"abc", -5, 1 == 1 and "yes"')
+        values = program.chunk.block.children[0].explist.children
+        assert all(isinstance(value, Constant) for value in values)
+        assert [value.value for value in values] == [
+            86400, 'a-1', False, 3, -5, 'yes'
+        ]
+        assert program.optimizations[0].lineno == 1
+        assert program.optimizations[0].message == (
+            'folded arithmetic to 3600')
+
+    def test_keep_failing(self):
+        '''Operations raising errors are left for run time'''
+        program = compile('return 1 / 0, "a" + 1, {} .. "a"')
+        assert program.optimizations == []
+
+    def test_dead_branches(self):
+        '''Statically dead branches and loops are removed'''
+        program = compile('''\
+            while false do
+                x = 1
+            end
+            if false then
+                a = 1
+            elseif y then
+                a = 2
+            elseif 1 then
+                a = 3
+            else
+                a = 4
+            end
+            if nil then
+                b = 1
+            end
+            return a''')
+        statements = program.chunk.block.children
+        assert len(statements) == 2
+        assert isinstance(statements[0], If)
+        assert statements[0].expression.name.name == 'y'
+        assert statements[0].elseiflist.children == []
+        assert [change.lineno for change in program.optimizations] == [
+            1, 4, 8, 10, 13
+        ]
+
+        program = compile('a = 1\nif false then a = 2 end')
+        statements = program.chunk.block.children
+        assert isinstance(statements[1], Block)
+        assert statements[1].children == []
+
+    def test_disabled(self):
+        '''Optimization may be disabled'''
+        program = ProgramCache(optimize=False).compile('return 1 + 2')
+        assert program.optimizations == []
+        value = program.chunk.block.children[0].explist.children[0]
+        assert not isinstance(value, Constant)
+
+    @mark.asyncio
+    async def test_run(self, caplog):
+        '''Optimized programs give same results'''
+        code = '''\
+            local s = 0
+            if 1 > 2 then
+                s = 100
+            elseif true then
+                s = s + 2 * 3
+            end
+            return s .. "" .. (1 + 1)
+        '''
+        assert await Interpreter(code).run() == '62'
+
+        with raises(ESLRuntimeError):
+            await Interpreter('a = 1\nreturn 10 / (5 - 5)').run()
+        assert 'line 2: return 10 / (5 - 5)' in caplog.text
@@ -0,0 +1,236 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+import asyncio
+
+from pytest import mark, raises
+
+from esl import Interpreter, Namespace, Program, ESLSyntaxError, compile
+from esl.program import (ProgramCache, ProgramFormatError, MAGIC, cache,
+                         cache_path, load_file)
+
+
+class TestProgramCache:
+    def test_hits_and_misses(self):
+        '''Same source is parsed only once'''
+        programs = ProgramCache()
+        first = programs.compile('return 1')
+        second = programs.compile('return 1')
+        assert first is second
+        assert programs.hits == 1
+        assert programs.misses == 1
+
+        programs.compile('return 2')
+        assert programs.misses == 2
+        assert len(programs) == 2
+
+    def test_eviction(self):
+        '''Least recently used program is evicted'''
+        programs = ProgramCache(maxsize=2)
+        programs.compile('return 1')
+        programs.compile('return 2')
+        programs.compile('return 1')
+        programs.compile('return 3')
+        assert 'return 1' in programs
+        assert 'return 2' not in programs
+        assert programs.evictions == 1
+
+        programs.resize(1)
+        assert len(programs) == 1
+        assert 'return 3' in programs
+
+    def test_invalidation(self):
+        '''Explicit invalidation'''
+        programs = ProgramCache()
+        first = programs.compile('return 1')
+        assert programs.invalidate('return 1')
+        assert not programs.invalidate('return 1')
+        assert programs.compile('return 1') is not first
+
+        programs.clear()
+        assert len(programs) == 0
+        assert programs.stats()['hits'] == 0
+
+    def test_syntax_error(self):
+        '''Syntax errors are not cached and do not break parser'''
+        programs = ProgramCache()
+        with raises(ESLSyntaxError):
+            programs.compile('return @')
+        with raises(ESLSyntaxError):
+            programs.compile('return )')
+        assert len(programs) == 0
+        program = programs.compile('a = 1\nreturn a')
+        assert program.chunk.block.children[-1].lineno == 2
+
+    @mark.asyncio
+    async def test_interpreter(self):
+        '''Interpreter reuses cached program'''
+        code = '''\
+            t = {}
+            function t.f(x)
+                return x + 1
+            end
+            return t.f(1)
+        '''
+        first = Interpreter(code)
+        second = Interpreter(code)
+        assert first.program is second.program
+        assert code in cache
+        assert await first.run() == 2
+        assert await second.run() == 2
+        assert await Interpreter(first.program).run() == 2
+
+
+class TestSerialization:
+    code = '''\
+        local t = {1, 25, "x", [3]=true, y=nil}
+        function t:f(a, b)
+            if a > b then
+                return a .. "-" .. b
+            elseif not a then
+                return -1
+            end
+            return #self
+        end
+        for i=1, 3 do
+            t[i] = i * 2
+        end
+        ;
+        local s = [[long
+        string]]
+        return t:f(5, 4), t:f(1, 2)
+    '''
+
+    def walk(self, node):
+        if not hasattr(node, '_fields'):
+            return node
+        result = [type(node).__name__, node.lineno]
+        for name in node._fields:
+            result.append(self.walk(getattr(node, name)))
+        for child in getattr(node, 'children', []):
+            result.append(self.walk(child))
+        return result
+
+    def test_dump_load(self):
+        '''Program survives dump and load'''
+        program = cache.compile(self.code)
+        data = program.dump()
+        assert data.startswith(MAGIC)
+
+        loaded = Program.load(data)
+        assert loaded.code == program.code
+        assert loaded.key == program.key
+        assert self.walk(loaded.chunk) == self.walk(program.chunk)
+
+    def test_rejected(self):
+        '''Incompatible and corrupted data is rejected'''
+        data = bytearray(cache.compile(self.code).dump())
+
+        with raises(ProgramFormatError):
+            Program.load(b'ESLX' + data[4:])
+        with raises(ProgramFormatError):
+            Program.load(data[:50])
+        with raises(ProgramFormatError):
+            Program.load(data[:len(data) // 2])
+
+        data[10] ^= 0xff  # grammar signature
+        with raises(ProgramFormatError):
+            Program.load(data)
+
+    @mark.asyncio
+    async def test_interpreter(self):
+        '''Interpreter runs serialized program'''
+        data = cache.compile(self.code).dump()
+        result = await Interpreter(None, bytecode=data).run()
+        assert result == ['5-4', 3]
+
+    def test_files(self, tmpdir):
+        '''Compiled program is cached next to script'''
+        script = tmpdir.join('script.esl')
+        script.write('return 1')
+
+        programs = ProgramCache()
+        first = programs.compile_file(str(script))
+        compiled = cache_path(str(script))
+        assert compiled.endswith('__eslcache__/script.esl.eslc')
+        assert load_file(compiled).code == 'return 1'
+
+        programs.clear()
+        assert programs.compile_file(str(script)).key == first.key
+        assert programs.misses == 1
+
+        # Stale compiled program is ignored
+        script.write('return 22')
+        assert programs.compile_file(str(script)).code == 'return 22'
+        assert load_file(compiled).code == 'return 22'
+
+
+class TestConcurrency:
+    code = '''\
+        local function collect(n)
+            local s = 0
+            for i = 1, 20 do
+                if i > n then
+                    break
+                end
+                s = s + wait(i)
+            end
+            return s
+        end
+        local total = 0
+        for k = 1, 3 do
+            total = total + collect(arg + k)
+        end
+        return total, arg
+    '''
+
+    @staticmethod
+    async def wait(value):
+        await asyncio.sleep(0)
+        return value
+
+    @staticmethod
+    def expected(arg):
+        total = 0
+        for k in range(1, 4):
+            n = min(arg + k, 20)
+            total += n * (n + 1) // 2
+        return [total, arg]
+
+    def test_immutable(self):
+        '''Program attributes can't be replaced'''
+        program = compile('return 1')
+        with raises(AttributeError):
+            program.chunk = None
+
+    @mark.asyncio
+    @mark.parametrize('engine', Interpreter.engines)
+    async def test_shared_program(self, engine):
+        '''Thousands of concurrent runs share one program'''
+        program = compile(self.code)
+        tree = program.dump()
+
+        async def run(arg):
+            ns = Namespace()
+            ns.set_var('wait', self.wait)
+            ns.set_var('arg', arg)
+            return await Interpreter(program, namespace=ns,
+                                     engine=engine).run()
+
+        args = [i % 25 for i in range(0, 1000)]
+        results = await asyncio.gather(*[run(arg) for arg in args])
+        assert results == [self.expected(arg) for arg in args]
+        assert program.dump() == tree
+
+    @mark.asyncio
+    @mark.parametrize('engine', Interpreter.engines)
+    async def test_shared_interpreter(self, engine):
+        '''Interpreter can be run by many tasks at once'''
+        ns = Namespace()
+        ns.set_var('wait', self.wait)
+        ns.set_var('arg', 7)
+        interpreter = Interpreter(self.code, namespace=ns, engine=engine)
+        results = await asyncio.gather(
+            *[interpreter.run() for i in range(0, 200)])
+        assert results == [self.expected(7)] * 200
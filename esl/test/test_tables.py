@@ -0,0 +1,28 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+from esl.lex import Lexer
+from esl.parse import Parser
+
+
+class TestTables:
+    def test_lextab(self):
+        '''Shipped lexer tables match token rules'''
+        assert Lexer().check_tables(), 'run `python -m esl.tables\''
+
+    def test_parsetab(self):
+        '''Shipped parser tables match grammar'''
+        assert Parser().check_tables(), 'run `python -m esl.tables\''
+
+    def test_optimized_lexer(self):
+        '''Optimized lexer produces same tokens'''
+        code = 'local a = [[x]] -- comment\nreturn a .. "b" ~= 5'
+
+        def tokens(optimize):
+            lexer = Lexer()
+            lexer.build(optimize=optimize)
+            lexer.lexer.input(code)
+            return [(t.type, t.value, t.lineno) for t in lexer.lexer]
+
+        assert tokens(True) == tokens(False)
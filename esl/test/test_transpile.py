@@ -0,0 +1,94 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+import gc
+import linecache
+
+from pytest import mark, raises
+
+from esl import Interpreter, Namespace, ESLRuntimeError, compile
+from esl.program import ProgramCache
+from esl.transpile import source, line_tables
+
+
+async def run_code(code, ns=None):
+    return await Interpreter(code, namespace=ns, engine='python').run()
+
+
+class TestTranspile:
+    def test_sync_code(self):
+        '''Code without calls is not a coroutine'''
+        text = source(compile('local a = 1\nreturn a + 1'))
+        assert text.startswith('def ')
+
+        text = source(compile('function f()\nreturn 1\nend\nreturn f()'))
+        assert text.startswith('async def ')
+        assert '\n    def ' in text
+
+    @mark.asyncio
+    async def test_lexical_scope(self):
+        '''Locals are lexically scoped python locals'''
+        code = '''\
+            local n = 0
+            local function inc(x)
+                n = n + x
+                return n
+            end
+            inc(2)
+            do
+                local n = 10
+                inc(n)
+            end
+            return n
+        '''
+        assert await run_code(code) == 12
+
+    @mark.asyncio
+    async def test_closure_fallback(self, caplog):
+        '''Programs python can't compile are run by closure engine'''
+        program = compile('local b = 2\nreturn ' + ' * '.join(['b'] * 250))
+        assert await run_code(program) == 2 ** 250
+        assert source(program) is None
+        assert program.compiled['python'] is program.compiled['closure']
+        assert 'run by closure engine' in caplog.text
+
+    @mark.asyncio
+    async def test_foreign_function(self):
+        '''Functions created by another engine can be called'''
+        ns = Namespace()
+        code = '''\
+            function twice(x)
+                return x * 2
+            end
+        '''
+        await Interpreter(code, namespace=ns, engine='touch').run()
+        assert await run_code('return twice(4)', ns) == 8
+
+    @mark.asyncio
+    async def test_error_line(self, caplog):
+        '''Errors report script line'''
+        code = '''\
+            a = 1
+            b = {}
+
+            return a + b
+        '''
+        with raises(ESLRuntimeError):
+            await run_code(code)
+        assert '... <main> line 4: return a + b ...' in caplog.messages
+
+    @mark.asyncio
+    async def test_line_tables_released(self):
+        '''Line tables of generated code are removed with program'''
+        cache = ProgramCache(maxsize=1)
+        program = cache.compile('return 42')
+        filename = '<esl:{}>'.format(program.key[:16])
+        assert await Interpreter(program, engine='python').run() == 42
+        assert filename in line_tables and filename in linecache.cache
+
+        cache.compile('return 43')
+        del program
+        gc.collect()
+        assert filename not in line_tables
+        assert filename not in linecache.cache
@@ -0,0 +1,107 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+from pytest import mark, raises
+
+from esl import Interpreter, Namespace, ESLRecursionError, compile
+from esl.vm import Compiler, dis, FORLOOP, ADD, RETURN, TAILCALL
+
+
+async def run_code(code, ns=None, **kwargs):
+    return await Interpreter(code, namespace=ns, engine='vm', **kwargs).run()
+
+
+class TestVM:
+    def test_instructions(self):
+        '''Program is compiled into flat instruction list'''
+        proto = Compiler().program(compile('''\
+            local s = 0
+            for i = 1, 10 do
+                s = s + i
+            end
+            return s
+        ''').chunk)
+        ops = [instruction[0] for instruction in proto.code]
+        assert ops.count(FORLOOP) == 1
+        assert (ADD, 1, 1, 2) in proto.code
+        assert proto.code[-2] == (RETURN, 1, 1)
+        assert proto.constants == [0, 1, 10]
+        assert proto.lines[:2] == [1, 2]
+
+    def test_disassemble(self):
+        '''Disassembler lists instructions of nested functions'''
+        text = dis('function f(x)\nreturn x .. "!"\nend\nreturn f("a")')
+        assert 'function <main> (line 1)' in text
+        assert 'function f (line 1)' in text
+        assert 'SETGLOBAL' in text
+        assert 'CONCAT' in text
+        assert "; 'f'" in text
+
+    @mark.asyncio
+    async def test_deep_recursion(self):
+        '''ESL calls don't consume python stack, depth is not limited'''
+        code = '''\
+            local function sum(n)
+                if n == 0 then
+                    return 0
+                end
+                return n + sum(n - 1)
+            end
+            return sum(5000)
+        '''
+        assert await run_code(code) == 12502500
+        with raises(ESLRecursionError):
+            await run_code(code, max_depth=1000)
+
+    @mark.asyncio
+    async def test_long_expressions(self):
+        '''Chains of binary operators are compiled without recursion'''
+        code = 'local a = 1\nreturn ' + ' + '.join(['a * 2'] * 250)
+        assert await run_code(code) == 500
+        code = 'local a = "x"\nreturn ' + ' .. '.join(['a'] * 250)
+        assert await run_code(code) == 'x' * 250
+
+    @mark.asyncio
+    async def test_tail_calls(self):
+        '''Tail calls don't grow call depth'''
+        code = '''\
+            local function sum(n, acc)
+                if n == 0 then
+                    return acc
+                end
+                return sum(n - 1, acc + n)
+            end
+            return sum(5000, 0)
+        '''
+        proto = Compiler().program(compile(code).chunk).protos[0]
+        assert [i[0] for i in proto.code].count(TAILCALL) == 1
+        assert await run_code(code, max_depth=10) == 12502500
+
+    @mark.asyncio
+    async def test_host_functions(self):
+        '''Coroutine host functions are awaited'''
+        async def fetch(key):
+            return key * 2
+
+        ns = Namespace()
+        ns.set_var('fetch', fetch)
+        ns.set_var('upper', str.upper)
+        code = '''\
+            local s = "ab"
+            return fetch(3) + fetch(4), s:upper()
+        '''
+        assert await run_code(code, ns) == [14, 'AB']
+
+    @mark.asyncio
+    async def test_foreign_function(self):
+        '''Functions created by another engine can be called'''
+        ns = Namespace()
+        code = '''\
+            t = {k = 3}
+            function t:mul(x)
+                return self.k * x
+            end
+        '''
+        await Interpreter(code, namespace=ns, engine='closure').run()
+        assert await run_code('return t:mul(5)', ns) == 15
@@ -0,0 +1,680 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Python backend. Syntax tree is translated to python source and compiled
+# with compile(): local variables become python locals, loops and
+# conditions become native python statements, functions become python
+# functions. Function (and main chunk) is generated as `async def' only
+# if it contains function calls or loops, so pure code runs without
+# coroutine machinery. Execution context is passed to every generated
+# function as `_cx', loops and calls count steps in it.
+#
+# Locals are lexically scoped as in other engines, break/return use python
+# control flow. Python compiler limits nesting of blocks and parentheses
+# much stricter than ESL parser, programs it rejects are run by closure
+# engine instead (see compile()).
+
+import types
+import logging
+import weakref
+import builtins
+import linecache
+import itertools
+
+import esl.analysis
+import esl.closure
+import esl.function
+import esl.interpreter
+import esl.runtime
+
+logger = logging.getLogger(__name__)
+
+_FILENAME = '<esl:{}>'
+
+_KEYWORDS = {
+    '+': '+',
+    '-': '-',
+    '*': '*',
+    '/': '/',
+    '==': '==',
+    '<': '<',
+    '>': '>',
+    '<=': '<=',
+    '>=': '>=',
+    '~=': '!=',
+}
+
+# Python line tables of compiled programs by file name, entries are
+# removed with generated code (see build())
+line_tables = {}
+
+# Code of functions created by other engines, by function body
+_foreign = weakref.WeakKeyDictionary()
+
+_coroutine = types.CoroutineType
+
+_FUNCTION = esl.runtime.CALL_FUNCTION
+_PYTHON = esl.runtime.CALL_PYTHON
+_COROUTINE = esl.runtime.CALL_COROUTINE
+_METHOD = esl.runtime.CALL_METHOD
+
+
+class TranspileError(Exception):
+    pass
+
+
+def make_function(code, parlist, body):
+    func = esl.function.Function(parlist, body)
+    func.code = code
+    func.engine = 'python'
+    return func
+
+
+def define(parent, path, name, func, colon):
+    '''Stores function declared as `function a.b.c()\' into it's table.'''
+    for n in path:
+        if parent is None:
+            break
+        parent = parent[n]
+    if parent is None:
+        raise NameError('function not found')
+    if colon:
+        func.self = parent
+    parent[name] = func
+
+
+async def call(cx, ns, site, func, args, colon):
+    kind = site.classify(func)
+    if kind == _FUNCTION:
+        cx.countdown -= 1
+        if not cx.countdown:
+            await cx.checkpoint()
+        if func.engine == 'python':
+            code = func.code
+        else:
+            code = compile_function(func, ns)
+        call_stack = cx.call_stack
+        call_stack.append(site.frame)
+        if len(call_stack) > cx.max_depth:
+            cx.overflow()
+        if colon:
+            result = code(cx, func.self, *args)
+        else:
+            result = code(cx, None, *args)
+        if result.__class__ is _coroutine:
+            result = await result
+        call_stack.pop()
+        return result
+    elif kind == _PYTHON:
+        return func(*args)
+    elif kind == _COROUTINE:
+        return await func(*args)
+    if colon:
+        args.insert(0, func.__self__)
+    if kind == _METHOD:
+        return func.__func__(*args)
+    return await func.__func__(*args)
+
+
+def pad(values, count):
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    if len(values) < count:
+        return list(values) + [None] * (count - len(values))
+    return values[:count]
+
+
+_GLOBALS = {
+    '__builtins__': {
+        'isinstance': isinstance,
+        'list': list,
+        'tuple': tuple,
+        'next': next,
+        'ValueError': ValueError,
+    },
+    '_F': esl.runtime.FALSE,
+    '_len': esl.runtime.length,
+    '_call': call,
+    '_method': esl.runtime.get_method,
+    '_concat': esl.runtime.append,
+    '_table': esl.runtime.make_table,
+    '_unsupported': esl.runtime.unsupported,
+    '_iterate': esl.runtime.iterate,
+    '_Pairs': esl.runtime.Pairs,
+    '_for_params': esl.runtime.for_params,
+    '_range': esl.runtime.numeric_range,
+    '_function': make_function,
+    '_define': define,
+    '_pad': pad,
+}
+
+
+class _Function(object):
+    def __init__(self, parent):
+        self.parent = parent
+        self.lines = []
+        self.indent = 1
+        self.nonlocals = set()
+        self.loops = 0
+
+
+class Transpiler(object):
+    def __init__(self):
+        self.constants = []
+        self.sites = []
+        self.counter = itertools.count(1)
+        self.function = None
+        self.scope = None
+
+        nodes = esl.interpreter
+        self.statements = {
+            nodes.Block: self.block,
+            nodes.Assignment: self.assignment,
+            nodes.While: self.while_,
+            nodes.If: self.if_,
+            nodes.NumericFor: self.numeric_for,
+            nodes.GenericFor: self.generic_for,
+            nodes.Function: self.function_statement,
+            nodes.Break: self.break_,
+            nodes.Return: self.return_,
+            nodes.FunctionCall: self.call_statement,
+        }
+        self.expressions = {
+            nodes.Variable: self.variable,
+            nodes.Constant: self.constant,
+            nodes.Name: self.name,
+            nodes.FunctionCall: self.function_call,
+            nodes.Table: self.table,
+            nodes.Logical: self.logical,
+            nodes.Relational: self.relational,
+            nodes.Append: self.append,
+            nodes.Arithmetic: self.arithmetic,
+            nodes.Unary: self.unary,
+        }
+
+    # Output
+    def emit(self, text, lineno):
+        function = self.function
+        function.lines.append((function.indent, text, lineno))
+
+    def temp(self):
+        return '_t{}'.format(next(self.counter))
+
+    def const(self, value):
+        if value is None or isinstance(value, (bool, int, str)):
+            return repr(value)
+        self.constants.append(value)
+        return '_K[{}]'.format(len(self.constants) - 1)
+
+    def site(self, site):
+        '''Registers inline cache and returns expression of it.'''
+        self.sites.append(site)
+        return self.const(site)
+
+    # Scopes
+    def push_scope(self):
+        self.scope = ({}, self.scope)
+
+    def pop_scope(self):
+        self.scope = self.scope[1]
+
+    def declare(self, name):
+        local = 'l_{}_{}'.format(name, next(self.counter))
+        self.scope[0][name] = (local, self.function)
+        return local
+
+    def lookup(self, name):
+        scope = self.scope
+        while scope is not None:
+            if name in scope[0]:
+                return scope[0][name]
+            scope = scope[1]
+        return None, None
+
+    def read(self, name):
+        local, function = self.lookup(name)
+        if local is None:
+            site = self.site(esl.runtime.GlobalSite(name))
+            return '{}.get(_ns)'.format(site)
+        return local
+
+    def write(self, name, value, lineno):
+        local, function = self.lookup(name)
+        if local is None:
+            self.emit('_set({!r}, {})'.format(name, value), lineno)
+        else:
+            if function is not self.function:
+                self.function.nonlocals.add(local)
+            self.emit('{} = {}'.format(local, value), lineno)
+
+    # Entry point
+    def translate(self, chunk, name):
+        self.function = _Function(None)
+        self.push_scope()
+        if chunk is not None:
+            self.block(chunk.block, scope=False)
+        self.emit('return None', 0)
+        self.pop_scope()
+
+        is_coroutine = esl.analysis.may_suspend(chunk)
+        return self.source(name, is_coroutine, '_cx, _ns')
+
+    def translate_function(self, body, name):
+        '''Translates standalone function, generated code returns python
+        function for given namespace.'''
+        self.function = _Function(None)
+        self.push_scope()
+        code = self.function_code(body, True, body.lineno)
+        self.emit('return {}'.format(code), body.lineno)
+        self.pop_scope()
+        return self.source(name, False)
+
+    def source(self, name, is_coroutine, parameters='_ns'):
+        prefix = 'async def' if is_coroutine else 'def'
+        lines = [(0, '{} {}({}):'.format(prefix, name, parameters), 0),
+                 (1, '_get = _ns.get_var', 0),
+                 (1, '_set = _ns.set_var', 0)]
+        lines += self.function.lines
+
+        source = []
+        table = [0]
+        for indent, text, lineno in lines:
+            source.append('    ' * indent + text)
+            table.append(lineno)
+        return '\n'.join(source) + '\n', table
+
+    # Statements
+    def statement(self, node):
+        handler = self.statements.get(type(node))
+        if handler is None:
+            raise TranspileError('unsupported statement {}'.format(
+                type(node).__name__))
+        handler(node)
+
+    def block(self, node, scope=True):
+        if scope:
+            self.push_scope()
+        count = len(self.function.lines)
+        for statement in node.children:
+            if statement is not None:
+                self.statement(statement)
+        if len(self.function.lines) == count:
+            self.emit('pass', node.lineno)
+        if scope:
+            self.pop_scope()
+
+    def assignment(self, node):
+        lineno = node.lineno
+        count = len(node.left.children)
+
+        if node.value is not None and len(node.value.children) != count:
+            self.emit('raise ValueError(\'incorrect count of values\')',
+                      lineno)
+            return
+
+        if node.value is None:
+            values = ['None'] * count
+        else:
+            values = [self.expression(item) for item in node.value.children]
+
+        if node.local:
+            names = [self.declare(item.name) for item in node.left.children]
+            self.emit('{} = {}'.format(', '.join(names), ', '.join(values)),
+                      lineno)
+            return
+
+        if count > 1:
+            temps = [self.temp() for value in values]
+            self.emit('{} = {}'.format(', '.join(temps), ', '.join(values)),
+                      lineno)
+            values = temps
+
+        for item, value in zip(node.left.children, values):
+            if isinstance(item, esl.interpreter.Name):
+                self.write(item.name, value, lineno)
+            elif item.left is None and isinstance(item.name,
+                                                  esl.interpreter.Name):
+                self.write(item.name.name, value, lineno)
+            else:
+                if count == 1 and not isinstance(
+                        item.name, (esl.interpreter.Name,
+                                    esl.interpreter.Constant)):
+                    temp = self.temp()
+                    self.emit('{} = {}'.format(temp, value), lineno)
+                    value = temp
+                key = self.expression(item.name)
+                obj = self.expression(item.left)
+                self.emit('{}.set(_ns, {}, {}, {})'.format(
+                    self.site(esl.runtime.FieldSite()), obj, key, value),
+                    lineno)
+
+    def checkpoint(self, lineno):
+        self.emit('_cx.countdown -= 1', lineno)
+        self.emit('if not _cx.countdown: await _cx.checkpoint()', lineno)
+
+    def loop_body(self, node):
+        self.function.indent += 1
+        self.function.loops += 1
+        self.block(node)
+        self.function.loops -= 1
+        self.function.indent -= 1
+
+    def while_(self, node):
+        lineno = node.lineno
+        self.emit('while True:', lineno)
+        self.function.indent += 1
+        self.checkpoint(lineno)
+        check = 'if {} in (None, False): break'.format(
+            self.expression(node.expression))
+        if node.check_before:
+            self.emit(check, node.expression.lineno)
+        self.function.indent -= 1
+        self.loop_body(node.block)
+        if not node.check_before:
+            self.function.indent += 1
+            self.emit(check, node.expression.lineno)
+            self.function.indent -= 1
+
+    def if_(self, node):
+        branches = [(node.expression, node.block)]
+        for elseif in node.elseiflist:
+            branches.append((elseif.expression, elseif.block))
+
+        keyword = 'if'
+        for expression, block in branches:
+            self.emit('{} {} not in _F:'.format(
+                keyword, self.expression(expression)), expression.lineno)
+            self.function.indent += 1
+            self.block(block)
+            self.function.indent -= 1
+            keyword = 'elif'
+
+        if node.else_ is not None:
+            self.emit('else:', node.else_.lineno)
+            self.function.indent += 1
+            self.block(node.else_.block)
+            self.function.indent -= 1
+
+    def numeric_for(self, node):
+        start = self.expression(node.start)
+        limit = self.expression(node.limit)
+        step = '1' if node.step is None else self.expression(node.step)
+
+        self.push_scope()
+        name = self.declare(node.name.name)
+        self.emit('for {} in _range({}, {}, {}):'.format(
+            name, start, limit, step), node.lineno)
+        self.function.indent += 1
+        self.checkpoint(node.lineno)
+        self.function.indent -= 1
+        self.loop_body(node.block)
+        self.pop_scope()
+
+    def generic_for(self, node):
+        lineno = node.lineno
+        fun, obj, key, values, items = (self.temp() for i in range(0, 5))
+        expressions = [self.expression(e) for e in node.explist.children]
+        self.emit('{}, {}, {} = _for_params([{}])'.format(
+            fun, obj, key, ', '.join(expressions)), lineno)
+        self.emit('{} = {}.items if {}.__class__ is _Pairs else None'.format(
+            items, fun, fun), lineno)
+
+        self.push_scope()
+        names = [self.declare(name.name) for name in node.namelist.children]
+        self.emit('while True:', lineno)
+        self.function.indent += 1
+        self.checkpoint(lineno)
+        self.emit('{} = next({}, None) if {} is not None '
+                  'else await _iterate({}, {}, {})'.format(
+                      values, items, items, fun, obj, key), lineno)
+        self.emit('if {} is None: break'.format(values), lineno)
+        self.emit('{} = {}[0] if isinstance({}, (list, tuple)) '
+                  'else {}'.format(key, values, values, values), lineno)
+        self.emit('{}, = _pad({}, {})'.format(', '.join(names), values,
+                                              len(names)), lineno)
+        self.function.indent -= 1
+        self.loop_body(node.block)
+        self.pop_scope()
+
+    def function_statement(self, node):
+        lineno = node.lineno
+        parts = [item.name for item in node.parts]
+        colon = node.colon
+
+        local = None
+        if node.local:
+            local = self.declare(parts[-1])
+
+        code = self.function_code(node.body, colon, lineno)
+        func = '_function({}, {}, {})'.format(code, self.const(
+            node.body.parlist), self.const(node.body.body))
+
+        if len(parts) == 1:
+            if local is not None:
+                self.emit('{} = {}'.format(local, func), lineno)
+            else:
+                self.write(parts[0], func, lineno)
+        else:
+            self.emit('_define({}, {!r}, {!r}, {}, {})'.format(
+                self.read(parts[0]), parts[1:-1], parts[-1], func, colon),
+                      lineno)
+
+    def function_code(self, body, colon, lineno):
+        '''Emits python function for function body, returns it's name.'''
+        name = '_f{}'.format(next(self.counter))
+
+        parent = self.function
+        self.function = _Function(parent)
+        self.push_scope()
+
+        parameters = ['_cx', self.declare('self') if colon else '_self']
+        if body.parlist is not None and body.parlist.namelist is not None:
+            for item in body.parlist.namelist.children:
+                parameters.append('{}=None'.format(self.declare(item.name)))
+        parameters.append('*_args')
+
+        self.block(body.body, scope=False)
+        self.pop_scope()
+
+        function = self.function
+        self.function = parent
+
+        if esl.analysis.may_suspend(body.body):
+            prefix = 'async def'
+        else:
+            prefix = 'def'
+        self.emit('{} {}({}):'.format(prefix, name, ', '.join(parameters)),
+                  lineno)
+        if function.nonlocals:
+            parent.lines.append((parent.indent + 1, 'nonlocal {}'.format(
+                ', '.join(sorted(function.nonlocals))), lineno))
+        for indent, text, line in function.lines:
+            parent.lines.append((parent.indent + indent, text, line))
+
+        return name
+
+    def break_(self, node):
+        if self.function.loops:
+            self.emit('break', node.lineno)
+        else:
+            self.emit('return None', node.lineno)
+
+    def return_(self, node):
+        if node.explist is None:
+            self.emit('return None', node.lineno)
+            return
+        values = [self.expression(item) for item in node.explist.children]
+        if len(values) == 1:
+            self.emit('return {}'.format(values[0]), node.lineno)
+        else:
+            self.emit('return [{}]'.format(', '.join(values)), node.lineno)
+
+    def call_statement(self, node):
+        self.emit(self.function_call(node), node.lineno)
+
+    # Expressions
+    def expression(self, node):
+        handler = self.expressions.get(type(node))
+        if handler is None:
+            raise TranspileError('unsupported expression {}'.format(
+                type(node).__name__))
+        return handler(node)
+
+    def variable(self, node):
+        if node.left is None and isinstance(node.name, esl.interpreter.Name):
+            return self.read(node.name.name)
+        key = self.expression(node.name)
+        if node.left is None:
+            return '_get({})'.format(key)
+        return '{}.get(_ns, {}, {})'.format(
+            self.site(esl.runtime.FieldSite()), self.expression(node.left),
+            key)
+
+    def constant(self, node):
+        return self.const(node.value)
+
+    def name(self, node):
+        return repr(node.name)
+
+    def function_call(self, node):
+        func = self.expression(node.prefixexp)
+        if node.name is not None:
+            func = '_method({}, {!r})'.format(func, node.name.name)
+        args = [self.expression(arg) for arg in node.args.children]
+        site = self.site(esl.runtime.CallSite(node.site.frame))
+        return '(await _call(_cx, _ns, {}, {}, [{}], {}))'.format(
+            site, func, ', '.join(args), node.colon)
+
+    def table(self, node):
+        fields = []
+        if node.fieldlist is not None:
+            for field in node.fieldlist.children:
+                if field.name is None:
+                    name = 'None'
+                else:
+                    name = self.expression(field.name)
+                fields.append('({}, {})'.format(
+                    name, self.expression(field.expression)))
+        return '_table([{}])'.format(', '.join(fields))
+
+    def logical(self, node):
+        if node.operation not in ('and', 'or'):
+            raise TranspileError('unsupported operation {}'.format(
+                node.operation))
+        return '({} {} {})'.format(self.expression(node.left),
+                                   node.operation,
+                                   self.expression(node.right))
+
+    def binary(self, node):
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        operation = _KEYWORDS.get(node.operation)
+        if operation is None:
+            return '_unsupported({!r})({}, {})'.format(
+                node.operation, left, right)
+        return '({} {} {})'.format(left, operation, right)
+
+    relational = binary
+    arithmetic = binary
+
+    def append(self, node):
+        return '_concat(_cx, {}, {})'.format(self.expression(node.left),
+                                             self.expression(node.right))
+
+    def unary(self, node):
+        value = self.expression(node.expression)
+        if node.operation == '-':
+            return '(-{})'.format(value)
+        elif node.operation == 'not':
+            return '(not {})'.format(value)
+        return '_len({})'.format(value)
+
+
+def build(transpiler, source, table, filename, name):
+    '''Compiles generated source, returns python function.'''
+    scope = dict(_GLOBALS, _K=transpiler.constants)
+    exec(builtins.compile(source, filename, 'exec'), scope)
+    result = scope[name]
+
+    entry = (len(source), None, source.splitlines(True), filename)
+    line_tables[filename] = table
+    linecache.cache[filename] = entry
+    weakref.finalize(result, forget, filename, table, entry)
+    return result
+
+
+def forget(filename, table, entry):
+    '''Removes line table and source lines of collected code, unless file
+    name was taken by code compiled later.'''
+    if line_tables.get(filename) is table:
+        del line_tables[filename]
+    if linecache.cache.get(filename) is entry:
+        del linecache.cache[filename]
+
+
+def locate(exc):
+    '''Finds script line of innermost generated code in traceback.'''
+    lineno = None
+    tb = exc.__traceback__
+    while tb is not None:
+        table = line_tables.get(tb.tb_frame.f_code.co_filename)
+        if table is not None and tb.tb_lineno < len(table):
+            lineno = table[tb.tb_lineno] or lineno
+        tb = tb.tb_next
+    if lineno is not None:
+        esl.runtime.locate(exc, lineno)
+
+
+def compile_function(func, ns):
+    '''Returns python code of function created by another engine.'''
+    maker = _foreign.get(func.body)
+    if maker is None:
+        transpiler = Transpiler()
+        body = esl.interpreter.FunctionBody(func.body.lineno, func.parlist,
+                                            func.body)
+        source, table = transpiler.translate_function(body, '_maker')
+        filename = _FILENAME.format('function-{}'.format(id(func.body)))
+        maker = _foreign[func.body] = build(transpiler, source, table,
+                                            filename, '_maker')
+    return maker(ns)
+
+
+def source(program):
+    '''Returns generated python source of program, None if program is run
+    by closure engine.'''
+    return getattr(compile(program), 'source', None)
+
+
+def compile(program):
+    '''Returns compiled python code of program, compiles it once. Program
+    which python can't compile (too deeply nested blocks, too long
+    expressions) gets code of closure engine.'''
+    code = program.compiled.get('python')
+    if code is None:
+        transpiler = Transpiler()
+        filename = _FILENAME.format(program.key[:16])
+        try:
+            text, table = transpiler.translate(program.chunk, '_chunk')
+            main = build(transpiler, text, table, filename, '_chunk')
+        except (SyntaxError, RecursionError) as e:
+            logger.warning('Program {} is run by closure engine, python '
+                           'can\'t compile it: {}'.format(filename, e))
+            code = program.compiled['python'] = esl.closure.compile(program)
+            return code
+        is_coroutine = text.startswith('async')
+
+        async def code(interpreter, ns):
+            try:
+                result = main(interpreter, ns)
+                if is_coroutine:
+                    result = await result
+            except Exception as e:
+                locate(e)
+                raise
+            return result
+
+        code.source = text
+        code.sites = transpiler.sites
+        program.compiled['python'] = code
+    return code
@@ -0,0 +1,976 @@
+__author__ = 'Gennady Kovalev <gik@bigur.ru>'
+__copyright__ = '(c) 2016-2019 Development management business group'
+__licence__ = 'For license information see LICENSE'
+
+# Register based virtual machine. Chunk and every function body are
+# compiled into Proto: flat list of instructions with constant and line
+# tables. Instruction is a tuple of opcode and operands: register indexes,
+# counts and jump offsets relative to next instruction.
+#
+# Registers of function call are one python list: register 0 refers to
+# registers of enclosing function (for upvalues), then go local variables
+# (slots assigned by esl.resolve), temporaries and constants, so constants
+# are addressed as registers too.
+#
+# Calls of functions compiled by VM don't recurse in python: frames are
+# kept on own stack and one dispatch loop runs all of them. The loop
+# awaits only calls of coroutine host functions, asynchronous iterators
+# and checkpoints of execution context (CHECK at loop heads, FORLOOP and
+# CALL count steps).
+
+import logging
+import weakref
+
+import esl.analysis
+import esl.function
+import esl.interpreter
+import esl.program
+import esl.resolve
+import esl.runtime
+
+logger = logging.getLogger(__name__)
+
+OPCODES = (
+    'MOVE', 'LOADNIL', 'GETGLOBAL', 'GETVAR', 'SETGLOBAL', 'GETUPVAL',
+    'SETUPVAL', 'GETFIELD', 'SETFIELD', 'GETMETHOD', 'ADD', 'SUB', 'MUL',
+    'DIV', 'CONCAT', 'EQ', 'LT', 'GT', 'LE', 'GE', 'NE', 'AND', 'OR', 'UNM',
+    'NOT', 'LEN', 'JMP', 'TEST', 'TESTLOOP', 'CHECK', 'FORPREP', 'FORLOOP',
+    'TFORPREP', 'TFORCALL', 'CLOSURE', 'METHOD', 'CALL', 'TAILCALL',
+    'RETURN', 'TABLE', 'RAISE')
+
+(MOVE, LOADNIL, GETGLOBAL, GETVAR, SETGLOBAL, GETUPVAL, SETUPVAL, GETFIELD,
+ SETFIELD, GETMETHOD, ADD, SUB, MUL, DIV, CONCAT, EQ, LT, GT, LE, GE, NE,
+ AND, OR, UNM, NOT, LEN, JMP, TEST, TESTLOOP, CHECK, FORPREP, FORLOOP,
+ TFORPREP, TFORCALL, CLOSURE, METHOD, CALL, TAILCALL, RETURN, TABLE,
+ RAISE) = range(len(OPCODES))
+
+# Operand kinds: R - register, N - number, J - jump offset
+OPERANDS = {
+    MOVE: 'RR',
+    LOADNIL: 'R',
+    GETGLOBAL: 'RRN',
+    GETVAR: 'RR',
+    SETGLOBAL: 'RR',
+    GETUPVAL: 'RNN',
+    SETUPVAL: 'RNN',
+    GETFIELD: 'RRRN',
+    SETFIELD: 'RRRN',
+    GETMETHOD: 'RRR',
+    UNM: 'RR',
+    NOT: 'RR',
+    LEN: 'RR',
+    JMP: 'J',
+    TEST: 'RJ',
+    AND: 'RJ',
+    OR: 'RJ',
+    TESTLOOP: 'RJ',
+    CHECK: '',
+    FORPREP: 'RJ',
+    FORLOOP: 'RRJ',
+    TFORPREP: 'RN',
+    TFORCALL: 'RRNJ',
+    CLOSURE: 'RN',
+    METHOD: 'RRR',
+    CALL: 'RNNN',
+    TAILCALL: 'RNNN',
+    RETURN: 'RN',
+    TABLE: 'RRN',
+    RAISE: 'RR',
+}
+for op in (ADD, SUB, MUL, DIV, CONCAT, EQ, LT, GT, LE, GE, NE):
+    OPERANDS[op] = 'RRR'
+
+ARITHMETIC = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+RELATIONAL = {'==': EQ, '<': LT, '>': GT, '<=': LE, '>=': GE, '~=': NE}
+LOGICAL = {'and': AND, 'or': OR}
+UNARY = {'-': UNM, 'not': NOT, '#': LEN}
+
+# Compiled bodies of functions created by other engines
+_foreign = weakref.WeakKeyDictionary()
+
+_END = object()
+
+
+class Proto(object):
+    '''Compiled function.'''
+    def __init__(self, name, lineno):
+        self.name = name
+        self.lineno = lineno
+        self.code = []
+        self.lines = []
+        self.constants = []
+        self.protos = []
+        # Inline caches of CALL instructions
+        self.sites = []
+        # Count of registers before constants
+        self.size = 1
+        # Registers of parameters and `self'
+        self.params = []
+        self.self = None
+        # Syntax tree for functions created from this proto
+        self.parlist = None
+        self.body = None
+        # Initial registers after link to enclosing function
+        self.template = []
+
+
+class _State(object):
+    def __init__(self, proto, base):
+        self.proto = proto
+        self.base = base
+        self.top = base
+        self.peak = base
+        self.constants = {}
+        self.loops = []
+
+
+class Compiler(object):
+    def __init__(self):
+        self.suspending = set()
+        self.slots = {}
+        self.sizes = {}
+        self.selves = {}
+        self.state = None
+        self.lineno = 0
+
+        nodes = esl.interpreter
+        self.statements = {
+            nodes.Block: self.block,
+            nodes.Assignment: self.assignment,
+            nodes.While: self.while_,
+            nodes.If: self.if_,
+            nodes.NumericFor: self.numeric_for,
+            nodes.GenericFor: self.generic_for,
+            nodes.Function: self.function,
+            nodes.Break: self.break_,
+            nodes.Return: self.return_,
+            nodes.FunctionCall: self.call_statement,
+        }
+        self.expressions = {
+            nodes.Variable: self.variable,
+            nodes.Constant: self.constant,
+            nodes.FunctionCall: self.call,
+            nodes.Table: self.table,
+            nodes.Logical: self.logical,
+            nodes.Relational: self.relational,
+            nodes.Append: self.append,
+            nodes.Arithmetic: self.arithmetic,
+            nodes.Unary: self.unary,
+        }
+        # Opcodes of binary operators by node type
+        self.operations = {
+            nodes.Relational: lambda node: RELATIONAL.get(node.operation),
+            nodes.Append: lambda node: CONCAT,
+            nodes.Arithmetic: lambda node: ARITHMETIC.get(node.operation),
+        }
+
+    def analyze(self, root, colon=False):
+        self.suspending.update(esl.analysis.suspending(root))
+        resolver = esl.resolve.resolve(root, 1, colon)
+        self.slots.update(resolver.slots)
+        self.sizes.update(resolver.sizes)
+        self.selves.update(resolver.selves)
+
+    def program(self, chunk):
+        '''Compiles chunk into Proto.'''
+        self.analyze(chunk)
+        return self.proto(chunk, '<main>')
+
+    def function_body(self, root):
+        '''Compiles standalone FunctionBody node into Proto.'''
+        self.analyze(root, True)
+        return self.proto(root, '<function>')
+
+    def proto(self, root, name):
+        parent, lineno = self.state, self.lineno
+        proto = Proto(name, root.lineno)
+        self.state = _State(proto, self.sizes.get(root, 1))
+        self.lineno = root.lineno
+
+        if isinstance(root, esl.interpreter.Chunk):
+            block = root.block
+        else:
+            block = root.body
+            proto.parlist = root.parlist
+            proto.body = root.body
+            proto.self = self.selves.get(root)
+            if root.parlist is not None and root.parlist.namelist is not None:
+                for item in root.parlist.namelist.children:
+                    proto.params.append(self.slots[item][1])
+
+        if block is not None:
+            self.block(block)
+        self.emit(RETURN, 0, 0)
+        self.finish()
+
+        self.state, self.lineno = parent, lineno
+        return proto
+
+    def finish(self):
+        '''Places constants after registers.'''
+        state = self.state
+        proto = state.proto
+        proto.size = size = state.peak
+        code = []
+        for instruction in proto.code:
+            kinds = OPERANDS[instruction[0]]
+            operands = [
+                size - value - 1 if kind == 'R' and value < 0 else value
+                for kind, value in zip(kinds, instruction[1:])
+            ]
+            code.append((instruction[0], *operands))
+        proto.code = code
+        proto.template = [None] * (size - 1) + proto.constants
+
+    # Registers
+
+    def emit(self, *instruction):
+        proto = self.state.proto
+        proto.code.append(instruction)
+        proto.lines.append(self.lineno)
+        return len(proto.code) - 1
+
+    def patch(self, pc, target=None):
+        '''Sets jump of instruction at pc to target (next by default).'''
+        proto = self.state.proto
+        if target is None:
+            target = len(proto.code)
+        instruction = list(proto.code[pc])
+        instruction[-1] = target - pc - 1
+        proto.code[pc] = tuple(instruction)
+
+    def jump(self, target):
+        return self.emit(JMP, target - len(self.state.proto.code) - 1)
+
+    def const(self, value):
+        '''Returns register of constant, negative until finish().'''
+        state = self.state
+        key = (type(value), value)
+        index = state.constants.get(key)
+        if index is None:
+            index = state.constants[key] = len(state.proto.constants)
+            state.proto.constants.append(value)
+        return -index - 1
+
+    def site(self, site):
+        '''Returns index of inline cache in sites of function.'''
+        sites = self.state.proto.sites
+        sites.append(site)
+        return len(sites) - 1
+
+    def temp(self):
+        state = self.state
+        register = state.top
+        state.top += 1
+        if state.top > state.peak:
+            state.peak = state.top
+        return register
+
+    def dest(self, target):
+        return self.temp() if target is None else target
+
+    def result(self, register, target):
+        if target is None or target == register:
+            return register
+        self.emit(MOVE, target, register)
+        return target
+
+    def is_local(self, register):
+        return 0 < register < self.state.base
+
+    # Expressions
+
+    def exp(self, node, target=None):
+        '''Compiles expression, returns register of it's value.'''
+        return self.expressions[type(node)](node, target)
+
+    def constant(self, node, target):
+        return self.result(self.const(node.value), target)
+
+    def load(self, node, name, target):
+        location = self.slots.get(node)
+        if location is None:
+            target = self.dest(target)
+            self.emit(GETGLOBAL, target, self.const(name),
+                      self.site(esl.runtime.GlobalSite(name)))
+            return target
+        depth, slot = location
+        if depth == 0:
+            return self.result(slot, target)
+        target = self.dest(target)
+        self.emit(GETUPVAL, target, depth, slot)
+        return target
+
+    def store(self, item, register):
+        nodes = esl.interpreter
+        if isinstance(item, nodes.Name):
+            name = item.name
+        elif item.left is None and isinstance(item.name, nodes.Name):
+            name = item.name.name
+        else:
+            top = self.state.top
+            if isinstance(item.name, nodes.Name):
+                key = self.const(item.name.name)
+            else:
+                key = self.exp(item.name)
+            obj = self.exp(item.left)
+            self.emit(SETFIELD, obj, key, register,
+                      self.site(esl.runtime.FieldSite()))
+            self.state.top = top
+            return
+
+        location = self.slots.get(item)
+        if location is None:
+            self.emit(SETGLOBAL, register, self.const(name))
+        elif location[0] == 0:
+            self.result(register, location[1])
+        else:
+            self.emit(SETUPVAL, register, *location)
+
+    def variable(self, node, target):
+        if node.left is None and isinstance(node.name, esl.interpreter.Name):
+            return self.load(node, node.name.name, target)
+
+        top = self.state.top
+        if node.left is None:
+            key = self.exp(node.name)
+            self.state.top = top
+            target = self.dest(target)
+            self.emit(GETVAR, target, key)
+            return target
+
+        obj = self.operand(node.left, node.name)
+        if isinstance(node.name, esl.interpreter.Name):
+            key = self.const(node.name.name)
+        else:
+            key = self.exp(node.name)
+        self.state.top = top
+        target = self.dest(target)
+        self.emit(GETFIELD, target, obj, key,
+                  self.site(esl.runtime.FieldSite()))
+        return target
+
+    def operand(self, node, after):
+        '''Compiles left operand, copies local variable if evaluation of
+        right operand may change it.'''
+        register = self.exp(node)
+        if self.is_local(register) and after in self.suspending:
+            register = self.result(register, self.temp())
+        return register
+
+    def binary(self, node, op, target):
+        '''Compiles binary operator. Operators in left operand (a + b + c
+        ...) are compiled in a loop from the innermost one, so long
+        expressions don't exhaust python stack.'''
+        chain = [(node, op)]
+        first = node
+        while type(first.left) in self.operations:
+            first = first.left
+            chain.append((first, self.operations[type(first)](first)))
+
+        top = self.state.top
+        left = self.operand(first.left, first.right)
+        for item, op in reversed(chain):
+            right = self.exp(item.right)
+            self.state.top = top
+            value = self.dest(target if item is node else None)
+            if op is None:
+                self.emit(RAISE, self.const(NotImplementedError),
+                          self.const('operation {} not supported'.format(
+                              item.operation)))
+            else:
+                self.emit(op, value, left, right)
+            left = value
+        return left
+
+    def arithmetic(self, node, target):
+        return self.binary(node, ARITHMETIC.get(node.operation), target)
+
+    def relational(self, node, target):
+        return self.binary(node, RELATIONAL.get(node.operation), target)
+
+    def logical(self, node, target):
+        op = LOGICAL.get(node.operation)
+        if op is None:
+            return self.binary(node, None, target)
+        # Right operand is evaluated only if left one doesn't decide.
+        # Local variable target may be read by operands, so value is
+        # moved to it at the end.
+        top = self.state.top
+        if target is None or self.is_local(target):
+            value = self.temp()
+        else:
+            value = target
+        self.exp(node.left, value)
+        skip = self.emit(op, value, 0)
+        self.exp(node.right, value)
+        self.patch(skip)
+        if target is None or value == target:
+            return value
+        self.state.top = top
+        return self.result(value, target)
+
+    def append(self, node, target):
+        return self.binary(node, CONCAT, target)
+
+    def unary(self, node, target):
+        top = self.state.top
+        value = self.exp(node.expression)
+        self.state.top = top
+        target = self.dest(target)
+        op = UNARY.get(node.operation)
+        if op is None:
+            self.emit(LOADNIL, target)
+        else:
+            self.emit(op, target, value)
+        return target
+
+    def table(self, node, target):
+        top = self.state.top
+        fields = [] if node.fieldlist is None else node.fieldlist.children
+        for field in fields:
+            key = self.temp()
+            if field.name is None:
+                self.emit(LOADNIL, key)
+            elif isinstance(field.name, esl.interpreter.Name):
+                self.emit(MOVE, key, self.const(field.name.name))
+            else:
+                self.exp(field.name, key)
+            self.exp(field.expression, self.temp())
+        self.state.top = top
+        target = self.dest(target)
+        self.emit(TABLE, target, top, len(fields))
+        return target
+
+    def call(self, node, target, tail=False):
+        '''Compiles function call, tail call reuses frame of caller if
+        callee is ESL function.'''
+        top = self.state.top
+        base = self.temp()
+        if node.name is not None:
+            obj = self.exp(node.prefixexp)
+            self.emit(GETMETHOD, base, obj, self.const(node.name.name))
+            self.state.top = base + 1
+        else:
+            self.exp(node.prefixexp, base)
+        args = [] if node.args is None else node.args.children
+        for arg in args:
+            self.exp(arg, self.temp())
+        self.emit(TAILCALL if tail else CALL, base, len(args),
+                  int(bool(node.colon)),
+                  self.site(esl.runtime.CallSite(node.site.frame)))
+        if target is None:
+            self.state.top = base + 1
+            return base
+        self.state.top = top
+        return self.result(base, target)
+
+    # Statements
+
+    def statement(self, node):
+        lineno = self.lineno
+        self.lineno = node.lineno
+        top = self.state.top
+        self.statements[type(node)](node)
+        self.state.top = top
+        self.lineno = lineno
+
+    def block(self, node):
+        for statement in node.children:
+            if statement is not None:
+                self.statement(statement)
+
+    def call_statement(self, node):
+        self.call(node, None)
+
+    def assignment(self, node):
+        count = len(node.left.children)
+        if node.value is not None and len(node.value.children) != count:
+            self.emit(RAISE, self.const(ValueError),
+                      self.const('incorrect count of values'))
+            return
+
+        targets = node.left.children
+        if node.value is None:
+            values = [self.const(None)] * count
+        elif count == 1:
+            item = targets[0]
+            location = self.slots.get(item)
+            if location is not None and location[0] == 0:
+                self.exp(node.value.children[0], location[1])
+                return
+            values = [self.exp(node.value.children[0])]
+        else:
+            values = [self.exp(value, self.temp())
+                      for value in node.value.children]
+
+        for item, register in zip(targets, values):
+            self.store(item, register)
+
+    def loop(self):
+        self.state.loops.append([])
+
+    def end_loop(self):
+        for pc in self.state.loops.pop():
+            self.patch(pc)
+
+    def while_(self, node):
+        self.loop()
+        start = self.emit(CHECK)
+        top = self.state.top
+        if node.check_before:
+            check = self.exp(node.expression)
+            self.state.top = top
+            self.state.loops[-1].append(self.emit(TESTLOOP, check, 0))
+            self.block(node.block)
+        else:
+            self.block(node.block)
+            check = self.exp(node.expression)
+            self.state.top = top
+            self.state.loops[-1].append(self.emit(TESTLOOP, check, 0))
+        self.jump(start)
+        self.end_loop()
+
+    def if_(self, node):
+        branches = [(node.expression, node.block)]
+        for elseif in node.elseiflist:
+            branches.append((elseif.expression, elseif.block))
+
+        exits = []
+        for i, (expression, block) in enumerate(branches):
+            top = self.state.top
+            check = self.exp(expression)
+            self.state.top = top
+            skip = self.emit(TEST, check, 0)
+            self.block(block)
+            if i < len(branches) - 1 or node.else_ is not None:
+                exits.append(self.emit(JMP, 0))
+            self.patch(skip)
+        if node.else_ is not None:
+            self.block(node.else_.block)
+        for pc in exits:
+            self.patch(pc)
+
+    def numeric_for(self, node):
+        base = self.temp()
+        self.exp(node.start, base)
+        self.exp(node.limit, self.temp())
+        if node.step is None:
+            self.emit(MOVE, self.temp(), self.const(1))
+        else:
+            self.exp(node.step, self.temp())
+        prepare = self.emit(FORPREP, base, 0)
+
+        self.loop()
+        start = len(self.state.proto.code)
+        self.block(node.block)
+        self.patch(prepare)
+        self.emit(FORLOOP, base, self.slots[node.name][1], 0)
+        self.patch(len(self.state.proto.code) - 1, start)
+        self.end_loop()
+
+    def generic_for(self, node):
+        base = self.state.top
+        expressions = [] if node.explist is None else node.explist.children
+        for expression in expressions:
+            self.exp(expression, self.temp())
+        while self.state.top < base + 3:
+            self.temp()
+        self.emit(TFORPREP, base, len(expressions))
+
+        self.loop()
+        start = self.emit(CHECK)
+        names = node.namelist.children
+        first = self.slots[names[0]][1]
+        self.state.loops[-1].append(
+            self.emit(TFORCALL, base, first, len(names), 0))
+        self.block(node.block)
+        self.jump(start)
+        self.end_loop()
+
+    def function(self, node):
+        parts = node.parts
+        name = '.'.join(item.name for item in parts)
+        proto = self.proto(node.body, name)
+        index = len(self.state.proto.protos)
+        self.state.proto.protos.append(proto)
+
+        if len(parts) == 1:
+            location = self.slots.get(parts[0])
+            if location is not None and location[0] == 0:
+                self.emit(CLOSURE, location[1], index)
+            else:
+                func = self.temp()
+                self.emit(CLOSURE, func, index)
+                self.store(parts[0], func)
+            return
+
+        func = self.temp()
+        self.emit(CLOSURE, func, index)
+        root = self.load(parts[0], parts[0].name, None)
+        spec = (tuple(item.name for item in parts[1:-1]), parts[-1].name,
+                bool(node.colon))
+        self.emit(METHOD, func, root, self.const(spec))
+
+    def break_(self, node):
+        if self.state.loops:
+            self.state.loops[-1].append(self.emit(JMP, 0))
+        else:
+            self.emit(RETURN, 0, 0)
+
+    def return_(self, node):
+        expressions = [] if node.explist is None else node.explist.children
+        if not expressions:
+            self.emit(RETURN, 0, 0)
+        elif len(expressions) == 1:
+            if isinstance(expressions[0], esl.interpreter.FunctionCall):
+                register = self.call(expressions[0], None, tail=True)
+            else:
+                register = self.exp(expressions[0])
+            self.emit(RETURN, register, 1)
+        else:
+            base = self.state.top
+            for expression in expressions:
+                self.exp(expression, self.temp())
+            self.emit(RETURN, base, len(expressions))
+
+
+def function_body(func):
+    '''Returns Proto for function created by another engine.'''
+    proto = _foreign.get(func.body)
+    if proto is None:
+        root = esl.interpreter.FunctionBody(func.body.lineno, func.parlist,
+                                            func.body)
+        proto = _foreign[func.body] = Compiler().function_body(root)
+    return proto
+
+
+async def execute(proto, interpreter, ns, regs):
+    '''Runs proto with registers regs.'''
+    Function = esl.function.Function
+    FALSE = esl.runtime.FALSE
+    get_method = esl.runtime.get_method
+    append = esl.runtime.append
+    iterate = esl.runtime.iterate
+    Pairs = esl.runtime.Pairs
+    for_params = esl.runtime.for_params
+    numeric_range = esl.runtime.numeric_range
+    make_table = esl.runtime.make_table
+    CALL_FUNCTION = esl.runtime.CALL_FUNCTION
+    CALL_PYTHON = esl.runtime.CALL_PYTHON
+    CALL_COROUTINE = esl.runtime.CALL_COROUTINE
+    CALL_METHOD = esl.runtime.CALL_METHOD
+    get_var = ns.get_var
+    set_var = ns.set_var
+    call_stack = interpreter.call_stack
+    # Tail call of main function leaves frame nobody pops
+    depth = len(call_stack)
+
+    code = proto.code
+    pc = 0
+    stack = []
+
+    try:
+        while True:
+            instruction = code[pc]
+            pc += 1
+            op = instruction[0]
+
+            if op == MOVE:
+                regs[instruction[1]] = regs[instruction[2]]
+            elif op == GETGLOBAL:
+                site = proto.sites[instruction[3]]
+                namespace, version, value = site.entry
+                if ns is namespace and ns.root.version == version:
+                    site.hits += 1
+                    regs[instruction[1]] = value
+                else:
+                    regs[instruction[1]] = site.lookup(ns)
+            elif op == ADD:
+                regs[instruction[1]] = (regs[instruction[2]] +
+                                        regs[instruction[3]])
+            elif op == FORLOOP:
+                value = next(regs[instruction[1]], _END)
+                if value is not _END:
+                    regs[instruction[2]] = value
+                    pc += instruction[3]
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+            elif op == JMP:
+                pc += instruction[1]
+            elif op == TEST:
+                if regs[instruction[1]] in FALSE:
+                    pc += instruction[2]
+            elif op == CHECK:
+                interpreter.countdown -= 1
+                if not interpreter.countdown:
+                    await interpreter.checkpoint()
+            elif op == LT:
+                regs[instruction[1]] = (regs[instruction[2]] <
+                                        regs[instruction[3]])
+            elif op == EQ:
+                regs[instruction[1]] = (regs[instruction[2]] ==
+                                        regs[instruction[3]])
+            elif op == GETVAR:
+                regs[instruction[1]] = get_var(regs[instruction[2]])
+            elif op == SETGLOBAL:
+                set_var(regs[instruction[2]], regs[instruction[1]])
+            elif op == GETUPVAL:
+                up = regs[0]
+                for i in range(1, instruction[2]):
+                    up = up[0]
+                regs[instruction[1]] = up[instruction[3]]
+            elif op == SETUPVAL:
+                up = regs[0]
+                for i in range(1, instruction[2]):
+                    up = up[0]
+                up[instruction[3]] = regs[instruction[1]]
+            elif op == GETFIELD:
+                regs[instruction[1]] = proto.sites[instruction[4]].get(
+                    ns, regs[instruction[2]], regs[instruction[3]])
+            elif op == SETFIELD:
+                proto.sites[instruction[4]].set(ns, regs[instruction[1]],
+                                                regs[instruction[2]],
+                                                regs[instruction[3]])
+            elif op == SUB:
+                regs[instruction[1]] = (regs[instruction[2]] -
+                                        regs[instruction[3]])
+            elif op == MUL:
+                regs[instruction[1]] = (regs[instruction[2]] *
+                                        regs[instruction[3]])
+            elif op == DIV:
+                regs[instruction[1]] = (regs[instruction[2]] /
+                                        regs[instruction[3]])
+            elif op == GT:
+                regs[instruction[1]] = (regs[instruction[2]] >
+                                        regs[instruction[3]])
+            elif op == LE:
+                regs[instruction[1]] = (regs[instruction[2]] <=
+                                        regs[instruction[3]])
+            elif op == GE:
+                regs[instruction[1]] = (regs[instruction[2]] >=
+                                        regs[instruction[3]])
+            elif op == NE:
+                regs[instruction[1]] = (regs[instruction[2]] !=
+                                        regs[instruction[3]])
+            elif op == CONCAT:
+                regs[instruction[1]] = append(interpreter,
+                                              regs[instruction[2]],
+                                              regs[instruction[3]])
+
+            elif op == CALL or op == TAILCALL:
+                a = instruction[1]
+                count = instruction[2]
+                func = regs[a]
+                site = proto.sites[instruction[4]]
+                kind = site.classify(func)
+                if kind == CALL_FUNCTION:
+                    interpreter.countdown -= 1
+                    if not interpreter.countdown:
+                        await interpreter.checkpoint()
+                    if func.engine == 'vm':
+                        callee, up = func.code
+                    else:
+                        callee, up = function_body(func), None
+                    frame = [up] + callee.template
+                    if callee.self is not None and instruction[3]:
+                        frame[callee.self] = func.self
+                    params = callee.params
+                    for i in range(0, min(count, len(params))):
+                        frame[params[i]] = regs[a + 1 + i]
+                    if op == CALL or len(call_stack) == depth:
+                        call_stack.append(site.frame)
+                        if len(call_stack) > interpreter.max_depth:
+                            interpreter.overflow()
+                    else:
+                        call_stack[-1] = site.frame
+                    if op == CALL:
+                        stack.append((proto, regs, pc, a))
+                    proto = callee
+                    code = callee.code
+                    regs = frame
+                    pc = 0
+                elif kind == CALL_PYTHON:
+                    regs[a] = func(*regs[a + 1:a + 1 + count])
+                elif kind == CALL_COROUTINE:
+                    regs[a] = await func(*regs[a + 1:a + 1 + count])
+                else:
+                    args = regs[a + 1:a + 1 + count]
+                    if instruction[3]:
+                        args.insert(0, func.__self__)
+                    if kind == CALL_METHOD:
+                        regs[a] = func.__func__(*args)
+                    else:
+                        regs[a] = await func.__func__(*args)
+
+            elif op == RETURN:
+                count = instruction[2]
+                if count == 0:
+                    value = None
+                elif count == 1:
+                    value = regs[instruction[1]]
+                else:
+                    a = instruction[1]
+                    value = regs[a:a + count]
+                if not stack:
+                    del call_stack[depth:]
+                    return value
+                call_stack.pop()
+                proto, regs, pc, a = stack.pop()
+                code = proto.code
+                regs[a] = value
+
+            elif op == TESTLOOP:
+                value = regs[instruction[1]]
+                if value is None or value is False:
+                    pc += instruction[2]
+            elif op == FORPREP:
+                a = instruction[1]
+                regs[a] = iter(numeric_range(regs[a], regs[a + 1],
+                                             regs[a + 2]))
+                pc += instruction[2]
+            elif op == TFORPREP:
+                a = instruction[1]
+                regs[a], regs[a + 1], regs[a + 2] = for_params(
+                    regs[a:a + instruction[2]])
+            elif op == TFORCALL:
+                a = instruction[1]
+                fun = regs[a]
+                if type(fun) is Pairs:
+                    values = next(fun.items, None)
+                elif hasattr(fun, '__anext__') or hasattr(fun, '__next__'):
+                    values = await iterate(fun, regs[a + 1], regs[a + 2])
+                else:
+                    values = fun(regs[a + 1], regs[a + 2])
+                if values is None:
+                    pc += instruction[4]
+                else:
+                    if not isinstance(values, (list, tuple)):
+                        values = [values]
+                    first = instruction[2]
+                    for i, value in zip(range(instruction[3]), values):
+                        regs[first + i] = value
+                    regs[a + 2] = values[0]
+            elif op == LOADNIL:
+                regs[instruction[1]] = None
+            elif op == GETMETHOD:
+                regs[instruction[1]] = get_method(regs[instruction[2]],
+                                                  regs[instruction[3]])
+            elif op == AND:
+                if not regs[instruction[1]]:
+                    pc += instruction[2]
+            elif op == OR:
+                if regs[instruction[1]]:
+                    pc += instruction[2]
+            elif op == UNM:
+                regs[instruction[1]] = -regs[instruction[2]]
+            elif op == NOT:
+                regs[instruction[1]] = not bool(regs[instruction[2]])
+            elif op == LEN:
+                regs[instruction[1]] = len(regs[instruction[2]])
+            elif op == TABLE:
+                b = instruction[2]
+                regs[instruction[1]] = make_table([
+                    (regs[i], regs[i + 1])
+                    for i in range(b, b + 2 * instruction[3], 2)
+                ])
+            elif op == CLOSURE:
+                child = proto.protos[instruction[2]]
+                func = Function(child.parlist, child.body)
+                func.code = (child, regs)
+                func.engine = 'vm'
+                regs[instruction[1]] = func
+            elif op == METHOD:
+                func = regs[instruction[1]]
+                parent = regs[instruction[2]]
+                path, name, colon = regs[instruction[3]]
+                if parent is None:
+                    raise NameError('function not found')
+                for n in path:
+                    parent = parent[n]
+                    if parent is None:
+                        raise NameError('function not found')
+                if colon:
+                    func.self = parent
+                parent[name] = func
+            elif op == RAISE:
+                raise regs[instruction[1]](regs[instruction[2]])
+            else:
+                raise RuntimeError('unknown opcode {}'.format(op))
+
+    except Exception as e:
+        esl.runtime.locate(e, proto.lines[pc - 1])
+        raise
+
+
+def inline_caches(proto):
+    '''Returns inline caches of call, field and global sites in proto and
+    nested functions.'''
+    result = list(proto.sites)
+    for child in proto.protos:
+        result += inline_caches(child)
+    return result
+
+
+def compile(program):
+    '''Returns compiled program, compiles it once.'''
+    code = program.compiled.get('vm')
+    if code is None:
+        proto = Compiler().program(program.chunk)
+
+        async def code(interpreter, ns):
+            return await execute(proto, interpreter, ns,
+                                 [None] + proto.template)
+
+        code.proto = proto
+        code.sites = inline_caches(proto)
+        program.compiled['vm'] = code
+    return code
+
+
+def operand(proto, kind, value, pc):
+    if kind == 'J':
+        return '{:+d}'.format(value), 'to {}'.format(pc + 1 + value)
+    elif kind == 'R':
+        if value >= proto.size:
+            constant = proto.constants[value - proto.size]
+            if isinstance(constant, type):
+                constant = constant.__name__
+            else:
+                constant = repr(constant)
+            return 'k{}'.format(value - proto.size), constant
+        return 'r{}'.format(value), None
+    return str(value), None
+
+
+def disassemble(proto):
+    '''Returns listing of proto and it's nested functions.'''
+    lines = ['function {} (line {}): {} instructions, {} registers, '
+             '{} constants'.format(proto.name, proto.lineno, len(proto.code),
+                                   proto.size, len(proto.constants))]
+    for pc, instruction in enumerate(proto.code):
+        op = instruction[0]
+        operands = []
+        comments = []
+        for kind, value in zip(OPERANDS[op], instruction[1:]):
+            text, comment = operand(proto, kind, value, pc)
+            operands.append(text)
+            if comment is not None:
+                comments.append(comment)
+        line = '{:>5}  [{:>3}]  {:<10}{:<16}'.format(
+            pc, proto.lines[pc], OPCODES[op], ' '.join(operands))
+        if comments:
+            line += '; ' + ', '.join(comments)
+        lines.append(line.rstrip())
+    for child in proto.protos:
+        lines.append('')
+        lines.append(disassemble(child))
+    return '\n'.join(lines)
+
+
+def dis(code):
+    '''Returns listing of ESL code (string or esl.program.Program).'''
+    if not isinstance(code, esl.program.Program):
+        code = esl.program.compile(code)
+    return disassemble(compile(code).proto)